@@ -0,0 +1,105 @@
+"""
+Нагрузочный тест gRPC сервера со смешанными конкурентными запросами
+
+Клиентские потоки выполняют GetDefinition, постраничный ListTerms,
+AddTerm и UpdateTerm. После прогона проверяется, что ни один вызов не
+завершился ошибкой и что каждый добавленный термин хранит последнее
+записанное определение. Пропускная способность измеряется для разного
+количества рабочих потоков сервера.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_concurrency
+"""
+
+import random
+import threading
+import time
+from concurrent import futures
+
+import grpc
+import dictionary_pb2
+import dictionary_pb2_grpc
+
+from dictionary_service.services.dictionary_service import DictionaryService
+from benchmarks.common import temp_db, synthetic_name
+
+SIZE = 1_000
+CLIENTS = 32
+OPS_PER_CLIENT = 300
+WORKER_COUNTS = (1, 2, 4, 8, 16)
+
+def client(stub: dictionary_pb2_grpc.DictionaryServiceStub, client_id: int, 
+           errors: list) -> None:
+    """Один клиент: смешанная нагрузка и проверка собственных записей"""
+    rng = random.Random(client_id)
+    own = {}
+    for op in range(OPS_PER_CLIENT):
+        roll = rng.random()
+        try:
+            if roll < 0.6:
+                stub.GetDefinition(dictionary_pb2.TermRequest(name=synthetic_name(rng.randrange(SIZE))))
+            elif roll < 0.7:
+                stub.ListTerms(dictionary_pb2.ListTermsRequest(page_size=100))
+            elif roll < 0.85 or not own:
+                name = f"клиент-{client_id}-{op}"
+                response = stub.AddTerm(dictionary_pb2.AddTermRequest(
+                    term=dictionary_pb2.Term(name=name, definition='v0', related_terms=['docker'])
+                ))
+                if not response.success:
+                    errors.append(f"AddTerm {name}: {response.message}")
+                    continue
+                term = stub.GetDefinition(dictionary_pb2.TermRequest(name=name)).term
+                own[term.id] = (name, 'v0')
+            else:
+                term_id = rng.choice(list(own))
+                name, _ = own[term_id]
+                definition = f"v{op}"
+                response = stub.UpdateTerm(dictionary_pb2.UpdateTermRequest(
+                    id=term_id, term=dictionary_pb2.Term(name=name, definition=definition)
+                ))
+                if not response.success or response.term.definition != definition:
+                    errors.append(f"UpdateTerm {name}: {response.message}")
+                own[term_id] = (name, definition)
+        except grpc.RpcError as e:
+            errors.append(f"{e.code()}: {e.details()}")
+    
+    for term_id, (name, definition) in own.items():
+        term = stub.GetDefinition(dictionary_pb2.TermRequest(name=name)).term
+        if term.id != term_id or term.definition != definition:
+            errors.append(f"Потеряна запись {name}: {term.definition!r} != {definition!r}")
+
+def run(max_workers: int) -> float:
+    """Прогон нагрузки; возвращает количество операций в секунду"""
+    with temp_db(SIZE) as (_, path):
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+        dictionary_pb2_grpc.add_DictionaryServiceServicer_to_server(
+            DictionaryService(path, pool_size=max_workers), server
+        )
+        port = server.add_insecure_port('localhost:0')
+        server.start()
+        try:
+            with grpc.insecure_channel(f'localhost:{port}') as channel:
+                stub = dictionary_pb2_grpc.DictionaryServiceStub(channel)
+                errors: list = []
+                threads = [
+                    threading.Thread(target=client, args=(stub, i, errors))
+                    for i in range(CLIENTS)
+                ]
+                started = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+            assert not errors, errors[:10]
+            return CLIENTS * OPS_PER_CLIENT / elapsed
+        finally:
+            server.stop(None)
+
+def main() -> None:
+    print(f"{'workers':>8} {'ops/s':>10}")
+    for max_workers in WORKER_COUNTS:
+        print(f"{max_workers:>8} {run(max_workers):>10.0f}")
+
+if __name__ == '__main__':
+    main()
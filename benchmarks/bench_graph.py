@@ -0,0 +1,43 @@
+"""
+Запросы к индексу связей: окрестность, обратные ссылки и кратчайший путь
+
+Для сравнения приведено время получения всех терминов из базы, которое
+раньше требовалось клиенту для ответа на любой вопрос о графе.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_graph
+"""
+
+import random
+import time
+
+from dictionary_service.services.graph import TermGraph
+from benchmarks.common import temp_db, synthetic_name, measure
+
+SIZE = 100_000
+QUERIES = 1_000
+
+def latency_us(func, args_list) -> float:
+    """Среднее время вызова в микросекундах"""
+    started = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - started) / len(args_list) * 1e6
+
+def main() -> None:
+    with temp_db(SIZE) as (db, _):
+        full_scan = measure(db.list_terms, repeat=1)
+        started = time.perf_counter()
+        graph = TermGraph(db.iter_terms())
+        build = time.perf_counter() - started
+        
+        names = [synthetic_name(random.randrange(SIZE)) for _ in range(QUERIES)]
+        pairs = [(a, b) for a, b in zip(names, reversed(names))]
+        print(f"full list_terms: {full_scan * 1e3:10.1f} ms")
+        print(f"graph build:     {build * 1e3:10.1f} ms")
+        print(f"neighborhood(2): {latency_us(graph.neighborhood, [(n, 2, 100) for n in names]):10.1f} us")
+        print(f"backlinks:       {latency_us(graph.backlinks, [(n,) for n in names]):10.1f} us")
+        print(f"shortest_path:   {latency_us(graph.shortest_path, [(a, b, 50) for a, b in pairs[:100]]):10.1f} us")
+
+if __name__ == '__main__':
+    main()
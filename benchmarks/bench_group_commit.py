@@ -0,0 +1,102 @@
+"""
+Пропускная способность записи при 100 параллельных писателях
+
+Каждый из 100 потоков вызывает AddTerm, UpdateTerm и DeleteTerm
+обработчиками DictionaryService (без gRPC) на файловой базе: без
+объединения изменений (каждый вызов - своя транзакция) и с групповой
+фиксацией при разных окне и размере пакета. Каждое десятое добавление
+использует уже занятое имя; проверяется, что такие вызовы получают
+отказ, а остальные изменения того же пакета записываются.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_group_commit
+"""
+
+import logging
+import threading
+import time
+
+import dictionary_pb2
+
+from dictionary_service.services.dictionary_service import DictionaryService
+from benchmarks.common import temp_db
+
+WRITERS = 100
+TERMS_PER_WRITER = 30
+DUPLICATE_EVERY = 10
+VARIANTS = (
+    ('per-call commit', None, 64),
+    ('group 1 ms / 32', 0.001, 32),
+    ('group 2 ms / 64', 0.002, 64),
+    ('group 5 ms / 128', 0.005, 128),
+)
+
+def writer(service: DictionaryService, index: int, outcomes: list) -> None:
+    """Добавление, обновление и удаление терминов одним писателем"""
+    added = duplicates = kept = writes = 0
+    for number in range(TERMS_PER_WRITER):
+        # Повтор имени предыдущего термина этого писателя
+        duplicate = number % DUPLICATE_EVERY == DUPLICATE_EVERY - 1
+        name = f"writer-{index}-{number - 1 if duplicate else number}"
+        term = dictionary_pb2.Term(name=name, definition=f"definition {number}",
+                                   related_terms=['Docker'])
+        response = service.AddTerm(dictionary_pb2.AddTermRequest(term=term), None)
+        writes += 1
+        if duplicate:
+            duplicates += not response.success
+            continue
+        added += response.success
+        term_id = service.db.get_term(name=name).id
+        term.definition = f"updated {number}"
+        response = service.UpdateTerm(dictionary_pb2.UpdateTermRequest(id=term_id, term=term), None)
+        writes += 1
+        kept += response.success
+        if number % 2:
+            service.DeleteTerm(dictionary_pb2.DeleteTermRequest(id=term_id), None)
+            writes += 1
+            kept -= 1
+    outcomes[index] = (added, duplicates, kept, writes)
+
+def run(window, batch_size) -> tuple:
+    """
+    Прогон всех писателей
+
+    Returns:
+        tuple: (записей в секунду, записей на фиксацию, результаты верны,
+                терминов в базе)
+    """
+    with temp_db() as (_, path):
+        service = DictionaryService(path, cache_size=0, write_batch_window=window,
+                                    write_batch_size=batch_size)
+        initial = service.db.count_terms()
+        outcomes = [None] * WRITERS
+        threads = [threading.Thread(target=writer, args=(service, index, outcomes))
+                   for index in range(WRITERS)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        duplicates = TERMS_PER_WRITER // DUPLICATE_EVERY
+        remaining = service.db.count_terms()
+        correct = (all(outcome[:2] == (TERMS_PER_WRITER - duplicates, duplicates)
+                       for outcome in outcomes)
+                   and remaining == initial + sum(outcome[2] for outcome in outcomes))
+        writes = sum(outcome[3] for outcome in outcomes)
+        batches = service.writer.batches if service.writer else writes
+        service.db.pool.close()
+        return writes / elapsed, writes / batches, correct, remaining
+
+def main() -> None:
+    logging.getLogger().setLevel(logging.ERROR)
+    print(f"{WRITERS} writers, {TERMS_PER_WRITER} AddTerm each (+ UpdateTerm, DeleteTerm)")
+    print(f"{'mode':<17} {'writes/s':>9} {'writes/commit':>14} {'results ok':>11} {'terms':>6}")
+    for label, window, batch_size in VARIANTS:
+        throughput, per_commit, correct, remaining = run(window, batch_size)
+        print(f"{label:<17} {throughput:>9.0f} {per_commit:>14.1f} {str(correct):>11} "
+              f"{remaining:>6}")
+
+if __name__ == '__main__':
+    main()
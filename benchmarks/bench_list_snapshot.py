@@ -0,0 +1,105 @@
+"""
+Полный ListTerms из сериализованного снимка против сериализации на каждый вызов
+
+Прежняя реализация хранила в кеше сообщение ListTermsResponse, и
+сгенерированный обработчик сериализовал его при каждом вызове.
+Сейчас в кеше хранятся готовые байты, которые ListTermsSerialized
+отдает без обработки (см. add_to_server). Измеряется процессорное время
+на вызов:
+  - обработчика с сериализацией ответа (без gRPC);
+  - полного вызова через gRPC в этом же процессе; клиент получает байты
+    без разбора, поэтому время относится к серверу и транспорту;
+  - построения снимка заново после изменения.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_list_snapshot
+"""
+
+import time
+from concurrent import futures
+
+import grpc
+import dictionary_pb2
+
+from dictionary_service.services.dictionary_service import (
+    SERVICE_NAME, DictionaryService, add_to_server
+)
+from benchmarks.common import populate, temp_db
+
+SIZES = (10_000, 100_000)
+CALLS = 20
+
+def cpu_per_call(func, calls: int = CALLS) -> float:
+    """Процессорное время одного вызова в мс"""
+    func()
+    started = time.process_time()
+    for _ in range(calls):
+        func()
+    return (time.process_time() - started) / calls * 1e3
+
+def grpc_cpu_per_call(register) -> float:
+    """
+    Процессорное время полного ListTerms через gRPC
+
+    Args:
+        register: Функция регистрации обработчиков на сервере
+    """
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4), options=[
+        ('grpc.max_send_message_length', -1)
+    ])
+    register(server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    channel = grpc.insecure_channel(f'localhost:{port}', options=[
+        ('grpc.max_receive_message_length', -1)
+    ])
+    list_terms = channel.unary_unary(
+        f'/{SERVICE_NAME}/ListTerms',
+        request_serializer=dictionary_pb2.ListTermsRequest.SerializeToString
+    )
+    try:
+        return cpu_per_call(lambda: list_terms(dictionary_pb2.ListTermsRequest()))
+    finally:
+        channel.close()
+        server.stop(None)
+
+def main() -> None:
+    print(f"{'terms':>8} {'':>8} {'serialize, ms':>14} {'snapshot, ms':>13} {'speedup':>8}")
+    for size in SIZES:
+        with temp_db() as (db, path):
+            populate(db, size)
+            db.pool.close()
+            service = DictionaryService(path, cache_size=size)
+            request = dictionary_pb2.ListTermsRequest()
+            data = service.ListTermsSerialized(request, None)
+            # Прежний кеш: готовое сообщение, сериализуемое при каждом вызове
+            message = dictionary_pb2.ListTermsResponse.FromString(data)
+            assert len(message.SerializeToString()) == len(data)
+
+            before = cpu_per_call(message.SerializeToString)
+            after = cpu_per_call(lambda: service.ListTermsSerialized(request, None))
+            print(f"{size:>8} {'handler':>8} {before:>14.3f} {after:>13.3f} "
+                  f"{before / max(after, 1e-6):>7.0f}x")
+
+            message_handler = grpc.method_handlers_generic_handler(SERVICE_NAME, {
+                'ListTerms': grpc.unary_unary_rpc_method_handler(
+                    lambda request, context: message,
+                    request_deserializer=dictionary_pb2.ListTermsRequest.FromString,
+                    response_serializer=dictionary_pb2.ListTermsResponse.SerializeToString
+                )
+            })
+            before = grpc_cpu_per_call(
+                lambda server: server.add_generic_rpc_handlers((message_handler,))
+            )
+            after = grpc_cpu_per_call(lambda server: add_to_server(service, server))
+            print(f"{size:>8} {'grpc':>8} {before:>14.3f} {after:>13.3f} "
+                  f"{before / after:>7.1f}x")
+
+            def rebuild():
+                service.cache.clear()
+                service.ListTermsSerialized(request, None)
+            print(f"{size:>8} rebuild after a change: {cpu_per_call(rebuild, 3):.1f} ms CPU, "
+                  f"snapshot {len(data) / 1024 / 1024:.1f} MiB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Сравнение загрузки списка терминов: запрос на каждый термин (N+1)
+против двух запросов со слиянием за один проход
+
+Запуск из корня репозитория (после генерации protobuf модулей):
+    python -m benchmarks.bench_list_terms
+"""
+
+from typing import List
+
+from dictionary_service.database.db import DictionaryDB
+from dictionary_service.models.term import Term
+from benchmarks.common import temp_db, measure
+
+SIZES = (1_000, 10_000, 100_000)
+
+def list_terms_n_plus_one(db: DictionaryDB) -> List[Term]:
+    """Прежняя стратегия: отдельный запрос связей для каждого термина"""
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM terms')
+        terms = []
+        for row in cursor.fetchall():
+            cursor.execute('''SELECT related_term, relation_type 
+                            FROM related_terms WHERE term_id = ?''', (row['id'],))
+            terms.append(Term.from_db_row(row, cursor.fetchall()))
+        return terms
+
+def main() -> None:
+    print(f"{'terms':>8} {'n+1, s':>10} {'bulk, s':>10} {'speedup':>8}")
+    for size in SIZES:
+        with temp_db(size) as (db, _):
+            assert len(db.list_terms()) == len(list_terms_n_plus_one(db))
+            naive = measure(lambda: list_terms_n_plus_one(db))
+            bulk = measure(db.list_terms)
+            print(f"{size:>8} {naive:>10.3f} {bulk:>10.3f} {naive / bulk:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
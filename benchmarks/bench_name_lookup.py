@@ -0,0 +1,55 @@
+"""
+Поиск термина по имени: LOWER(name) = LOWER(?) против индекса по name_key
+
+Перед замером проверяется план запроса: поиск по name_key должен
+использовать индекс, а не полный просмотр таблицы.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_name_lookup
+"""
+
+import random
+import time
+
+from dictionary_service.models.term import normalize_name
+from benchmarks.common import temp_db, synthetic_name
+
+SIZE = 100_000
+LOOKUPS = 2_000
+
+def query_plan(conn, sql: str, params: tuple) -> str:
+    """Текстовое представление EXPLAIN QUERY PLAN"""
+    rows = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+    return ' | '.join(row['detail'] for row in rows)
+
+def latencies(conn, sql: str, keys: list) -> list:
+    """Время выполнения каждого запроса в микросекундах"""
+    result = []
+    for key in keys:
+        started = time.perf_counter()
+        conn.execute(sql, (key,)).fetchone()
+        result.append((time.perf_counter() - started) * 1e6)
+    return sorted(result)
+
+def main() -> None:
+    with temp_db(SIZE, relations_per_term=0) as (db, _), db.pool.connection() as conn:
+        indexed_sql = 'SELECT * FROM terms WHERE name_key = ?'
+        legacy_sql = 'SELECT * FROM terms WHERE LOWER(name) = LOWER(?)'
+        
+        plan = query_plan(conn, indexed_sql, ('x',))
+        assert 'USING INDEX idx_terms_name_key' in plan, plan
+        print(f"plan (name_key): {plan}")
+        print(f"plan (LOWER):    {query_plan(conn, legacy_sql, ('x',))}")
+        
+        names = [synthetic_name(random.randrange(SIZE)).upper() for _ in range(LOOKUPS)]
+        for title, sql, keys in (
+            ('LOWER(name)', legacy_sql, names[:LOOKUPS // 20]),
+            ('name_key', indexed_sql, [normalize_name(name) for name in names]),
+        ):
+            result = latencies(conn, sql, keys)
+            p50 = result[len(result) // 2]
+            p99 = result[int(len(result) * 0.99)]
+            print(f"{title:>12}: p50 {p50:10.1f} us, p99 {p99:10.1f} us")
+
+if __name__ == '__main__':
+    main()
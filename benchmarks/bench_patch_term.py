@@ -0,0 +1,106 @@
+"""
+Изменение типа одной связи у термина с большим количеством связей
+
+Для терминов с 10, 100 и 1000 связями сравниваются:
+  - прежнее обновление: перезапись всех колонок, удаление и повторная
+    вставка всех связей и повторное чтение термина для ответа;
+  - UpdateTerm с полным термином: запись только отличий от текущих строк;
+  - PatchTerm с одной связью в add_relations.
+Обработчики вызываются без gRPC, в базе также есть слушатели сервиса
+(граф, индекс имен, кеш, лента изменений), как на сервере.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_patch_term
+"""
+
+import logging
+import time
+from datetime import datetime
+
+import dictionary_pb2
+
+from dictionary_service.models.change import TermChange
+from dictionary_service.models.term import Term, normalize_name
+from dictionary_service.services.dictionary_service import DictionaryService
+from benchmarks.common import RELATION_TYPES, temp_db
+
+RELATION_COUNTS = (10, 100, 1000)
+UPDATES = 200
+
+def legacy_update(service: DictionaryService, term_id: int, term: Term) -> dictionary_pb2.Term:
+    """Прежний UpdateTerm: полная перезапись термина и связей, затем чтение"""
+    db = service.db
+    with db._write_transaction() as (conn, changes):
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, name FROM terms WHERE id = ?', (term_id,))
+        previous = cursor.fetchone()
+        cursor.execute(
+            'UPDATE terms SET name=?, name_key=?, definition=?, source=?, updated_at=? WHERE id=?',
+            (term.name.lower(), normalize_name(term.name), term.definition,
+             term.source, datetime.utcnow().isoformat(), term_id)
+        )
+        cursor.execute('DELETE FROM related_terms WHERE term_id=?', (term_id,))
+        cursor.executemany(
+            'INSERT INTO related_terms (term_id, related_term, relation_type) VALUES (?, ?, ?)',
+            ((term_id, related, relation) for related, relation in term.iter_relations())
+        )
+        version = db._bump_version(cursor)
+        changes.extend(db._collect_changes(
+            cursor, version, {term_id: (TermChange.UPDATED, previous['name'])}
+        ))
+    return db.get_term(term_id=term_id, as_proto=True)
+
+def per_call_us(func, count: int) -> float:
+    """Среднее время вызова в мкс; func получает номер вызова"""
+    started = time.perf_counter()
+    for number in range(count):
+        func(number)
+    return (time.perf_counter() - started) / count * 1e6
+
+def main() -> None:
+    logging.getLogger().setLevel(logging.ERROR)
+    print(f"{'relations':>9} {'full rewrite, us':>17} {'UpdateTerm diff, us':>20} "
+          f"{'PatchTerm, us':>14}")
+    for relations in RELATION_COUNTS:
+        with temp_db() as (db, path):
+            db.pool.close()
+            service = DictionaryService(path, cache_size=0)
+            related = [f"связанный-{i:05d}" for i in range(relations)]
+            proto = dictionary_pb2.Term(
+                name='широкий термин', definition='Термин со многими связями',
+                source='benchmark', related_terms=related,
+                relations={name: RELATION_TYPES[i % len(RELATION_TYPES)]
+                           for i, name in enumerate(related)}
+            )
+            service.AddTerm(dictionary_pb2.AddTermRequest(term=proto), None)
+            term_id = service.db.get_term(name=proto.name).id
+
+            def retype(number: int) -> dictionary_pb2.Term:
+                """Термин с новым типом первой связи"""
+                proto.relations[related[0]] = RELATION_TYPES[number % 2]
+                return proto
+
+            legacy = per_call_us(
+                lambda number: legacy_update(service, term_id, Term.from_proto(retype(number))),
+                UPDATES
+            )
+            update = per_call_us(
+                lambda number: service.UpdateTerm(
+                    dictionary_pb2.UpdateTermRequest(id=term_id, term=retype(number)), None
+                ),
+                UPDATES
+            )
+            patch = per_call_us(
+                lambda number: service.PatchTerm(dictionary_pb2.PatchTermRequest(
+                    id=term_id, add_relations={related[0]: RELATION_TYPES[number % 2]}
+                ), None),
+                UPDATES
+            )
+            response = service.PatchTerm(dictionary_pb2.PatchTermRequest(id=term_id), None)
+            assert response.term == service.db.get_term(term_id=term_id, as_proto=True)
+            assert len(response.term.related_terms) == relations
+            service.db.pool.close()
+        print(f"{relations:>9} {legacy:>17.0f} {update:>20.0f} {patch:>14.0f}")
+
+if __name__ == '__main__':
+    main()
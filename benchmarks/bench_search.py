@@ -0,0 +1,89 @@
+"""
+Полнотекстовый поиск: FTS5 с BM25 против LIKE по определениям
+
+Определения синтетических терминов составляются из случайных слов
+словаря, поэтому запросы находят разное количество совпадений.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_search
+"""
+
+import random
+import time
+
+from benchmarks.common import temp_db, synthetic_name
+from dictionary_service.models.term import normalize_name
+
+SIZE = 100_000
+QUERIES = 500
+WORDS_PER_DEFINITION = 12
+
+VOCABULARY_SIZE = 5_000
+SYLLABLES = (
+    'ба', 'ве', 'ги', 'до', 'жу', 'за', 'ки', 'ло', 'ма', 'не', 'по', 'ру', 'се', 'ти',
+    'фа', 'хо', 'це', 'чи', 'ша', 'ще', 'лё', 'ны', 'ря', 'ют', 'ей', 'ин', 'ос', 'ук',
+)
+
+def make_vocabulary(rng: random.Random) -> list:
+    """Словарь псевдослов из 3-4 слогов"""
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 4))))
+    return sorted(words)
+
+VOCABULARY = make_vocabulary(random.Random(1))
+
+def populate_texts(db, count: int) -> None:
+    """Вставка терминов со случайными определениями; индекс FTS обновляют триггеры"""
+    rng = random.Random(42)
+    now = '2024-01-01T00:00:00'
+    with db.pool.transaction() as conn:
+        conn.executemany(
+            '''INSERT INTO terms (name, name_key, definition, source, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            ((synthetic_name(i), normalize_name(synthetic_name(i)),
+              ' '.join(rng.choice(VOCABULARY) for _ in range(WORDS_PER_DEFINITION)),
+              'benchmark', now, now)
+             for i in range(count))
+        )
+
+def percentiles(func, queries: list) -> tuple:
+    """p50 и p99 времени выполнения в миллисекундах"""
+    result = []
+    for query in queries:
+        started = time.perf_counter()
+        func(query)
+        result.append((time.perf_counter() - started) * 1e3)
+    result.sort()
+    return result[len(result) // 2], result[int(len(result) * 0.99)]
+
+def main() -> None:
+    rng = random.Random(7)
+    queries = [
+        ' '.join(rng.choice(VOCABULARY)[:rng.randint(4, 8)] for _ in range(rng.randint(1, 2)))
+        for _ in range(QUERIES)
+    ]
+    with temp_db() as (db, _):
+        started = time.perf_counter()
+        populate_texts(db, SIZE)
+        print(f"insert {SIZE} terms with FTS triggers: {time.perf_counter() - started:.1f} s")
+        
+        hits = len(db.search_terms(queries[0], limit=20))
+        print(f"sample query {queries[0]!r}: {hits} hits")
+        
+        def like_scan(query: str) -> None:
+            with db.pool.connection() as conn:
+                conn.execute(
+                    'SELECT id, name FROM terms WHERE definition LIKE ? LIMIT 20',
+                    (f"%{query}%",)
+                ).fetchall()
+        
+        for title, func in (
+            ('fts5 + bm25', lambda query: db.search_terms(query, limit=20)),
+            ('LIKE scan', like_scan),
+        ):
+            p50, p99 = percentiles(func, queries)
+            print(f"{title:>12}: p50 {p50:8.2f} ms, p99 {p99:8.2f} ms")
+
+if __name__ == '__main__':
+    main()
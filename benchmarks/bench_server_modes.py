@@ -0,0 +1,127 @@
+"""
+Сравнение режимов сервера sync (grpc.server) и async (grpc.aio)
+
+Сервер запускается отдельным процессом через командную строку
+dictionary_service.server; 1000 одновременных асинхронных клиентов
+выполняют GetDefinition и постраничный ListTerms. Измеряются пропускная
+способность, задержки и количество отказов RESOURCE_EXHAUSTED.
+
+Второй сценарий добавляет открытые подписки WatchTerms: в режиме sync
+каждая занимает поток сервера, в режиме async - только задачу цикла событий.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_server_modes
+"""
+
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import grpc
+import dictionary_pb2
+import dictionary_pb2_grpc
+
+from dictionary_service.database.db import DictionaryDB
+from benchmarks.common import populate, synthetic_name
+
+SIZE = 10_000
+CLIENTS = 1_000
+OPS_PER_CLIENT = 20
+CHANNELS = 8
+MAX_WORKERS = 10
+WATCHERS = 50
+WATCH_OPS_PER_CLIENT = 2
+CALL_TIMEOUT = 10.0
+
+def free_port() -> int:
+    """Свободный локальный порт"""
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+async def client(stub, client_id: int, ops: int, latencies: list, errors: dict) -> None:
+    """Один клиент: последовательные вызовы со случайным выбором метода"""
+    rng = random.Random(client_id)
+    for _ in range(ops):
+        started = time.perf_counter()
+        try:
+            if rng.random() < 0.8:
+                await stub.GetDefinition(
+                    dictionary_pb2.TermRequest(name=synthetic_name(rng.randrange(SIZE))),
+                    timeout=CALL_TIMEOUT
+                )
+            else:
+                await stub.ListTerms(
+                    dictionary_pb2.ListTermsRequest(page_size=20, sort_by='name'),
+                    timeout=CALL_TIMEOUT
+                )
+            latencies.append(time.perf_counter() - started)
+        except grpc.aio.AioRpcError as e:
+            errors[e.code().name] = errors.get(e.code().name, 0) + 1
+
+async def load(port: int, watchers: int, ops: int) -> tuple:
+    """Прогон нагрузки; возвращает (время, задержки, ошибки)"""
+    channels = [grpc.aio.insecure_channel(f'localhost:{port}') for _ in range(CHANNELS)]
+    stubs = [dictionary_pb2_grpc.DictionaryServiceStub(channel) for channel in channels]
+    # Подписки остаются открытыми до закрытия каналов
+    watches = [
+        stubs[i % CHANNELS].WatchTerms(dictionary_pb2.WatchTermsRequest())
+        for i in range(watchers)
+    ]
+    await asyncio.sleep(1.0 if watches else 0)
+    latencies, errors = [], {}
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(stubs[i % CHANNELS], i, ops, latencies, errors) for i in range(CLIENTS)
+    ))
+    elapsed = time.perf_counter() - started
+    # Закрытие каналов отменяет и подписки
+    for channel in channels:
+        await channel.close()
+    return elapsed, sorted(latencies), errors
+
+def run_mode(workdir: str, mode: str, extra: list, watchers: int = 0,
+             ops: int = OPS_PER_CLIENT) -> None:
+    """Запуск сервера в заданном режиме и прогон нагрузки"""
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'dictionary_service.server', '--mode', mode,
+         '--host', f'localhost:{port}', '--max-workers', str(MAX_WORKERS), *extra],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with grpc.insecure_channel(f'localhost:{port}') as channel:
+            grpc.channel_ready_future(channel).result(timeout=60)
+        elapsed, latencies, errors = asyncio.run(load(port, watchers, ops))
+        done = len(latencies)
+        p50 = latencies[done // 2] * 1e3 if done else 0
+        p99 = latencies[int(done * 0.99)] * 1e3 if done else 0
+        title = ' '.join([mode, *extra] + ([f'+{watchers} watchers'] if watchers else []))
+        print(f"{title:>32}: {done / elapsed:8.0f} ops/s, p50 {p50:7.1f} ms, "
+              f"p99 {p99:7.1f} ms, errors {errors or 0}")
+    finally:
+        server.terminate()
+        server.wait()
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        db = DictionaryDB(os.path.join(workdir, 'dictionary.db'))
+        populate(db, SIZE)
+        db.pool.close()
+        print(f"{CLIENTS} clients x {OPS_PER_CLIENT} ops, {MAX_WORKERS} server/db threads")
+        run_mode(workdir, 'sync', [])
+        run_mode(workdir, 'async', [])
+        run_mode(workdir, 'sync', ['--max-concurrent-rpcs', '200'])
+        run_mode(workdir, 'async', ['--max-concurrent-rpcs', '200'])
+        print(f"{CLIENTS} clients x {WATCH_OPS_PER_CLIENT} ops, {WATCHERS} WatchTerms subscribers")
+        run_mode(workdir, 'sync', [], WATCHERS, WATCH_OPS_PER_CLIENT)
+        run_mode(workdir, 'async', [], WATCHERS, WATCH_OPS_PER_CLIENT)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Файл снимка словаря с чтением через mmap против базы и кеша
+
+На временной базе из 100k терминов измеряются:
+  - запись файла снимка и его размер;
+  - запуск DictionaryService без снимка (индексы строятся по всем
+    терминам из базы) и с готовым файлом снимка;
+  - задержка обработчиков GetDefinitionSerialized (по 5k частых имен) и
+    ListTermsSerialized (страницы со случайного ID и полный список) без
+    gRPC: чтение из базы без кеша, из кеша терминов и из снимка.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_snapshot_file
+"""
+
+import os
+import random
+import time
+
+import dictionary_pb2
+
+from dictionary_service.database.snapshot_file import write_snapshot
+from dictionary_service.services.dictionary_service import (
+    DictionaryService, encode_page_token
+)
+from benchmarks.common import populate, synthetic_name, temp_db
+
+SIZE = 100_000
+LOOKUPS = 20_000
+HOT_NAMES = 5_000
+PAGES = 2_000
+PAGE_SIZE = 100
+
+def per_call_us(func, requests) -> float:
+    """Среднее время вызова обработчика в мкс"""
+    started = time.perf_counter()
+    for request in requests:
+        func(request, None)
+    return (time.perf_counter() - started) / len(requests) * 1e6
+
+def main() -> None:
+    random.seed(1)
+    with temp_db() as (db, path):
+        populate(db, SIZE)
+        snapshot_path = f'{path}.snap'
+        started = time.perf_counter()
+        write_snapshot(db, snapshot_path)
+        print(f"{SIZE} terms: snapshot written in {time.perf_counter() - started:.2f} s, "
+              f"{os.path.getsize(snapshot_path) / 2**20:.1f} MiB")
+        db.pool.close()
+
+        variants = {}
+        for label, kwargs in (('sqlite', dict(cache_size=0)), ('lru cache', {}),
+                              ('mmap', dict(snapshot_path=snapshot_path))):
+            started = time.perf_counter()
+            variants[label] = DictionaryService(path, **kwargs)
+            print(f"startup {label:<9}: {time.perf_counter() - started:.2f} s")
+
+        # Частые имена помещаются в кеш терминов
+        hot = random.sample(range(SIZE), HOT_NAMES)
+        definitions = [dictionary_pb2.TermRequest(name=synthetic_name(random.choice(hot)))
+                       for _ in range(LOOKUPS)]
+        pages = [dictionary_pb2.ListTermsRequest(
+                     page_size=PAGE_SIZE, page_token=encode_page_token(random.randrange(SIZE))
+                 ) for _ in range(PAGES)]
+        full = [dictionary_pb2.ListTermsRequest()] * 5
+
+        print(f"{'':<9} {'GetDefinition, us':>18} {'ListTerms page, us':>19} "
+              f"{'full ListTerms, ms':>19}")
+        for label, service in variants.items():
+            # Прогрев кеша терминов и снимка полного списка
+            per_call_us(service.GetDefinitionSerialized, definitions)
+            service.ListTermsSerialized(full[0], None)
+            print(f"{label:<9} {per_call_us(service.GetDefinitionSerialized, definitions):>18.1f} "
+                  f"{per_call_us(service.ListTermsSerialized, pages):>19.1f} "
+                  f"{per_call_us(service.ListTermsSerialized, full) / 1e3:>19.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Подсказки имен по префиксу: отсортированный массив в памяти против LIKE
+
+Индекс строится из 1M синтетических имен без базы данных; для сравнения
+приведен запрос LIKE 'префикс%' по name_key на 100k терминов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_suggest
+"""
+
+import random
+import time
+
+from dictionary_service.models.change import TermChange
+from dictionary_service.models.term import Term, normalize_name
+from dictionary_service.services.suggest import NameIndex
+from benchmarks.common import temp_db, synthetic_name
+
+SIZE = 1_000_000
+DB_SIZE = 100_000
+QUERIES = 10_000
+UPDATES = 1_000
+
+def percentiles(func, args_list: list) -> tuple:
+    """p50 и p99 времени вызова в микросекундах"""
+    result = []
+    for args in args_list:
+        started = time.perf_counter()
+        func(*args)
+        result.append((time.perf_counter() - started) * 1e6)
+    result.sort()
+    return result[len(result) // 2], result[int(len(result) * 0.99)]
+
+def random_prefix(rng: random.Random, size: int) -> str:
+    """Префикс случайного синтетического имени длиной от 1 до полного имени"""
+    name = synthetic_name(rng.randrange(size)).upper()
+    return name[:rng.randint(1, len(name))]
+
+def main() -> None:
+    rng = random.Random(42)
+    terms = [Term(synthetic_name(i), '', term_id=i + 1) for i in range(SIZE)]
+    started = time.perf_counter()
+    index = NameIndex(terms)
+    print(f"build index of {SIZE} names: {time.perf_counter() - started:.2f} s")
+    
+    queries = [(random_prefix(rng, SIZE), 10) for _ in range(QUERIES)]
+    p50, p99 = percentiles(index.suggest, queries)
+    print(f"{'suggest':>12}: p50 {p50:8.1f} us, p99 {p99:8.1f} us")
+    
+    changes = [
+        [TermChange(TermChange.ADDED, 0, SIZE + i + 1, Term(f"новый-{i:05d}", '', term_id=SIZE + i + 1))]
+        for i in range(UPDATES)
+    ] + [
+        [TermChange(TermChange.DELETED, 0, SIZE + i + 1, previous_name=f"новый-{i:05d}")]
+        for i in range(UPDATES)
+    ]
+    p50, p99 = percentiles(index.apply, [(batch,) for batch in changes])
+    print(f"{'apply':>12}: p50 {p50:8.1f} us, p99 {p99:8.1f} us")
+    
+    with temp_db(DB_SIZE, relations_per_term=0) as (db, _), db.pool.connection() as conn:
+        def like(prefix: str, limit: int) -> None:
+            conn.execute(
+                'SELECT id, name FROM terms WHERE name_key LIKE ? ORDER BY name_key LIMIT ?',
+                (f"{normalize_name(prefix)}%", limit)
+            ).fetchall()
+        
+        queries = [(random_prefix(rng, DB_SIZE), 10) for _ in range(QUERIES // 10)]
+        p50, p99 = percentiles(like, queries)
+        print(f"{'LIKE (100k)':>12}: p50 {p50:8.1f} us, p99 {p99:8.1f} us")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Память и скорость построения терминов из строк базы на 1M терминов
+
+Сравниваются прежняя модель Term (атрибуты в __dict__, список
+related_terms и дублирующий его словарь relations) и компактная
+(__slots__, параллельные кортежи связей, интернированные типы связей),
+а также построение protobuf сообщений напрямую из строк, без Term.
+Строки читаются из временной базы тем же обходом, что и в сервисе
+(DictionaryDB._iter_terms), поэтому строки типов связей и источников
+приходят отдельными объектами, как в реальном чтении. Выводятся в
+микросекундах на термин (без времени чтения строк):
+  - построение объекта из строки и to_proto по готовым терминам;
+  - путь от строки до protobuf сообщения целиком;
+  - память рабочего набора по tracemalloc (только для Term) и время
+    полной сборки мусора при удерживаемом наборе.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_term_model
+"""
+
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import dictionary_pb2
+
+from dictionary_service.models.term import Term
+from benchmarks.common import populate, temp_db
+
+SIZE = 1_000_000
+
+class DictTerm:
+    """Прежняя модель термина для сравнения"""
+
+    def __init__(self, name: str, definition: str, source: Optional[str] = None,
+                 related_terms: Optional[List[str]] = None,
+                 relations: Optional[Dict[str, str]] = None, term_id: Optional[int] = None,
+                 created_at: Optional[str] = None, updated_at: Optional[str] = None):
+        self.id = term_id
+        self.name = name
+        self.definition = definition
+        self.source = source or ""
+        self.related_terms = related_terms or []
+        self.relations = relations or {}
+        self.created_at = created_at or datetime.utcnow().isoformat()
+        self.updated_at = updated_at or self.created_at
+
+    @classmethod
+    def from_db_row(cls, row, related_data) -> 'DictTerm':
+        return cls(
+            term_id=row['id'],
+            name=row['name'],
+            definition=row['definition'],
+            source=row['source'],
+            related_terms=[r['related_term'] for r in related_data],
+            relations={r['related_term']: r['relation_type'] for r in related_data},
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        )
+
+    def to_proto(self) -> dictionary_pb2.Term:
+        proto = dictionary_pb2.Term(
+            id=self.id,
+            name=self.name,
+            definition=self.definition,
+            source=self.source,
+            related_terms=self.related_terms,
+            created_at=self.created_at,
+            updated_at=self.updated_at
+        )
+        for related, relation in self.relations.items():
+            proto.relations[related] = relation
+        return proto
+
+FACTORIES = {
+    'dict Term': DictTerm.from_db_row,
+    'slots Term': Term.from_db_row,
+    'row -> proto': Term.proto_from_db_row,
+}
+
+def load(db, factory) -> list:
+    """Все термины базы, построенные factory"""
+    with db.pool.connection() as conn:
+        return list(db._iter_terms(conn, factory=factory))
+
+def timed(func) -> tuple:
+    """Результат и время выполнения в секундах"""
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+def main() -> None:
+    with temp_db() as (db, _):
+        populate(db, SIZE)
+        _, read_only = timed(lambda: load(db, lambda row, related: None))
+        print(f"{SIZE} terms, 3 relations each; reading rows only: {read_only:.2f} s")
+        print(f"{'model':<13} {'build, us':>10} {'to_proto, us':>13} {'row->proto, us':>15} "
+              f"{'memory, MiB':>12} {'B/term':>7} {'gc, ms':>7}")
+        for label, factory in FACTORIES.items():
+            terms, build = timed(lambda: load(db, factory))
+            build = (build - read_only) / SIZE * 1e6
+            # Память protobuf сообщений выделяется в C и не видна tracemalloc
+            is_proto = isinstance(terms[0], dictionary_pb2.Term)
+            to_proto = 0.0
+            if not is_proto:
+                _, to_proto = timed(lambda: [term.to_proto() for term in terms])
+                to_proto = to_proto / SIZE * 1e6
+            _, collect = timed(gc.collect)
+            del terms
+            gc.collect()
+
+            columns = [f"{'-':>13}", f"{'-':>12}", f"{'-':>7}"]
+            if not is_proto:
+                tracemalloc.start()
+                baseline = tracemalloc.get_traced_memory()[0]
+                terms = load(db, factory)
+                gc.collect()
+                memory = tracemalloc.get_traced_memory()[0] - baseline
+                tracemalloc.stop()
+                del terms
+                gc.collect()
+                columns = [f"{to_proto:>13.2f}", f"{memory / 2**20:>12.0f}", 
+                           f"{memory / SIZE:>7.0f}"]
+            print(f"{label:<13} {build:>10.2f} {columns[0]} {build + to_proto:>15.2f} "
+                  f"{columns[1]} {columns[2]} {collect * 1e3:>7.0f}")
+
+if __name__ == '__main__':
+    main()
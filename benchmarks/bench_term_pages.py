@@ -0,0 +1,90 @@
+"""
+Страницы таблицы терминов: выборка по ключу против LIMIT/OFFSET
+
+Для каждой сортировки проверяется, что план запроса обходит индекс без
+временной сортировки, и замеряется время получения первой и глубокой
+страницы; отдельно - отбор по частому и редкому типу связи.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_term_pages
+"""
+
+import time
+
+from benchmarks.common import temp_db, RELATION_TYPES
+
+SIZE = 100_000
+PAGE_SIZE = 50
+DEEP_PAGE = 1_500
+
+def query_plan(conn, sql: str, params: tuple) -> str:
+    """Текстовое представление EXPLAIN QUERY PLAN"""
+    rows = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+    return ' | '.join(row['detail'] for row in rows)
+
+def timed_ms(func) -> float:
+    """Время вызова в миллисекундах"""
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1e3
+
+def walk_to(db, order_by: str, page: int, **filters):
+    """Ключ последнего термина страницы с номером page - 1"""
+    after = None
+    for _ in range(page):
+        terms = db.page_terms(order_by, after=after, limit=PAGE_SIZE, **filters)
+        last = terms[-1]
+        value = {'id': '', 'name': last.name, 'created_at': last.created_at,
+                 'updated_at': last.updated_at}[order_by]
+        after = (value, last.id)
+    return after
+
+def main() -> None:
+    with temp_db(SIZE) as (db, _):
+        with db.pool.connection() as conn:
+            for order_by, column in db.SORT_COLUMNS.items():
+                # Те же два поиска по индексу, что выполняет page_terms
+                queries = [(f'SELECT * FROM terms WHERE {column} > ? ORDER BY {column}, id LIMIT ?',
+                            ('', PAGE_SIZE))]
+                if column != 'id':
+                    queries.append((f'SELECT * FROM terms WHERE {column} = ? AND id > ? '
+                                    'ORDER BY id LIMIT ?', ('', 0, PAGE_SIZE)))
+                for sql, params in queries:
+                    plan = query_plan(conn, sql, params)
+                    assert 'TEMP B-TREE' not in plan, plan
+                    print(f"plan ({order_by}): {plan}")
+            plan = query_plan(
+                conn, 'SELECT * FROM terms WHERE id IN '
+                '(SELECT term_id FROM related_terms WHERE relation_type = ?) ORDER BY id LIMIT ?',
+                (RELATION_TYPES[0], PAGE_SIZE)
+            )
+            assert 'idx_related_terms_type' in plan, plan
+            print(f"plan (relation_type): {plan}")
+        
+        for order_by, column in db.SORT_COLUMNS.items():
+            after = walk_to(db, order_by, DEEP_PAGE)
+            first = timed_ms(lambda: db.page_terms(order_by, limit=PAGE_SIZE))
+            keyset = timed_ms(lambda: db.page_terms(order_by, after=after, limit=PAGE_SIZE))
+            with db.pool.connection() as conn:
+                offset = timed_ms(lambda: conn.execute(
+                    f'SELECT * FROM terms ORDER BY {column}, id LIMIT ? OFFSET ?',
+                    (PAGE_SIZE, DEEP_PAGE * PAGE_SIZE)
+                ).fetchall())
+            print(f"{order_by:>12}: first {first:6.2f} ms, page {DEEP_PAGE} keyset "
+                  f"{keyset:6.2f} ms, OFFSET {offset:7.2f} ms")
+        
+        # Редкий тип связи: несколько терминов на всю таблицу
+        with db.pool.transaction() as conn:
+            conn.executemany(
+                'INSERT INTO related_terms (term_id, related_term, relation_type) VALUES (?, ?, ?)',
+                ((term_id, 'редкая связь', 'редкий тип') for term_id in range(1, SIZE, SIZE // 20))
+            )
+        for relation_type in (RELATION_TYPES[0], 'редкий тип'):
+            filtered = timed_ms(lambda: db.page_terms(
+                'name', relation_type=relation_type, limit=PAGE_SIZE
+            ))
+            count = timed_ms(lambda: db.count_terms(relation_type=relation_type))
+            print(f"relation_type {relation_type!r}: page {filtered:6.2f} ms, count {count:6.2f} ms")
+
+if __name__ == '__main__':
+    main()
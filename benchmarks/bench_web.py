@@ -0,0 +1,154 @@
+"""
+Нагрузочный тест веб-сервиса: Flask (web_service.py) против Quart/grpc.aio
+
+Сервер словаря и веб-сервис запускаются отдельными процессами; клиенты
+с постоянными HTTP соединениями параллельно запрашивают страницу термина
+/term/<name> (два вызова сервиса словаря) и главную страницу /.
+Для каждого режима выводятся запросы в секунду и p99 задержки.
+Flask запускается без кеша ответов и с кешем в памяти (для него
+выводится доля попаданий из /api/cache/stats). Асинхронный режим
+запускается через hypercorn (quart и hypercorn входят в requirements.txt;
+без них режим пропускается).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_web
+"""
+
+import http.client
+import importlib.util
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent import futures
+from urllib.parse import quote
+
+from dictionary_service.database.db import DictionaryDB
+from benchmarks.common import populate, synthetic_name
+
+SIZE = 10_000
+CLIENTS = 64
+REQUESTS = 3_000
+WEB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'web_service')
+
+def free_port() -> int:
+    """Свободный локальный порт"""
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+def wait_http(port: int, timeout: float = 60.0) -> None:
+    """Ожидание готовности HTTP сервера"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = http.client.HTTPConnection('localhost', port, timeout=5)
+            connection.request('GET', '/static/css/database.css')
+            connection.getresponse().read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+def load(port: int, paths: list) -> tuple:
+    """
+    Прогон запросов с CLIENTS параллельными соединениями
+
+    Returns:
+        tuple: (запросов в секунду, p99 в мс, количество ошибок)
+    """
+    def client(chunk: list) -> tuple:
+        connection = http.client.HTTPConnection('localhost', port, timeout=30)
+        latencies, errors = [], 0
+        for path in chunk:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection('localhost', port, timeout=30)
+            latencies.append(time.perf_counter() - started)
+        connection.close()
+        return latencies, errors
+
+    chunks = [paths[i::CLIENTS] for i in range(CLIENTS)]
+    started = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=CLIENTS) as executor:
+        results = list(executor.map(client, chunks))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for chunk, _ in results for latency in chunk)
+    errors = sum(chunk_errors for _, chunk_errors in results)
+    return len(latencies) / elapsed, latencies[int(len(latencies) * 0.99)] * 1e3, errors
+
+def cache_stats(port: int) -> dict:
+    """Счетчики кеша ответов веб-сервиса"""
+    connection = http.client.HTTPConnection('localhost', port, timeout=5)
+    connection.request('GET', '/api/cache/stats')
+    return json.loads(connection.getresponse().read())
+
+def run(title: str, command: list, grpc_port: int, cache: str = 'none') -> None:
+    """Запуск веб-сервиса и прогон обеих страниц"""
+    port = free_port()
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([WEB_DIR] + sys.path),
+        DICTIONARY_HOST='localhost', DICTIONARY_PORT=str(grpc_port),
+        FLASK_HOST='localhost', FLASK_PORT=str(port), WEB_CACHE_BACKEND=cache,
+        WEB_CACHE_SIZE=str(2 * SIZE)
+    )
+    server = subprocess.Popen(
+        [arg.format(port=port) for arg in command],
+        cwd=WEB_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_http(port)
+        rng = random.Random(1)
+        term_paths = ['/term/' + quote(synthetic_name(rng.randrange(SIZE)))
+                      for _ in range(REQUESTS)]
+        for name, paths in (('/term/<name>', term_paths), ('/', ['/'] * REQUESTS)):
+            throughput, p99, errors = load(port, paths)
+            print(f"{title:>6} {name:<13}: {throughput:7.0f} req/s, p99 {p99:7.1f} ms, "
+                  f"errors {errors}")
+        if cache != 'none':
+            print(f"{title:>6} hit ratio    : {cache_stats(port)['hit_ratio']:.2f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        db = DictionaryDB(os.path.join(workdir, 'dictionary.db'))
+        populate(db, SIZE)
+        db.pool.close()
+
+        grpc_port = free_port()
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        dictionary = subprocess.Popen(
+            [sys.executable, '-m', 'dictionary_service.server', '--host', f'localhost:{grpc_port}'],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            print(f"{CLIENTS} clients, {REQUESTS} requests per page")
+            run('flask', [sys.executable, 'web_service.py'], grpc_port)
+            run('cached', [sys.executable, 'web_service.py'], grpc_port, cache='memory')
+            if importlib.util.find_spec('quart') and importlib.util.find_spec('hypercorn'):
+                run('async', [sys.executable, '-m', 'hypercorn', 'async_web_service:app',
+                              '--bind', 'localhost:{port}'], grpc_port)
+            else:
+                print(" async: skipped, quart and hypercorn are not installed")
+        finally:
+            dictionary.terminate()
+            dictionary.wait()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Размер и время подготовки ответов /api/terms (JSON) и /api/terms.pb (protobuf)
+
+Сервер словаря запускается отдельным процессом со сжатием gRPC и без
+него; веб-приложение Flask вызывается через тестовый клиент в этом же
+процессе (без кеша ответов), поэтому время включает вызов сервиса
+словаря и подготовку ответа, но не HTTP сервер. Для страницы таблицы и
+полного списка выводятся размеры тела без сжатия, с gzip и brotli
+(если установлен пакет brotli) и среднее время запроса.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_web_payload
+"""
+
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import grpc
+
+from dictionary_service.database.db import DictionaryDB
+from benchmarks.common import populate
+
+SIZE = 10_000
+PAGE_SIZES = (50, SIZE)
+REPEATS = 10
+WEB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'web_service')
+
+def free_port() -> int:
+    """Свободный локальный порт"""
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+def measure(client, path: str, encoding: str = '') -> tuple:
+    """Средняя задержка в мс и размер тела ответа"""
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    client.get(path, headers=headers)
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        response = client.get(path, headers=headers)
+    elapsed = (time.perf_counter() - started) / REPEATS
+    assert response.status_code == 200, response.status_code
+    return elapsed * 1e3, len(response.data)
+
+def run(web_service, port: int, grpc_compression: str) -> None:
+    """Прогон обоих форматов при заданном сжатии между сервисами"""
+    grpc.channel_ready_future(grpc.insecure_channel(f'localhost:{port}')).result(timeout=60)
+    web_service.Config.DICTIONARY_PORT = port
+    web_service.Config.GRPC_COMPRESSION = grpc_compression
+    # Каналы пула создаются заново с новыми параметрами
+    web_service.GrpcClient._channels = []
+    client = web_service.app.test_client()
+    encodings = [''] + web_service.RESPONSE_ENCODINGS
+    for page_size in PAGE_SIZES:
+        for name in ('/api/terms', '/api/terms.pb'):
+            path = f'{name}?page_size={page_size}'
+            results = [measure(client, path, encoding) for encoding in encodings]
+            sizes = ', '.join(f"{encoding or 'identity'} {size / 1024:8.1f} KiB"
+                              for encoding, (_, size) in zip(encodings, results))
+            print(f"grpc {grpc_compression:<4} {name:<13} page_size={page_size:<6}: "
+                  f"{results[0][0]:7.1f} ms; {sizes}")
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        db = DictionaryDB(os.path.join(workdir, 'dictionary.db'))
+        populate(db, SIZE)
+        db.pool.close()
+
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        servers = {}
+        for compression in ('none', 'gzip'):
+            port = free_port()
+            servers[compression] = port, subprocess.Popen(
+                [sys.executable, '-m', 'dictionary_service.server',
+                 '--host', f'localhost:{port}', '--compression', compression],
+                cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        try:
+            os.environ['WEB_CACHE_BACKEND'] = 'none'
+            sys.path.insert(0, WEB_DIR)
+            import web_service
+            logging.getLogger().setLevel(logging.WARNING)
+            for compression, (port, _) in servers.items():
+                run(web_service, port, compression)
+        finally:
+            for _, server in servers.values():
+                server.terminate()
+                server.wait()
+
+if __name__ == '__main__':
+    main()
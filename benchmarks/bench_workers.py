@@ -0,0 +1,123 @@
+"""
+Несколько процессов сервера на одном порту (--workers, SO_REUSEPORT)
+
+Сервер запускается отдельным процессом через командную строку
+dictionary_service.server с разным количеством рабочих процессов.
+Клиенты открывают отдельные соединения (ядро распределяет их между
+процессами) и запрашивают полный ListTerms на 10k терминов: сериализация
+большого ответа упирается в GIL одного процесса. Затем проверяется
+согласованность кешей: после каждого обновления через одно соединение
+определение читается через все остальные.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_workers
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent import futures
+
+import grpc
+import dictionary_pb2
+import dictionary_pb2_grpc
+
+from dictionary_service.database.db import DictionaryDB
+from benchmarks.common import populate, synthetic_name
+
+SIZE = 10_000
+CONNECTIONS = 16
+REQUESTS_PER_CONNECTION = 10
+UPDATES = 20
+WORKERS = (1, 2, 4)
+
+def free_port() -> int:
+    """Свободный локальный порт"""
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+def connect(port: int) -> dictionary_pb2_grpc.DictionaryServiceStub:
+    """Клиент с собственным TCP соединением"""
+    channel = grpc.insecure_channel(f'localhost:{port}', options=[
+        # Каналы с одинаковыми параметрами иначе делят одно соединение
+        ('grpc.use_local_subchannel_pool', 1),
+        ('grpc.max_receive_message_length', 256 * 1024 * 1024),
+    ])
+    return dictionary_pb2_grpc.DictionaryServiceStub(channel)
+
+def list_load(stubs: list) -> tuple:
+    """Параллельные запросы полного списка; возвращает (запросов/с, p50 мс)"""
+    def worker(stub) -> list:
+        latencies = []
+        for _ in range(REQUESTS_PER_CONNECTION):
+            started = time.perf_counter()
+            stub.ListTerms(dictionary_pb2.ListTermsRequest())
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    started = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=len(stubs)) as executor:
+        latencies = sorted(sum(executor.map(worker, stubs), []))
+    elapsed = time.perf_counter() - started
+    return len(latencies) / elapsed, latencies[len(latencies) // 2] * 1e3
+
+def stale_reads(stubs: list) -> int:
+    """Количество устаревших чтений сразу после обновления"""
+    name = synthetic_name(0)
+    term = stubs[0].GetDefinition(dictionary_pb2.TermRequest(name=name)).term
+    stale = 0
+    for revision in range(UPDATES):
+        definition = f"{term.definition} ({revision})"
+        updated = dictionary_pb2.Term()
+        updated.CopyFrom(term)
+        updated.definition = definition
+        stubs[revision % len(stubs)].UpdateTerm(
+            dictionary_pb2.UpdateTermRequest(id=term.id, term=updated)
+        )
+        for stub in stubs:
+            response = stub.GetDefinition(dictionary_pb2.TermRequest(name=name))
+            stale += response.term.definition != definition
+    return stale
+
+def run(workdir: str, workers: int) -> None:
+    """Запуск сервера с заданным количеством процессов и измерения"""
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'dictionary_service.server',
+         '--host', f'localhost:{port}', '--workers', str(workers)],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        stubs = [connect(port) for _ in range(CONNECTIONS)]
+        for stub in stubs:
+            # Дожидаемся готовности всех процессов и прогреваем их кеши
+            for _ in range(100):
+                try:
+                    stub.ListTerms(dictionary_pb2.ListTermsRequest(), wait_for_ready=True, timeout=60)
+                    break
+                except grpc.RpcError:
+                    time.sleep(0.1)
+        throughput, p50 = list_load(stubs)
+        stale = stale_reads(stubs)
+        print(f"workers={workers}: ListTerms({SIZE}) {throughput:7.1f} req/s, "
+              f"p50 {p50:7.1f} ms; stale reads after update: {stale}/{UPDATES * CONNECTIONS}")
+    finally:
+        server.terminate()
+        server.wait()
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        db = DictionaryDB(os.path.join(workdir, 'dictionary.db'))
+        populate(db, SIZE)
+        db.pool.close()
+        print(f"{CONNECTIONS} connections, CPU cores: {os.cpu_count()}")
+        for workers in WORKERS:
+            run(workdir, workers)
+
+if __name__ == '__main__':
+    main()
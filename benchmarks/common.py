@@ -0,0 +1,83 @@
+"""Общие утилиты для бенчмарков"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from dictionary_service.database.db import DictionaryDB
+from dictionary_service.models.term import normalize_name
+
+RELATION_TYPES = ('связан с', 'использует', 'является частью', 'реализуется с помощью')
+
+def synthetic_name(i: int) -> str:
+    """Имя синтетического термина с номером i"""
+    return f"термин-{i:07d}"
+
+def populate(db: DictionaryDB, count: int, relations_per_term: int = 3) -> None:
+    """
+    Заполнение базы синтетическими терминами
+    
+    Args:
+        db: Экземпляр базы данных
+        count: Количество терминов
+        relations_per_term: Количество связей у каждого термина
+    """
+    now = '2024-01-01T00:00:00'
+    with db.pool.transaction() as conn:
+        _insert_synthetic(conn.cursor(), count, relations_per_term, now)
+
+def _insert_synthetic(cursor, count: int, relations_per_term: int, now: str) -> None:
+    """Вставка синтетических терминов и связей в открытой транзакции"""
+    cursor.executemany(
+        '''INSERT INTO terms (name, name_key, definition, source, created_at, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?)''',
+        ((synthetic_name(i), normalize_name(synthetic_name(i)),
+          f"Определение термина номер {i}", 'benchmark', now, now)
+         for i in range(count))
+    )
+    cursor.execute('SELECT id, name FROM terms WHERE source = ?', ('benchmark',))
+    ids = [row['id'] for row in cursor.fetchall()]
+    cursor.executemany(
+        '''INSERT INTO related_terms (term_id, related_term, relation_type)
+           VALUES (?, ?, ?)''',
+        ((term_id, synthetic_name((i + k + 1) % count), RELATION_TYPES[k % len(RELATION_TYPES)])
+         for i, term_id in enumerate(ids)
+         for k in range(min(relations_per_term, count - 1)))
+    )
+
+@contextmanager
+def temp_db(count: int = 0, relations_per_term: int = 3) -> Iterator[Tuple[DictionaryDB, str]]:
+    """
+    Временная база данных, заполненная синтетическими терминами
+    
+    Args:
+        count: Количество терминов
+        relations_per_term: Количество связей у каждого термина
+    Yields:
+        Tuple[DictionaryDB, str]: (база данных, путь к файлу)
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench.db')
+        db = DictionaryDB(path)
+        if count:
+            populate(db, count, relations_per_term)
+        yield db, path
+
+def measure(func, repeat: int = 3) -> float:
+    """
+    Лучшее время выполнения функции из нескольких запусков
+    
+    Args:
+        func: Функция без аргументов
+        repeat: Количество запусков
+    Returns:
+        float: Время в секундах
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
@@ -1,51 +1,323 @@
 """Модуль для работы с базой данных"""
 
 import logging
+import re
 import sqlite3
-from typing import Dict, List, Optional, Tuple
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 
+import dictionary_pb2
+
+from dictionary_service.database.pool import ConnectionPool
 from dictionary_service.exceptions.errors import DatabaseError, TermNotFoundError, TermExistsError
-from dictionary_service.models.term import Term
+from dictionary_service.models.change import TermChange
+from dictionary_service.models.search import SearchHit
+from dictionary_service.models.term import Term, normalize_name
+from dictionary_service.models.write import TermPatch, TermWrite, WriteResult
 from dictionary_service.initial_data import INITIAL_TERMS
 
 logger = logging.getLogger(__name__)
 
+# Термин, прочитанный из базы: модель или готовое protobuf сообщение
+StoredTerm = Union[Term, dictionary_pb2.Term]
+# Построение термина из строки terms и строк его связей
+RowFactory = Callable[[sqlite3.Row, List[sqlite3.Row]], StoredTerm]
+
+def row_factory(as_proto: bool) -> RowFactory:
+    """
+    Выбор способа построения терминов из строк базы
+    
+    Args:
+        as_proto: Строить protobuf сообщения напрямую, без объектов Term
+    Returns:
+        RowFactory: Term.proto_from_db_row или Term.from_db_row
+    """
+    return Term.proto_from_db_row if as_proto else Term.from_db_row
+
+# Слова поискового запроса: буквы и цифры любого алфавита
+SEARCH_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+def build_match_query(query: str) -> str:
+    """
+    Преобразование пользовательского запроса в выражение FTS5 MATCH
+    
+    Каждое слово ищется по префиксу: это дает автодополнение и покрывает
+    окончания русских слов ("сервис" находит "сервисы", "сервиса").
+    Операторы FTS5 в запросе не интерпретируются.
+    
+    Args:
+        query: Текст запроса
+    Returns:
+        str: Выражение MATCH или пустая строка, если слов нет
+    """
+    return ' '.join(f'"{token}"*' for token in SEARCH_TOKEN.findall(query))
+
 class DictionaryDB:
     """Класс для работы с базой данных словаря"""
     
-    def __init__(self, db_path: str = 'dictionary.db'):
+    # Ограничение SQLite на количество параметров в одном запросе
+    MAX_SQL_VARIABLES = 500
+    # Количество терминов в одной транзакции пакетной записи
+    BULK_CHUNK_SIZE = 500
+    # Веса колонок name, definition, source в ранжировании BM25
+    SEARCH_WEIGHTS = (10.0, 1.0, 0.5)
+    # Количество слов во фрагменте определения
+    SNIPPET_TOKENS = 16
+    # Количество связей, начиная с которого тип связи считается частым
+    FREQUENT_RELATION_ROWS = 2000
+    # Количество последних версий в журнале изменений term_changes
+    CHANGE_LOG_SIZE = 100000
+    # Колонки, по которым возможна сортировка страниц терминов
+    SORT_COLUMNS = {
+        'id': 'id',
+        'name': 'name_key',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    
+    def __init__(self, db_path: str = 'dictionary.db', pool_size: int = 10):
         """
         Инициализация базы данных
         
         Args:
             db_path: Путь к файлу базы данных
+            pool_size: Максимальное количество соединений в пуле
         """
+        self._listeners: List[Callable[[List[TermChange]], None]] = []
+        self._reset_listeners: List[Callable[[], None]] = []
+        # Порядок уведомлений слушателей совпадает с порядком фиксации
+        self._write_lock = threading.RLock()
+        # Отдельное соединение для PRAGMA data_version (см. sync_changes)
+        self._sync_conn: Optional[sqlite3.Connection] = None
+        self._sync_lock = threading.Lock()
+        self._data_version: Optional[int] = None
         try:
-            self.conn = sqlite3.connect(db_path, check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
+            self.pool = ConnectionPool(db_path, size=pool_size)
             self.create_tables()
+            # Последняя версия, изменения до которой переданы слушателям
+            self._applied_version = self.get_version()[0]
             self.initialize_data()
         except sqlite3.Error as e:
             logger.error(f"Ошибка при инициализации БД: {e}")
             raise DatabaseError(f"Не удалось инициализировать базу данных: {e}")
     
+    def add_listener(self, listener: Callable[[List[TermChange]], None]) -> None:
+        """
+        Подписка на изменения данных
+        
+        Слушатель вызывается после фиксации каждой транзакции со списком
+        изменений этой транзакции.
+        
+        Args:
+            listener: Функция, принимающая список изменений
+        """
+        self._listeners.append(listener)
+
+    def add_reset_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Подписка на сброс состояния
+        
+        Слушатель вызывается, когда изменения другого процесса уже удалены
+        из журнала и не могут быть переданы по одному: производные данные
+        (кеши, индексы) нужно построить заново по базе.
+        
+        Args:
+            listener: Функция без аргументов
+        """
+        self._reset_listeners.append(listener)
+
+    def _notify(self, changes: List[TermChange]) -> None:
+        """Передача зафиксированных изменений слушателям"""
+        if not changes:
+            return
+        for listener in self._listeners:
+            try:
+                listener(changes)
+            except Exception as e:
+                logger.error(f"Ошибка в обработчике изменений {listener}: {e}")
+
+    @contextmanager
+    def _write_transaction(self) -> Iterator[Tuple[sqlite3.Connection, List[TermChange]]]:
+        """
+        Транзакция записи с уведомлением слушателей после фиксации
+        
+        Записи внутри процесса выполняются по одной (SQLite все равно
+        допускает только одного писателя), поэтому слушатели получают
+        изменения строго в порядке версий. Изменения, зафиксированные
+        другими процессами, передаются слушателям перед изменениями
+        транзакции.
+        
+        Yields:
+            Tuple[sqlite3.Connection, List[TermChange]]: Соединение и список,
+                в который добавляются изменения транзакции
+        """
+        with self._write_lock:
+            changes: List[TermChange] = []
+            with self.pool.transaction() as conn:
+                # Блокировка записи уже взята: журнал до текущей версии полон
+                external = self._pending_changes(conn.cursor())
+                yield conn, changes
+                version = self._read_version(conn)[0]
+            self._apply_pending(external, version)
+            self._notify(changes)
+
+    def sync_changes(self) -> bool:
+        """
+        Передача слушателям изменений, зафиксированных другими процессами
+        
+        Проверка без изменений стоит одного PRAGMA data_version на отдельном
+        соединении: значение меняется только после фиксации транзакции
+        другим соединением, поэтому журнал читается лишь при необходимости.
+        
+        Returns:
+            bool: Были ли переданы изменения или выполнен сброс
+        Raises:
+            DatabaseError: При ошибке чтения журнала
+        """
+        if self.pool.in_memory:
+            return False
+        try:
+            with self._sync_lock:
+                if self._sync_conn is None:
+                    self._sync_conn = self.pool.open()
+                data_version = self._sync_conn.execute('PRAGMA data_version').fetchone()[0]
+                if data_version == self._data_version:
+                    return False
+                self._data_version = data_version
+            with self._write_lock:
+                with self.pool.connection() as conn:
+                    conn.execute('BEGIN')
+                    try:
+                        pending = self._pending_changes(conn.cursor())
+                        version = self._read_version(conn)[0]
+                    finally:
+                        conn.commit()
+                return self._apply_pending(pending, version)
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при чтении журнала изменений: {e}")
+            raise DatabaseError(f"Не удалось получить изменения других процессов: {e}")
+
+    def _pending_changes(self, cursor: sqlite3.Cursor) -> Optional[List[TermChange]]:
+        """
+        Изменения из журнала с версией больше переданной слушателям
+        
+        Несколько изменений одного термина объединяются в одно с его
+        текущим состоянием: слушателям важен результат, а не промежуточные
+        версии. Вызывается под _write_lock в открытой транзакции.
+        
+        Args:
+            cursor: Курсор соединения с открытой транзакцией
+        Returns:
+            Optional[List[TermChange]]: Изменения в порядке версий или None,
+                если журнал их уже не содержит
+        """
+        version = self._read_version(cursor.connection)[0]
+        if version <= self._applied_version:
+            return []
+        rows = cursor.execute(
+            'SELECT version, term_id, kind, previous_name FROM term_changes '
+            'WHERE version > ? ORDER BY version',
+            (self._applied_version,)
+        ).fetchall()
+        if not rows or rows[0]['version'] > self._applied_version + 1:
+            return None
+        if not self._listeners:
+            return []
+        
+        # Первый тип изменения и прежнее имя, последняя версия по термину
+        merged: Dict[int, Tuple[str, Optional[str], int]] = {}
+        for row in rows:
+            first = merged.get(row['term_id'])
+            if first is None:
+                merged[row['term_id']] = (row['kind'], row['previous_name'], row['version'])
+            else:
+                merged[row['term_id']] = (first[0], first[1], row['version'])
+        terms = {term.id: term for term in self._load_terms(cursor, 'id', list(merged))}
+        changes = []
+        for term_id, (kind, previous_name, last_version) in merged.items():
+            term = terms.get(term_id)
+            if term is None:
+                if kind == TermChange.ADDED:
+                    continue
+                kind = TermChange.DELETED
+            changes.append(TermChange(kind, last_version, term_id, term, previous_name))
+        changes.sort(key=lambda change: change.version)
+        return changes
+
+    def _apply_pending(self, pending: Optional[List[TermChange]], version: int) -> bool:
+        """
+        Передача изменений других процессов слушателям под _write_lock
+        
+        Args:
+            pending: Результат _pending_changes
+            version: Версия, до которой изменения учтены
+        Returns:
+            bool: Были ли переданы изменения или выполнен сброс
+        """
+        if version <= self._applied_version:
+            return False
+        self._applied_version = version
+        if pending is None:
+            logger.warning("Журнал изменений не содержит пропущенных версий, сброс состояния")
+            for listener in self._reset_listeners:
+                try:
+                    listener()
+                except Exception as e:
+                    logger.error(f"Ошибка в обработчике сброса {listener}: {e}")
+            return True
+        self._notify(pending)
+        return bool(pending)
+
+    def _collect_changes(self, cursor: sqlite3.Cursor, version: int, 
+                         kinds: Dict[int, Tuple[str, Optional[str]]],
+                         terms: Optional[Dict[int, Term]] = None) -> List[TermChange]:
+        """
+        Формирование изменений с актуальным состоянием терминов
+        
+        Args:
+            cursor: Курсор соединения с открытой транзакцией
+            version: Версия набора данных после изменения
+            kinds: Тип изменения и прежнее имя по ID термина
+            terms: Уже известное состояние терминов по ID (не загружается)
+        Returns:
+            List[TermChange]: Изменения (пусто, если слушателей нет)
+        """
+        cursor.executemany(
+            'INSERT INTO term_changes (version, term_id, kind, previous_name) VALUES (?, ?, ?, ?)',
+            (
+                (version, term_id, kind, previous_name)
+                for term_id, (kind, previous_name) in kinds.items()
+            )
+        )
+        if not self._listeners:
+            return []
+        if terms is None:
+            terms = {term.id: term for term in self._load_terms(cursor, 'id', list(kinds))}
+        return [
+            TermChange(kind, version, term_id, terms.get(term_id), previous_name)
+            for term_id, (kind, previous_name) in kinds.items()
+        ]
+
     def initialize_data(self) -> None:
         """Инициализация начальных данных из initial_data.py"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM terms')
-            if cursor.fetchone()[0] == 0:
+            with self.pool.connection() as conn:
+                count = conn.execute('SELECT COUNT(*) FROM terms').fetchone()[0]
+            if count == 0:
                 logger.info("Инициализация начальных данных")
-                for term_data in INITIAL_TERMS:
-                    term = Term(
+                self.bulk_add_terms(
+                    Term(
                         name=term_data['name'],
                         definition=term_data['definition'],
                         source=term_data['source'],
                         related_terms=term_data['related_terms'],
                         relations=term_data['relations']
                     )
-                    self.add_term(term)
+                    for term_data in INITIAL_TERMS
+                )
                 logger.info("Начальные данные успешно добавлены")
         except sqlite3.Error as e:
             logger.error(f"Ошибка при инициализации данных: {e}")
@@ -54,34 +326,180 @@ class DictionaryDB:
     def create_tables(self) -> None:
         """Создание таблиц в базе данных"""
         try:
-            cursor = self.conn.cursor()
-            # Таблица терминов
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS terms (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                definition TEXT NOT NULL,
-                source TEXT,
-                created_at TIMESTAMP,
-                updated_at TIMESTAMP
-            )
-            ''')
-            
-            # Таблица связей между терминами
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS related_terms (
-                term_id INTEGER,
-                related_term TEXT,
-                relation_type TEXT,
-                FOREIGN KEY(term_id) REFERENCES terms(id) ON DELETE CASCADE,
-                PRIMARY KEY(term_id, related_term)
-            )
-            ''')
-            self.conn.commit()
+            with self.pool.transaction() as conn:
+                self._create_schema(conn.cursor())
         except sqlite3.Error as e:
             logger.error(f"Ошибка при создании таблиц: {e}")
             raise DatabaseError(f"Не удалось создать таблицы: {e}")
 
+    def _create_schema(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Создание таблиц, индексов и миграция схемы
+        
+        Args:
+            cursor: Курсор соединения с открытой транзакцией
+        """
+        # Таблица терминов
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS terms (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            name_key TEXT,
+            definition TEXT NOT NULL,
+            source TEXT,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+        ''')
+        
+        # Таблица связей между терминами
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS related_terms (
+            term_id INTEGER,
+            related_term TEXT,
+            relation_type TEXT,
+            FOREIGN KEY(term_id) REFERENCES terms(id) ON DELETE CASCADE,
+            PRIMARY KEY(term_id, related_term)
+        )
+        ''')
+        
+        # Версия набора данных, увеличивается при каждом изменении
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dataset_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            modified_at TIMESTAMP
+        )
+        ''')
+        cursor.execute(
+            'INSERT OR IGNORE INTO dataset_version (id, version, modified_at) VALUES (1, 0, ?)',
+            (datetime.utcnow().isoformat(),)
+        )
+        
+        # Журнал изменений последних версий для других процессов,
+        # работающих с тем же файлом базы (см. sync_changes)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS term_changes (
+            version INTEGER NOT NULL,
+            term_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            previous_name TEXT,
+            PRIMARY KEY (version, term_id)
+        ) WITHOUT ROWID
+        ''')
+        
+        self._migrate_name_key(cursor)
+        
+        # Индексы для сортировки и фильтрации страниц терминов; ID входит
+        # в каждый индекс неявно, поэтому порядок (колонка, id) берется из индекса
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_terms_created_at ON terms(created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_terms_updated_at ON terms(updated_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_terms_source ON terms(source, name_key)')
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_related_terms_type ON related_terms(relation_type, term_id)'
+        )
+        self._create_search_index(cursor)
+
+    def _create_search_index(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Создание полнотекстового индекса FTS5 и триггеров синхронизации
+        
+        Индекс хранит только токены (external content), текст читается из
+        terms. Токенизатор unicode61 приводит кириллицу к нижнему регистру и
+        убирает диакритику (ё = е); префиксные индексы ускоряют поиск по
+        началу слова.
+        
+        Args:
+            cursor: Курсор соединения с открытой транзакцией
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'terms_fts'")
+        exists = cursor.fetchone() is not None
+        cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS terms_fts USING fts5(
+            name, definition, source,
+            content='terms', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+        ''')
+        
+        # Индекс обновляется в той же транзакции, что и таблица терминов
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS terms_fts_insert AFTER INSERT ON terms BEGIN
+            INSERT INTO terms_fts (rowid, name, definition, source)
+            VALUES (new.id, new.name, new.definition, new.source);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS terms_fts_delete AFTER DELETE ON terms BEGIN
+            INSERT INTO terms_fts (terms_fts, rowid, name, definition, source)
+            VALUES ('delete', old.id, old.name, old.definition, old.source);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS terms_fts_update 
+        AFTER UPDATE OF name, definition, source ON terms BEGIN
+            INSERT INTO terms_fts (terms_fts, rowid, name, definition, source)
+            VALUES ('delete', old.id, old.name, old.definition, old.source);
+            INSERT INTO terms_fts (rowid, name, definition, source)
+            VALUES (new.id, new.name, new.definition, new.source);
+        END
+        ''')
+        
+        if not exists:
+            logger.info("Миграция: построение полнотекстового индекса")
+            cursor.execute("INSERT INTO terms_fts (terms_fts) VALUES ('rebuild')")
+
+    def _migrate_name_key(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Добавление и заполнение колонки name_key в базах старого формата
+        
+        Поиск по имени идет по name_key (casefold), а уникальность колонки
+        name (lower) допускала термины, различимые только ею ("Straße" и
+        "STRASSE"). Индекс idx_terms_name_key делается уникальным. Если в
+        базе уже есть такие термины, миграция прерывается: их нужно
+        объединить или переименовать вручную, данные не удаляются.
+        
+        Args:
+            cursor: Курсор текущего соединения
+        Raises:
+            DatabaseError: Если несколько терминов имеют одинаковый name_key
+        """
+        cursor.execute('PRAGMA table_info(terms)')
+        if 'name_key' not in {column['name'] for column in cursor.fetchall()}:
+            logger.info("Миграция: добавление колонки name_key")
+            cursor.execute('ALTER TABLE terms ADD COLUMN name_key TEXT')
+        
+        cursor.execute('SELECT id, name FROM terms WHERE name_key IS NULL')
+        rows = cursor.fetchall()
+        if rows:
+            cursor.executemany(
+                'UPDATE terms SET name_key = ? WHERE id = ?',
+                ((normalize_name(row['name']), row['id']) for row in rows)
+            )
+        
+        cursor.execute('PRAGMA index_list(terms)')
+        indexes = {index['name']: index['unique'] for index in cursor.fetchall()}
+        if indexes.get('idx_terms_name_key'):
+            return
+        cursor.execute(
+            '''SELECT GROUP_CONCAT(id || ' ' || quote(name), ', ') AS terms FROM terms
+               GROUP BY name_key HAVING COUNT(*) > 1'''
+        )
+        conflicts = [row['terms'] for row in cursor.fetchall()]
+        if conflicts:
+            message = (
+                f"Термины с одинаковым именем без учета регистра (ID и имя): "
+                f"{'; '.join(conflicts)}. Объедините или переименуйте их и "
+                f"перезапустите сервис"
+            )
+            logger.error(f"Миграция уникального индекса idx_terms_name_key прервана. {message}")
+            raise DatabaseError(message)
+        if 'idx_terms_name_key' in indexes:
+            logger.info("Миграция: уникальный индекс idx_terms_name_key")
+            cursor.execute('DROP INDEX idx_terms_name_key')
+        cursor.execute('CREATE UNIQUE INDEX idx_terms_name_key ON terms(name_key)')
+
     def add_term(self, term: Term) -> Tuple[bool, str, Optional[int]]:
         """
         Добавление нового термина
@@ -91,70 +509,673 @@ class DictionaryDB:
         Returns:
             Tuple[bool, str, Optional[int]]: (успех, сообщение, id термина)
         """
-        cursor = self.conn.cursor()
+        return self.apply_writes([TermWrite.add(term)])[0]
+
+    def apply_writes(self, writes: List[TermWrite]) -> List[WriteResult]:
+        """
+        Групповая запись изменений одной транзакцией
+        
+        Каждое изменение выполняется в своей точке сохранения и получает
+        собственную версию: ошибка одного изменения (например, занятое имя)
+        откатывает только его и отражается в его результате. Ошибка
+        фиксации отражается в результатах всех изменений.
+        
+        Args:
+            writes: Изменения в порядке применения
+        Returns:
+            List[WriteResult]: (успех, сообщение, ID термина) для каждого изменения
+        """
         try:
-            cursor.execute(
-                '''INSERT INTO terms 
-                   (name, definition, source, created_at, updated_at) 
-                   VALUES (?, ?, ?, ?, ?)''',
-                (term.name.lower(), term.definition, term.source, 
-                 term.created_at, term.updated_at)
-            )
-            term_id = cursor.lastrowid
-            
-            # Добавляем связанные термины
-            for related_term in term.related_terms:
-                cursor.execute(
-                    '''INSERT INTO related_terms 
-                       (term_id, related_term, relation_type) 
-                       VALUES (?, ?, ?)''',
-                    (term_id, related_term, 
-                     term.relations.get(related_term, 'связан с'))
+            with self._write_transaction() as (conn, changes):
+                cursor = conn.cursor()
+                results = [self._apply_write(cursor, changes, write) for write in writes]
+            return results
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при групповой записи {len(writes)} изменений: {e}")
+            for write in writes:
+                write.result, write.changed = None, False
+            return [(False, self._write_error(write, e), None) for write in writes]
+
+    def _apply_write(self, cursor: sqlite3.Cursor, changes: List[TermChange], 
+                     write: TermWrite) -> WriteResult:
+        """
+        Выполнение одного изменения в точке сохранения
+        
+        Args:
+            cursor: Курсор соединения с открытой транзакцией
+            changes: Изменения транзакции для слушателей
+            write: Изменение
+        Returns:
+            WriteResult: (успех, сообщение, ID термина)
+        """
+        applied = len(changes)
+        cursor.execute('SAVEPOINT term_write')
+        try:
+            if write.kind == TermWrite.ADD:
+                result = self._insert_term(cursor, changes, write.term)
+            elif write.kind in (TermWrite.UPDATE, TermWrite.PATCH):
+                result = self._patch_term(cursor, changes, write)
+            else:
+                result = self._delete_term(cursor, changes, write.term_id)
+        except sqlite3.Error as e:
+            cursor.execute('ROLLBACK TO term_write')
+            del changes[applied:]
+            write.result, write.changed = None, False
+            if write.kind == TermWrite.ADD and isinstance(e, sqlite3.IntegrityError):
+                logger.warning(f"Попытка добавить существующий термин: {write.term.name}")
+                result = False, "Термин уже существует", None
+            elif write.kind != TermWrite.DELETE and isinstance(e, sqlite3.IntegrityError):
+                logger.warning(f"Попытка переименовать термин {write.term_id} в существующий")
+                result = False, "Термин с таким именем уже существует", None
+            else:
+                logger.error(f"Ошибка при записи {write}: {e}")
+                result = False, self._write_error(write, e), None
+        cursor.execute('RELEASE term_write')
+        return result
+
+    @staticmethod
+    def _write_error(write: TermWrite, error: sqlite3.Error) -> str:
+        """Сообщение об ошибке изменения"""
+        action = {
+            TermWrite.ADD: 'добавлении',
+            TermWrite.UPDATE: 'обновлении',
+            TermWrite.PATCH: 'обновлении',
+            TermWrite.DELETE: 'удалении',
+        }[write.kind]
+        return f"Ошибка при {action} термина: {error}"
+
+    def _insert_term(self, cursor: sqlite3.Cursor, changes: List[TermChange], 
+                     term: Term) -> WriteResult:
+        """Добавление термина в открытой транзакции (см. add_term)"""
+        cursor.execute(
+            '''INSERT INTO terms 
+               (name, name_key, definition, source, created_at, updated_at) 
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            (term.name.lower(), normalize_name(term.name), term.definition, 
+             term.source, term.created_at, term.updated_at)
+        )
+        term_id = cursor.lastrowid
+        
+        # Добавляем связанные термины
+        cursor.executemany(
+            '''INSERT INTO related_terms 
+               (term_id, related_term, relation_type) 
+               VALUES (?, ?, ?)''',
+            ((term_id, related_term, relation) 
+             for related_term, relation in term.iter_relations())
+        )
+        version = self._bump_version(cursor)
+        changes.extend(self._collect_changes(
+            cursor, version, {term_id: (TermChange.ADDED, None)}
+        ))
+        logger.info(f"Добавлен новый термин: {term.name}")
+        return True, "Термин успешно добавлен", term_id
+
+    def bulk_add_terms(self, terms: Iterable[Term], chunk_size: Optional[int] = None, 
+                       upsert: bool = False) -> List[Tuple[bool, str, Optional[int]]]:
+        """
+        Пакетное добавление или обновление терминов
+        
+        Термины записываются через executemany порциями по chunk_size, каждая
+        порция фиксируется одной транзакцией. Ошибка в порции откатывает
+        только ее и отражается в статусах ее терминов.
+        
+        Args:
+            terms: Термины для записи (итерируются один раз)
+            chunk_size: Количество терминов в одной транзакции
+            upsert: Обновлять существующие термины вместо отказа
+        Returns:
+            List[Tuple[bool, str, Optional[int]]]: (успех, сообщение, id термина)
+                для каждого термина в исходном порядке
+        """
+        chunk_size = max(1, chunk_size or self.BULK_CHUNK_SIZE)
+        results: List[Tuple[bool, str, Optional[int]]] = []
+        iterator = iter(terms)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            try:
+                with self._write_transaction() as (conn, changes):
+                    chunk_results, chunk_changes = self._write_chunk(conn.cursor(), chunk, upsert)
+                    changes.extend(chunk_changes)
+                results.extend(chunk_results)
+            except sqlite3.Error as e:
+                logger.error(f"Ошибка при пакетной записи {len(chunk)} терминов: {e}")
+                results.extend(
+                    (False, f"Ошибка при добавлении термина: {e}", None) for _ in chunk
                 )
+        logger.info(
+            f"Пакетная запись: {sum(1 for success, _, _ in results if success)} "
+            f"из {len(results)} терминов"
+        )
+        return results
+
+    def _write_chunk(self, cursor: sqlite3.Cursor, chunk: List[Term], upsert: bool
+                     ) -> Tuple[List[Tuple[bool, str, Optional[int]]], List[TermChange]]:
+        """
+        Запись одной порции терминов в открытой транзакции
+        
+        Args:
+            cursor: Курсор соединения с открытой транзакцией
+            chunk: Термины порции
+            upsert: Обновлять существующие термины вместо отказа
+        Returns:
+            Tuple[List[Tuple[bool, str, Optional[int]]], List[TermChange]]:
+                Статусы терминов порции и изменения для слушателей
+        """
+        keys = [normalize_name(term.name) for term in chunk]
+        existing = self._ids_by_keys(cursor, keys)
+        
+        # Для каждого имени записывается последний термин порции (upsert)
+        # или первый, если имя еще не занято (добавление)
+        accepted: Dict[str, Term] = {}
+        statuses: List[Optional[str]] = []
+        for key, term in zip(keys, chunk):
+            if upsert:
+                accepted[key] = term
+                statuses.append("Термин успешно обновлен" if key in existing 
+                                else "Термин успешно добавлен")
+            elif key in existing or key in accepted:
+                statuses.append(None)
+            else:
+                accepted[key] = term
+                statuses.append("Термин успешно добавлен")
+        
+        changes: List[TermChange] = []
+        if accepted:
+            now = datetime.utcnow().isoformat()
+            sql = '''INSERT INTO terms 
+                     (name, name_key, definition, source, created_at, updated_at) 
+                     VALUES (?, ?, ?, ?, ?, ?)'''
+            if upsert:
+                # Имя существующего термина не меняется, как и при совпадении по name
+                sql += ''' ON CONFLICT(name_key) DO UPDATE SET 
+                          definition=excluded.definition, 
+                          source=excluded.source, updated_at=?'''
+            cursor.executemany(sql, (
+                (term.name.lower(), key, term.definition, term.source, 
+                 term.created_at, term.updated_at) + ((now,) if upsert else ())
+                for key, term in accepted.items()
+            ))
             
-            self.conn.commit()
-            logger.info(f"Добавлен новый термин: {term.name}")
-            return True, "Термин успешно добавлен", term_id
-        except sqlite3.IntegrityError:
-            logger.warning(f"Попытка добавить существующий термин: {term.name}")
-            return False, "Термин уже существует", None
+            ids = self._ids_by_keys(cursor, list(accepted))
+            if upsert:
+                self._delete_related(cursor, [ids[key][0] for key in accepted if key in existing])
+            cursor.executemany(
+                '''INSERT INTO related_terms 
+                   (term_id, related_term, relation_type) 
+                   VALUES (?, ?, ?)''',
+                (
+                    (ids[key][0], related_term, relation)
+                    for key, term in accepted.items()
+                    for related_term, relation in dict(term.iter_relations()).items()
+                )
+            )
+            version = self._bump_version(cursor)
+            changes = self._collect_changes(cursor, version, {
+                ids[key][0]: (TermChange.UPDATED, existing[key][1]) if key in existing 
+                else (TermChange.ADDED, None)
+                for key in accepted
+            })
+            existing.update(ids)
+        
+        return [
+            (True, message, existing[key][0]) if message 
+            else (False, "Термин уже существует", None)
+            for key, message in zip(keys, statuses)
+        ], changes
+
+    def _bump_version(self, cursor: sqlite3.Cursor) -> int:
+        """
+        Увеличение версии набора данных в текущей транзакции
+        
+        Версии старше CHANGE_LOG_SIZE удаляются из журнала изменений.
+        
+        Args:
+            cursor: Курсор соединения с открытой транзакцией
+        Returns:
+            int: Новая версия
+        """
+        cursor.execute(
+            'UPDATE dataset_version SET version = version + 1, modified_at = ? WHERE id = 1 '
+            'RETURNING version',
+            (datetime.utcnow().isoformat(),)
+        )
+        version = cursor.fetchone()['version']
+        cursor.execute(
+            'DELETE FROM term_changes WHERE version <= ?', (version - self.CHANGE_LOG_SIZE,)
+        )
+        return version
+
+    def search_terms(self, query: str, limit: int = 20, offset: int = 0,
+                     highlight: Tuple[str, str] = ('<mark>', '</mark>')) -> List[SearchHit]:
+        """
+        Полнотекстовый поиск по имени, определению и источнику
+        
+        Args:
+            query: Текст запроса; каждое слово ищется по префиксу
+            limit: Максимальное количество результатов
+            offset: Количество пропускаемых результатов
+            highlight: Маркеры начала и конца совпадения
+        Returns:
+            List[SearchHit]: Результаты в порядке убывания релевантности
+        Raises:
+            DatabaseError: При ошибке базы данных
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        opening, closing = highlight
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.execute(
+                    f'''
+                    SELECT rowid AS id,
+                           highlight(terms_fts, 0, ?, ?) AS name,
+                           snippet(terms_fts, 1, ?, ?, '…', {self.SNIPPET_TOKENS}) AS snippet,
+                           bm25(terms_fts, {", ".join(map(str, self.SEARCH_WEIGHTS))}) AS score
+                    FROM terms_fts
+                    WHERE terms_fts MATCH ?
+                    ORDER BY score
+                    LIMIT ? OFFSET ?
+                    ''',
+                    (opening, closing, opening, closing, match, limit, offset)
+                )
+                return [
+                    SearchHit(row['id'], row['name'], row['snippet'], row['score'])
+                    for row in cursor.fetchall()
+                ]
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при поиске терминов: {e}")
+            raise DatabaseError(f"Не удалось выполнить поиск: {e}")
+
+    def get_version(self) -> Tuple[int, str]:
+        """
+        Текущая версия набора данных
+        
+        Returns:
+            Tuple[int, str]: (версия, время последнего изменения)
+        """
+        try:
+            with self.pool.connection() as conn:
+                return self._read_version(conn)
         except sqlite3.Error as e:
-            logger.error(f"Ошибка при добавлении термина {term.name}: {e}")
-            return False, f"Ошибка при добавлении термина: {e}", None
+            logger.error(f"Ошибка при получении версии данных: {e}")
+            raise DatabaseError(f"Не удалось получить версию данных: {e}")
+
+    def _read_version(self, conn: sqlite3.Connection) -> Tuple[int, str]:
+        """Чтение версии набора данных через указанное соединение"""
+        row = conn.execute('SELECT version, modified_at FROM dataset_version WHERE id = 1').fetchone()
+        return row['version'], row['modified_at']
+
+    def _ids_by_keys(self, cursor: sqlite3.Cursor, keys: List[str]) -> Dict[str, Tuple[int, str]]:
+        """
+        ID и хранимые имена терминов по нормализованным именам
+        
+        Args:
+            cursor: Курсор соединения
+            keys: Имена терминов после normalize_name
+        Returns:
+            Dict[str, Tuple[int, str]]: (ID, имя) найденных терминов по name_key
+        """
+        ids: Dict[str, Tuple[int, str]] = {}
+        for start in range(0, len(keys), self.MAX_SQL_VARIABLES):
+            chunk = keys[start:start + self.MAX_SQL_VARIABLES]
+            cursor.execute(
+                f'SELECT id, name, name_key FROM terms '
+                f'WHERE name_key IN ({", ".join("?" * len(chunk))})', 
+                chunk
+            )
+            ids.update((row['name_key'], (row['id'], row['name'])) for row in cursor.fetchall())
+        return ids
 
-    def get_term(self, term_id: Optional[int] = None, name: Optional[str] = None) -> Term:
+    def _delete_related(self, cursor: sqlite3.Cursor, term_ids: List[int]) -> None:
+        """
+        Удаление связей указанных терминов
+        
+        Args:
+            cursor: Курсор соединения с открытой транзакцией
+            term_ids: ID терминов
+        """
+        for start in range(0, len(term_ids), self.MAX_SQL_VARIABLES):
+            chunk = term_ids[start:start + self.MAX_SQL_VARIABLES]
+            cursor.execute(
+                f'DELETE FROM related_terms WHERE term_id IN ({", ".join("?" * len(chunk))})', 
+                chunk
+            )
+
+    def get_term(self, term_id: Optional[int] = None, name: Optional[str] = None,
+                 as_proto: bool = False) -> StoredTerm:
         """
         Получение термина по ID или имени
         
         Args:
             term_id: ID термина
             name: Имя термина
+            as_proto: Вернуть protobuf сообщение вместо объекта Term
         Returns:
-            Term: Объект термина
+            StoredTerm: Объект термина или protobuf сообщение
         Raises:
             TermNotFoundError: Если термин не найден
         """
         try:
-            cursor = self.conn.cursor()
-            if term_id:
-                cursor.execute('SELECT * FROM terms WHERE id = ?', (term_id,))
-            else:
-                cursor.execute('SELECT * FROM terms WHERE LOWER(name) = LOWER(?)', (name,))
-            
-            row = cursor.fetchone()
-            if not row:
-                raise TermNotFoundError(f"Термин не найден: {name or term_id}")
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                if term_id:
+                    cursor.execute('SELECT * FROM terms WHERE id = ?', (term_id,))
+                else:
+                    cursor.execute('SELECT * FROM terms WHERE name_key = ?', (normalize_name(name),))
                 
-            # Получаем связанные термины
-            cursor.execute('''SELECT related_term, relation_type 
-                            FROM related_terms WHERE term_id = ?''', (row['id'],))
-            related_data = cursor.fetchall()
+                row = cursor.fetchone()
+                if not row:
+                    raise TermNotFoundError(f"Термин не найден: {name or term_id}")
+                    
+                # Получаем связанные термины
+                cursor.execute('''SELECT related_term, relation_type 
+                                FROM related_terms WHERE term_id = ?''', (row['id'],))
+                related_data = cursor.fetchall()
             
-            return Term.from_db_row(row, related_data)
+            return row_factory(as_proto)(row, related_data)
         except sqlite3.Error as e:
             logger.error(f"Ошибка при получении термина: {e}")
             raise DatabaseError(f"Не удалось получить термин: {e}")
 
+    def get_terms_by_names(self, names: List[str], 
+                           as_proto: bool = False) -> Dict[str, StoredTerm]:
+        """
+        Пакетное получение терминов по именам без учета регистра
+        
+        Args:
+            names: Список имен терминов
+            as_proto: Вернуть protobuf сообщения вместо объектов Term
+        Returns:
+            Dict[str, StoredTerm]: Найденные термины по нормализованному имени
+        """
+        keys = list(dict.fromkeys(normalize_name(name) for name in names))
+        try:
+            with self.pool.connection() as conn:
+                terms = self._load_terms(conn.cursor(), 'name_key', keys, row_factory(as_proto))
+            return {normalize_name(term.name): term for term in terms}
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при пакетном получении терминов: {e}")
+            raise DatabaseError(f"Не удалось получить термины: {e}")
+
+    def _load_terms(self, cursor: sqlite3.Cursor, column: str, values: List,
+                    factory: RowFactory = Term.from_db_row) -> List[StoredTerm]:
+        """
+        Загрузка терминов со связями по списку значений колонки
+        
+        Args:
+            cursor: Курсор соединения
+            column: Колонка для отбора ('id' или 'name_key')
+            values: Значения колонки
+            factory: Построение термина из строк базы
+        Returns:
+            List[StoredTerm]: Найденные термины
+        """
+        terms: List[StoredTerm] = []
+        for start in range(0, len(values), self.MAX_SQL_VARIABLES):
+            chunk = values[start:start + self.MAX_SQL_VARIABLES]
+            cursor.execute(
+                f'SELECT * FROM terms WHERE {column} IN ({", ".join("?" * len(chunk))})', chunk
+            )
+            terms.extend(self._attach_related(cursor, cursor.fetchall(), factory))
+        return terms
+
+    def _attach_related(self, cursor: sqlite3.Cursor, rows: List[sqlite3.Row],
+                        factory: RowFactory = Term.from_db_row) -> List[StoredTerm]:
+        """
+        Создание терминов из строк terms с загрузкой их связей одним запросом
+        
+        Args:
+            cursor: Курсор соединения
+            rows: Строки таблицы terms (не более MAX_SQL_VARIABLES)
+            factory: Построение термина из строк базы
+        Returns:
+            List[StoredTerm]: Термины в порядке строк
+        """
+        if not rows:
+            return []
+        ids = [row['id'] for row in rows]
+        cursor.execute(
+            f'''SELECT term_id, related_term, relation_type 
+                FROM related_terms WHERE term_id IN ({', '.join('?' * len(ids))}) 
+                ORDER BY term_id, related_term''',
+            ids
+        )
+        related_by_term: Dict[int, List[sqlite3.Row]] = {}
+        for related in cursor:
+            related_by_term.setdefault(related['term_id'], []).append(related)
+        return [factory(row, related_by_term.get(row['id'], [])) for row in rows]
+
+    def _filter_clause(self, source: Optional[str], relation_type: Optional[str],
+                       correlated: bool = False) -> Tuple[List[str], List]:
+        """
+        Условия и параметры отбора терминов по источнику и типу связи
+        
+        Args:
+            source: Отбор по источнику
+            relation_type: Отбор терминов, имеющих связь этого типа
+            correlated: Проверять тип связи подзапросом для каждой строки
+                (выгодно для частых типов), а не списком ID (для редких)
+        Returns:
+            Tuple[List[str], List]: (условия WHERE, параметры)
+        """
+        conditions: List[str] = []
+        params: List = []
+        if source is not None:
+            conditions.append('source = ?')
+            params.append(source)
+        if relation_type is not None:
+            if correlated:
+                conditions.append(
+                    'EXISTS (SELECT 1 FROM related_terms r '
+                    'WHERE r.relation_type = ? AND r.term_id = terms.id)'
+                )
+            else:
+                conditions.append(
+                    'id IN (SELECT term_id FROM related_terms WHERE relation_type = ?)'
+                )
+            params.append(relation_type)
+        return conditions, params
+
+    def _is_frequent_relation(self, cursor: sqlite3.Cursor, relation_type: str) -> bool:
+        """
+        Встречается ли тип связи не реже FREQUENT_RELATION_ROWS раз
+        
+        Подсчет останавливается на пороге, поэтому проверка дешевая при
+        любом размере таблицы связей.
+        """
+        cursor.execute(
+            'SELECT COUNT(*) FROM (SELECT 1 FROM related_terms WHERE relation_type = ? LIMIT ?)',
+            (relation_type, self.FREQUENT_RELATION_ROWS)
+        )
+        return cursor.fetchone()[0] >= self.FREQUENT_RELATION_ROWS
+
+    def page_terms(self, order_by: str = 'id', descending: bool = False,
+                   after: Optional[Tuple[Optional[str], int]] = None, limit: int = 100,
+                   source: Optional[str] = None, relation_type: Optional[str] = None,
+                   as_proto: bool = False) -> List[StoredTerm]:
+        """
+        Страница терминов с сортировкой и фильтрацией
+        
+        Используется постраничная выборка по ключу: следующая страница
+        начинается после пары (значение колонки, ID) последнего термина
+        предыдущей, поэтому время запроса не зависит от номера страницы.
+        
+        Args:
+            order_by: Колонка сортировки (ключ SORT_COLUMNS)
+            descending: Сортировка по убыванию
+            after: (значение колонки, ID) последнего термина предыдущей страницы
+            limit: Размер страницы (не более MAX_SQL_VARIABLES)
+            source: Отбор по источнику
+            relation_type: Отбор терминов, имеющих связь этого типа
+            as_proto: Вернуть protobuf сообщения вместо объектов Term
+        Returns:
+            List[StoredTerm]: Термины страницы
+        Raises:
+            ValueError: Если колонка сортировки неизвестна
+            DatabaseError: При ошибке базы данных
+        """
+        column = self.SORT_COLUMNS.get(order_by)
+        if column is None:
+            raise ValueError(f"Некорректная колонка сортировки: {order_by}")
+        limit = min(limit, self.MAX_SQL_VARIABLES)
+        direction = 'DESC' if descending else 'ASC'
+        comparison = '<' if descending else '>'
+        
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                correlated = (relation_type is not None 
+                              and self._is_frequent_relation(cursor, relation_type))
+                
+                def select(extra: List[str], extra_params: List, order: str, 
+                           count: int) -> List[sqlite3.Row]:
+                    conditions, params = self._filter_clause(source, relation_type, correlated)
+                    conditions = conditions + extra
+                    where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+                    cursor.execute(
+                        f'SELECT * FROM terms {where} ORDER BY {order} LIMIT ?',
+                        (*params, *extra_params, count)
+                    )
+                    return cursor.fetchall()
+                
+                if column == 'id':
+                    extra, extra_params = [], []
+                    if after is not None:
+                        extra, extra_params = [f'id {comparison} ?'], [after[1]]
+                    rows = select(extra, extra_params, f'id {direction}', limit)
+                else:
+                    # Ключ (колонка, id) обходится двумя поисками по индексу:
+                    # остаток терминов с тем же значением колонки, затем
+                    # термины со следующими значениями
+                    rows = []
+                    extra, extra_params = [], []
+                    if after is not None:
+                        value, last_id = after
+                        rows = select([f'{column} = ?', f'id {comparison} ?'], [value, last_id],
+                                      f'id {direction}', limit)
+                        extra, extra_params = [f'{column} {comparison} ?'], [value]
+                    if len(rows) < limit:
+                        rows += select(extra, extra_params, 
+                                       f'{column} {direction}, id {direction}', limit - len(rows))
+                return self._attach_related(cursor, rows, row_factory(as_proto))
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при получении страницы терминов: {e}")
+            raise DatabaseError(f"Не удалось получить страницу терминов: {e}")
+
+    def count_terms(self, source: Optional[str] = None, 
+                    relation_type: Optional[str] = None) -> int:
+        """
+        Количество терминов, удовлетворяющих фильтрам
+        
+        Args:
+            source: Отбор по источнику
+            relation_type: Отбор терминов, имеющих связь этого типа
+        Returns:
+            int: Количество терминов
+        Raises:
+            DatabaseError: При ошибке базы данных
+        """
+        try:
+            with self.pool.connection() as conn:
+                if source is None and relation_type is not None:
+                    # Подсчет только по покрывающему индексу связей
+                    return conn.execute(
+                        'SELECT COUNT(DISTINCT term_id) FROM related_terms WHERE relation_type = ?',
+                        (relation_type,)
+                    ).fetchone()[0]
+                conditions, params = self._filter_clause(source, relation_type)
+                where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+                return conn.execute(f'SELECT COUNT(*) FROM terms {where}', params).fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при подсчете терминов: {e}")
+            raise DatabaseError(f"Не удалось подсчитать термины: {e}")
+
+    def list_facets(self) -> Tuple[List[str], List[str]]:
+        """
+        Значения для фильтров: источники и типы связей
+        
+        Returns:
+            Tuple[List[str], List[str]]: (источники, типы связей) по алфавиту
+        Raises:
+            DatabaseError: При ошибке базы данных
+        """
+        try:
+            with self.pool.connection() as conn:
+                sources = [
+                    row[0] for row in conn.execute(
+                        "SELECT DISTINCT source FROM terms WHERE source IS NOT NULL AND source != '' "
+                        "ORDER BY source"
+                    )
+                ]
+                relation_types = [
+                    row[0] for row in conn.execute(
+                        "SELECT DISTINCT relation_type FROM related_terms "
+                        "WHERE relation_type IS NOT NULL AND relation_type != '' "
+                        "ORDER BY relation_type"
+                    )
+                ]
+                return sources, relation_types
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при получении значений фильтров: {e}")
+            raise DatabaseError(f"Не удалось получить значения фильтров: {e}")
+
+    def iter_terms(self, after_id: int = 0, limit: Optional[int] = None,
+                   as_proto: bool = False) -> Iterator[StoredTerm]:
+        """
+        Последовательный обход терминов в порядке возрастания ID
+        
+        Термины и связи читаются двумя курсорами (terms и упорядоченный по
+        term_id проход по related_terms), которые сливаются по мере итерации,
+        поэтому расход памяти не зависит от размера таблицы.
+        
+        Args:
+            after_id: Вернуть термины с ID строго больше указанного
+            limit: Максимальное количество терминов (None - без ограничения)
+            as_proto: Выдавать protobuf сообщения вместо объектов Term
+        Yields:
+            StoredTerm: Объект термина или protobuf сообщение
+        """
+        try:
+            with self.pool.connection() as conn:
+                yield from self._iter_terms(conn, after_id, limit, row_factory(as_proto))
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при обходе терминов: {e}")
+            raise DatabaseError(f"Не удалось получить список терминов: {e}")
+
+    def _iter_terms(self, conn: sqlite3.Connection, after_id: int = 0, 
+                    limit: Optional[int] = None, 
+                    factory: RowFactory = Term.from_db_row) -> Iterator[StoredTerm]:
+        """Обход терминов через указанное соединение (см. iter_terms)"""
+        terms_cursor = conn.execute(
+            'SELECT * FROM terms WHERE id > ? ORDER BY id LIMIT ?',
+            (after_id, -1 if limit is None else limit)
+        )
+        related_cursor = conn.execute(
+            '''SELECT term_id, related_term, relation_type 
+               FROM related_terms WHERE term_id > ? 
+               ORDER BY term_id, related_term''',
+            (after_id,)
+        )
+        try:
+            pending = next(related_cursor, None)
+            for row in terms_cursor:
+                # Пропускаем связи удаленных терминов
+                while pending is not None and pending['term_id'] < row['id']:
+                    pending = next(related_cursor, None)
+                related_data = []
+                while pending is not None and pending['term_id'] == row['id']:
+                    related_data.append(pending)
+                    pending = next(related_cursor, None)
+                yield factory(row, related_data)
+        finally:
+            # Незавершенный курсор удерживает снимок чтения соединения
+            terms_cursor.close()
+            related_cursor.close()
+
     def list_terms(self) -> List[Term]:
         """
         Получение списка всех терминов
@@ -162,19 +1183,54 @@ class DictionaryDB:
         Returns:
             List[Term]: Список всех терминов
         """
+        return list(self.iter_terms())
+
+    def list_terms_with_version(self, as_proto: bool = False
+                                ) -> Tuple[int, str, List[StoredTerm]]:
+        """
+        Согласованный снимок всех терминов вместе с версией набора данных
+        
+        Версия и термины читаются в одной транзакции чтения, поэтому
+        снимок точно соответствует возвращенной версии.
+        
+        Args:
+            as_proto: Вернуть protobuf сообщения вместо объектов Term
+        Returns:
+            Tuple[int, str, List[StoredTerm]]: (версия, время изменения, термины)
+        """
+        with self.scan_terms_with_version(as_proto) as (version, modified_at, terms):
+            return version, modified_at, list(terms)
+
+    @contextmanager
+    def scan_terms_with_version(self, as_proto: bool = False
+                                ) -> Iterator[Tuple[int, str, Iterator[StoredTerm]]]:
+        """
+        Потоковый обход всех терминов в одной транзакции чтения с версией
+        
+        В отличие от list_terms_with_version, термины не накапливаются в
+        памяти; транзакция открыта до выхода из блока with.
+        
+        Args:
+            as_proto: Выдавать protobuf сообщения вместо объектов Term
+        Yields:
+            Tuple[int, str, Iterator[StoredTerm]]: (версия, время изменения,
+                итератор терминов в порядке возрастания ID)
+        Raises:
+            DatabaseError: При ошибке базы данных
+        """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT * FROM terms')
-            terms = []
-            for row in cursor.fetchall():
-                # Получаем связанные термины для каждого термина
-                cursor.execute('''SELECT related_term, relation_type 
-                                FROM related_terms WHERE term_id = ?''', (row['id'],))
-                related_data = cursor.fetchall()
-                terms.append(Term.from_db_row(row, related_data))
-            return terms
+            with self.pool.connection() as conn:
+                conn.execute('BEGIN')
+                terms = self._iter_terms(conn, factory=row_factory(as_proto))
+                try:
+                    version, modified_at = self._read_version(conn)
+                    yield version, modified_at, terms
+                finally:
+                    # Незавершенный обход закрывает курсоры до конца транзакции
+                    terms.close()
+                    conn.commit()
         except sqlite3.Error as e:
-            logger.error(f"Ошибка при получении списка терминов: {e}")
+            logger.error(f"Ошибка при получении снимка терминов: {e}")
             raise DatabaseError(f"Не удалось получить список терминов: {e}")
 
     def update_term(self, term_id: int, term: Term) -> Tuple[bool, str]:
@@ -187,39 +1243,95 @@ class DictionaryDB:
         Returns:
             Tuple[bool, str]: (успех, сообщение)
         """
-        try:
-            cursor = self.conn.cursor()
-            now = datetime.utcnow().isoformat()
-            
-            # Проверяем существование термина
-            cursor.execute('SELECT id FROM terms WHERE id = ?', (term_id,))
-            if not cursor.fetchone():
-                logger.warning(f"Попытка обновить несуществующий термин: {term_id}")
-                return False, "Термин не найден"
-            
-            # Обновляем основные данные термина
+        success, message, _ = self.apply_writes([TermWrite.update(term_id, term)])[0]
+        return success, message
+
+    def patch_term(self, term_id: int, patch: TermPatch) -> Tuple[bool, str, Optional[Term]]:
+        """
+        Частичное обновление термина
+        
+        Args:
+            term_id: ID термина для обновления
+            patch: Изменяемые поля и связи
+        Returns:
+            Tuple[bool, str, Optional[Term]]: (успех, сообщение, термин после
+                изменения)
+        """
+        write = TermWrite.patch(term_id, patch)
+        success, message, _ = self.apply_writes([write])[0]
+        return success, message, write.result if success else None
+
+    def _patch_term(self, cursor: sqlite3.Cursor, changes: List[TermChange], 
+                    write: TermWrite) -> WriteResult:
+        """
+        Обновление термина в открытой транзакции (см. update_term, patch_term)
+        
+        Записываются только изменившиеся колонки и строки related_terms;
+        без изменений версия не увеличивается. Термин после изменения
+        строится из прочитанных для сравнения строк и сохраняется в
+        write.result, повторного чтения нет; write.changed - были ли отличия.
+        """
+        term_id, patch = write.term_id, write.term_patch
+        # Проверяем существование термина
+        cursor.execute('SELECT * FROM terms WHERE id = ?', (term_id,))
+        previous = cursor.fetchone()
+        if not previous:
+            logger.warning(f"Попытка обновить несуществующий термин: {term_id}")
+            return False, "Термин не найден", None
+        
+        row = dict(previous)
+        columns: Dict[str, Any] = {}
+        if patch.name is not None and patch.name.lower() != row['name']:
+            columns['name'] = patch.name.lower()
+            columns['name_key'] = normalize_name(patch.name)
+        if patch.definition is not None and patch.definition != row['definition']:
+            columns['definition'] = patch.definition
+        if patch.source is not None and patch.source != (row['source'] or ""):
+            columns['source'] = patch.source
+        
+        # Сравниваем связи с текущими строками related_terms
+        cursor.execute(
+            'SELECT related_term, relation_type FROM related_terms WHERE term_id = ?', (term_id,)
+        )
+        current = {related['related_term']: related['relation_type'] for related in cursor}
+        relations = patch.apply_relations(current)
+        removed = [related for related in current if related not in relations]
+        changed = [
+            (term_id, related, relation) for related, relation in relations.items()
+            if related not in current or current[related] != relation
+        ]
+        if columns or removed or changed:
+            columns['updated_at'] = datetime.utcnow().isoformat()
             cursor.execute(
-                'UPDATE terms SET name=?, definition=?, source=?, updated_at=? WHERE id=?',
-                (term.name.lower(), term.definition, term.source, now, term_id)
+                f'UPDATE terms SET {", ".join(f"{column}=?" for column in columns)} WHERE id=?',
+                (*columns.values(), term_id)
             )
-            
-            # Обновляем связанные термины
-            cursor.execute('DELETE FROM related_terms WHERE term_id=?', (term_id,))
-            for related_term in term.related_terms:
-                cursor.execute(
-                    '''INSERT INTO related_terms 
-                       (term_id, related_term, relation_type) 
-                       VALUES (?, ?, ?)''',
-                    (term_id, related_term, 
-                     term.relations.get(related_term, 'связан с'))
-                )
-            
-            self.conn.commit()
-            logger.info(f"Обновлен термин: {term.name}")
-            return True, "Термин успешно обновлен"
-        except sqlite3.Error as e:
-            logger.error(f"Ошибка при обновлении термина {term_id}: {e}")
-            return False, f"Ошибка при обновлении термина: {e}"
+            cursor.executemany(
+                'DELETE FROM related_terms WHERE term_id=? AND related_term=?',
+                ((term_id, related) for related in removed)
+            )
+            cursor.executemany(
+                '''INSERT INTO related_terms (term_id, related_term, relation_type) 
+                   VALUES (?, ?, ?)
+                   ON CONFLICT(term_id, related_term) 
+                   DO UPDATE SET relation_type=excluded.relation_type''',
+                changed
+            )
+        
+        row.update(columns)
+        write.result = Term.from_db_row(row, [
+            {'related_term': related, 'relation_type': relations[related]}
+            for related in sorted(relations)
+        ])
+        write.changed = bool(columns)
+        if write.changed:
+            version = self._bump_version(cursor)
+            changes.extend(self._collect_changes(
+                cursor, version, {term_id: (TermChange.UPDATED, previous['name'])},
+                {term_id: write.result}
+            ))
+            logger.info(f"Обновлен термин: {write.result.name}")
+        return True, "Термин успешно обновлен", term_id
 
     def delete_term(self, term_id: int) -> Tuple[bool, str]:
         """
@@ -230,21 +1342,24 @@ class DictionaryDB:
         Returns:
             Tuple[bool, str]: (успех, сообщение)
         """
-        try:
-            cursor = self.conn.cursor()
-            
-            # Проверяем существование термина
-            cursor.execute('SELECT id FROM terms WHERE id = ?', (term_id,))
-            if not cursor.fetchone():
-                logger.warning(f"Попытка удалить несуществующий термин: {term_id}")
-                return False, "Термин не найден"
-            
-            cursor.execute('DELETE FROM related_terms WHERE term_id=?', (term_id,))
-            cursor.execute('DELETE FROM terms WHERE id=?', (term_id,))
-            self.conn.commit()
-            
-            logger.info(f"Удален термин с ID: {term_id}")
-            return True, "Термин успешно удален"
-        except sqlite3.Error as e:
-            logger.error(f"Ошибка при удалении термина {term_id}: {e}")
-            return False, f"Ошибка при удалении термина: {e}" 
\ No newline at end of file
+        success, message, _ = self.apply_writes([TermWrite.delete(term_id)])[0]
+        return success, message
+
+    def _delete_term(self, cursor: sqlite3.Cursor, changes: List[TermChange], 
+                     term_id: int) -> WriteResult:
+        """Удаление термина в открытой транзакции (см. delete_term)"""
+        # Проверяем существование термина
+        cursor.execute('SELECT id, name FROM terms WHERE id = ?', (term_id,))
+        previous = cursor.fetchone()
+        if not previous:
+            logger.warning(f"Попытка удалить несуществующий термин: {term_id}")
+            return False, "Термин не найден", None
+        
+        cursor.execute('DELETE FROM related_terms WHERE term_id=?', (term_id,))
+        cursor.execute('DELETE FROM terms WHERE id=?', (term_id,))
+        version = self._bump_version(cursor)
+        changes.extend(self._collect_changes(
+            cursor, version, {term_id: (TermChange.DELETED, previous['name'])}
+        ))
+        logger.info(f"Удален термин с ID: {term_id}")
+        return True, "Термин успешно удален", term_id
@@ -0,0 +1,131 @@
+"""Модуль с пулом соединений SQLite"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from dictionary_service.exceptions.errors import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+class ConnectionPool:
+    """
+    Ограниченный потокобезопасный пул соединений SQLite
+    
+    Каждое соединение одновременно используется только одним потоком.
+    Файловые базы открываются в режиме WAL, поэтому читатели не ждут
+    фиксации транзакций писателей, а писатели ожидают друг друга не
+    дольше busy_timeout.
+    """
+    
+    def __init__(self, db_path: str, size: int = 10, 
+                 busy_timeout: float = 5.0, acquire_timeout: float = 30.0):
+        """
+        Инициализация пула
+        
+        Args:
+            db_path: Путь к файлу базы данных
+            size: Максимальное количество соединений
+            busy_timeout: Время ожидания блокировки базы в секундах
+            acquire_timeout: Время ожидания свободного соединения в секундах
+        """
+        self.db_path = db_path
+        self.in_memory = db_path == ':memory:' or 'mode=memory' in db_path
+        # Каждое соединение к :memory: открывает отдельную базу
+        self.size = 1 if self.in_memory else max(1, size)
+        self.busy_timeout = busy_timeout
+        self.acquire_timeout = acquire_timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=self.size)
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Открытие и настройка нового соединения"""
+        conn = sqlite3.connect(
+            self.db_path, 
+            timeout=self.busy_timeout, 
+            check_same_thread=False,
+            uri=self.db_path.startswith('file:')
+        )
+        conn.row_factory = sqlite3.Row
+        if not self.in_memory:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout * 1000)}')
+        return conn
+    
+    def open(self) -> sqlite3.Connection:
+        """
+        Отдельное соединение вне пула с теми же настройками
+        
+        Returns:
+            sqlite3.Connection: Новое соединение, закрывается вызывающим
+        """
+        return self._connect()
+    
+    def _acquire(self) -> sqlite3.Connection:
+        """Получение свободного соединения или создание нового"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._connections) < self.size:
+                conn = self._connect()
+                self._connections.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise DatabaseError("Нет свободных соединений с базой данных")
+    
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """Возврат соединения в пул"""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Соединение для чтения
+        
+        Yields:
+            sqlite3.Connection: Соединение из пула
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Соединение с открытой транзакцией записи
+        
+        Транзакция начинается с BEGIN IMMEDIATE, чтобы блокировка записи
+        бралась сразу и ожидала конкурентов через busy_timeout. При выходе
+        без исключения транзакция фиксируется, иначе откатывается.
+        
+        Yields:
+            sqlite3.Connection: Соединение из пула
+        """
+        with self.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+    
+    def close(self) -> None:
+        """Закрытие всех соединений пула"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
@@ -0,0 +1,353 @@
+"""
+Модуль с файлом снимка словаря только для чтения
+
+Снимок содержит все термины одной версии набора данных и открывается
+через mmap, поэтому процессы сервера на одной машине разделяют его
+страницы в кеше ОС, а ответы собираются срезами файла без разбора и
+сериализации сообщений. Файл состоит из заголовка, таблицы секций и
+секций, выровненных по 8 байт:
+  - ids, record_offsets, records: ID терминов по возрастанию и
+    сериализованные термины в том же порядке, каждый как поле terms
+    сообщения ListTermsResponse (оно же поле term в DefinitionResponse);
+  - name_offsets, names: имена терминов в порядке ID;
+  - key_offsets, keys, key_order: отсортированные нормализованные имена
+    и позиции соответствующих терминов в порядке ID;
+  - adjacency, targets, relations: связи в формате CSR - границы связей
+    каждого термина и номера связанного имени и типа связи;
+  - target_offsets, target_names, relation_offsets, relation_names:
+    таблицы связанных имен и типов связей;
+  - modified_at: время изменения версии.
+Числа записываются в порядке байт машины: файл предназначен для
+процессов на той же машине и строится заново при смене версии.
+"""
+
+import argparse
+import fcntl
+import logging
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from dictionary_service.database.db import DictionaryDB
+from dictionary_service.models.term import normalize_name
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'TGSNAP\0\0'
+FORMAT_VERSION = 1
+# Маркер порядка байт: читается как 1 только на машине с тем же порядком
+BYTE_ORDER_MARK = 1
+# Заголовок: сигнатура, версия формата, маркер порядка байт, версия данных
+HEADER = struct.Struct('=8sIIq')
+# Смещение и длина секции
+SECTION = struct.Struct('=QQ')
+SECTIONS = (
+    'ids', 'record_offsets', 'records',
+    'name_offsets', 'names',
+    'key_offsets', 'keys', 'key_order',
+    'adjacency', 'targets', 'relations',
+    'target_offsets', 'target_names', 'relation_offsets', 'relation_names',
+    'modified_at',
+)
+ALIGNMENT = 8
+
+class SnapshotTerm(NamedTuple):
+    """Термин снимка для построения индексов в памяти (см. TermGraph, NameIndex)"""
+    id: int
+    name: str
+    # Пары (связанный термин, тип связи)
+    relations: Tuple[Tuple[str, str], ...]
+
+    def iter_relations(self) -> Iterator[Tuple[str, str]]:
+        """Обход связей, как Term.iter_relations"""
+        return iter(self.relations)
+
+class _Strings:
+    """Таблица строк снимка: смещения и общий блок байт"""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return self._blob[self._offsets[index]:self._offsets[index + 1]].tobytes()
+
+    def decode(self, index: int) -> str:
+        """Строка с номером index"""
+        return self[index].decode('utf-8')
+
+def _frame(data: bytes) -> bytes:
+    """Сериализованный термин как поле 1 (terms / term) с длиной"""
+    header = bytearray(b'\x0a')
+    length = len(data)
+    while length > 0x7f:
+        header.append(length & 0x7f | 0x80)
+        length >>= 7
+    header.append(length)
+    return bytes(header) + data
+
+class _StringsBuilder:
+    """Накопление таблицы строк при записи снимка"""
+
+    def __init__(self):
+        self.offsets = array('Q', [0])
+        self.blob = bytearray()
+
+    def append(self, value: str) -> None:
+        self.blob += value.encode('utf-8')
+        self.offsets.append(len(self.blob))
+
+def write_snapshot(db: DictionaryDB, path: str) -> int:
+    """
+    Выгрузка всех терминов в файл снимка
+
+    Термины читаются одной транзакцией, файл записывается рядом и
+    заменяет прежний атомарно: процессы, открывшие прежний файл,
+    продолжают читать его до переоткрытия.
+
+    Args:
+        db: База данных словаря
+        path: Путь к файлу снимка
+    Returns:
+        int: Версия набора данных в снимке
+    Raises:
+        DatabaseError: При ошибке чтения из базы
+        OSError: При ошибке записи файла
+    """
+    ids = array('q')
+    record_offsets = array('Q', [0])
+    records = bytearray()
+    names = _StringsBuilder()
+    keys: List[Tuple[bytes, int]] = []
+    adjacency = array('Q', [0])
+    targets = array('I')
+    relations = array('I')
+    target_names = _StringsBuilder()
+    relation_names = _StringsBuilder()
+    target_index: Dict[str, int] = {}
+    relation_index: Dict[str, int] = {}
+
+    with db.scan_terms_with_version() as (version, modified_at, terms):
+        for term in terms:
+            keys.append((normalize_name(term.name).encode('utf-8'), len(ids)))
+            ids.append(term.id)
+            records += _frame(term.to_proto().SerializeToString())
+            record_offsets.append(len(records))
+            names.append(term.name)
+            for related, relation in term.iter_relations():
+                if related not in target_index:
+                    target_index[related] = len(target_index)
+                    target_names.append(related)
+                if relation not in relation_index:
+                    relation_index[relation] = len(relation_index)
+                    relation_names.append(relation)
+                targets.append(target_index[related])
+                relations.append(relation_index[relation])
+            adjacency.append(len(targets))
+
+    # Порядок байт UTF-8 совпадает с порядком кодовых точек строк
+    keys.sort()
+    key_names = _StringsBuilder()
+    key_order = array('I')
+    for key, index in keys:
+        key_names.blob += key
+        key_names.offsets.append(len(key_names.blob))
+        key_order.append(index)
+
+    sections = {
+        'ids': ids, 'record_offsets': record_offsets, 'records': records,
+        'name_offsets': names.offsets, 'names': names.blob,
+        'key_offsets': key_names.offsets, 'keys': key_names.blob, 'key_order': key_order,
+        'adjacency': adjacency, 'targets': targets, 'relations': relations,
+        'target_offsets': target_names.offsets, 'target_names': target_names.blob,
+        'relation_offsets': relation_names.offsets, 'relation_names': relation_names.blob,
+        'modified_at': modified_at.encode('utf-8'),
+    }
+    data = [memoryview(sections[name]).cast('B') for name in SECTIONS]
+    table = bytearray()
+    position = HEADER.size + SECTION.size * len(SECTIONS)
+    for section in data:
+        position += -position % ALIGNMENT
+        table += SECTION.pack(position, len(section))
+        position += len(section)
+
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER_MARK, version))
+            file.write(table)
+            for section in data:
+                file.write(b'\0' * (-file.tell() % ALIGNMENT))
+                file.write(section)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    logger.info(f"Записан снимок словаря {path}: {len(ids)} терминов, версия {version}")
+    return version
+
+class GlossarySnapshot:
+    """
+    Снимок словаря, открытый через mmap
+
+    Методы возвращают срезы memoryview файла без копирования; позиции
+    терминов соответствуют порядку возрастания ID.
+    """
+
+    def __init__(self, path: str):
+        """
+        Открытие файла снимка
+
+        Args:
+            path: Путь к файлу снимка
+        Raises:
+            OSError: Если файл не удалось открыть
+            ValueError: Если файл не является снимком этого формата
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        table_size = HEADER.size + SECTION.size * len(SECTIONS)
+        if len(view) < table_size:
+            raise ValueError(f"Некорректный файл снимка: {path}")
+        magic, format_version, byte_order, self.version = HEADER.unpack_from(view)
+        if magic != MAGIC or format_version != FORMAT_VERSION or byte_order != BYTE_ORDER_MARK:
+            raise ValueError(f"Некорректный файл снимка: {path}")
+        sections = {}
+        for number, name in enumerate(SECTIONS):
+            offset, length = SECTION.unpack_from(view, HEADER.size + SECTION.size * number)
+            if offset + length > len(view):
+                raise ValueError(f"Некорректный файл снимка: {path}")
+            sections[name] = view[offset:offset + length]
+
+        self._ids = sections['ids'].cast('q')
+        self._record_offsets = sections['record_offsets'].cast('Q')
+        self._records = sections['records']
+        self._names = _Strings(sections['name_offsets'].cast('Q'), sections['names'])
+        self._keys = _Strings(sections['key_offsets'].cast('Q'), sections['keys'])
+        self._key_order = sections['key_order'].cast('I')
+        self._adjacency = sections['adjacency'].cast('Q')
+        self._targets = sections['targets'].cast('I')
+        self._relations = sections['relations'].cast('I')
+        self._target_names = _Strings(sections['target_offsets'].cast('Q'),
+                                      sections['target_names'])
+        self._relation_names = _Strings(sections['relation_offsets'].cast('Q'),
+                                        sections['relation_names'])
+        self.modified_at = sections['modified_at'].tobytes().decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def find(self, name: str) -> Optional[int]:
+        """
+        Позиция термина по имени без учета регистра
+
+        Args:
+            name: Имя термина
+        Returns:
+            Optional[int]: Позиция термина или None, если его нет
+        """
+        key = normalize_name(name).encode('utf-8')
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._key_order[position]
+        return None
+
+    def index_after(self, term_id: int) -> int:
+        """Позиция первого термина с ID больше term_id"""
+        return bisect_right(self._ids, term_id)
+
+    def term_id(self, index: int) -> int:
+        """ID термина в позиции index"""
+        return self._ids[index]
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> memoryview:
+        """
+        Сериализованные термины позиций [start, stop)
+
+        Срез является корректным ListTermsResponse с этими терминами, а
+        срез одного термина - корректным DefinitionResponse.
+
+        Args:
+            start: Первая позиция
+            stop: Позиция после последней (None - до конца)
+        Returns:
+            memoryview: Срез файла без копирования
+        """
+        stop = len(self._ids) if stop is None else min(stop, len(self._ids))
+        return self._records[self._record_offsets[start]:self._record_offsets[max(start, stop)]]
+
+    def iter_terms(self) -> Iterator[SnapshotTerm]:
+        """
+        Обход терминов со связями в порядке ID
+
+        Yields:
+            SnapshotTerm: Имя, ID и связи термина
+        """
+        target_names = [self._target_names.decode(i) for i in range(len(self._target_names))]
+        relation_names = [self._relation_names.decode(i)
+                          for i in range(len(self._relation_names))]
+        for index in range(len(self._ids)):
+            start, stop = self._adjacency[index], self._adjacency[index + 1]
+            yield SnapshotTerm(self._ids[index], self._names.decode(index), tuple(
+                (target_names[target], relation_names[relation])
+                for target, relation in zip(self._targets[start:stop],
+                                            self._relations[start:stop])
+            ))
+
+def open_snapshot(db: DictionaryDB, path: str) -> GlossarySnapshot:
+    """
+    Открытие снимка текущей версии, с записью при необходимости
+
+    Запись выполняется под блокировкой файла path + '.lock': процессы,
+    одновременно обнаружившие смену версии, ждут первого из них и
+    открывают записанный им файл.
+
+    Args:
+        db: База данных словаря
+        path: Путь к файлу снимка
+    Returns:
+        GlossarySnapshot: Снимок версии, актуальной на момент проверки
+    Raises:
+        DatabaseError: При ошибке чтения из базы
+        OSError: При ошибке записи или открытия файла
+    """
+    with open(f'{path}.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            version = db.get_version()[0]
+            if os.path.exists(path):
+                try:
+                    snapshot = GlossarySnapshot(path)
+                    if snapshot.version == version:
+                        return snapshot
+                except ValueError as e:
+                    logger.warning(f"{e}, снимок будет записан заново")
+            write_snapshot(db, path)
+            return GlossarySnapshot(path)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Выгрузка снимка из командной строки"""
+    parser = argparse.ArgumentParser(description="Выгрузка снимка словаря для mmap")
+    parser.add_argument('--db', default='dictionary.db', help="Путь к файлу базы данных")
+    parser.add_argument('path', help="Путь к файлу снимка")
+    args = parser.parse_args(argv)
+    db = DictionaryDB(args.db)
+    try:
+        write_snapshot(db, args.path)
+    finally:
+        db.pool.close()
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
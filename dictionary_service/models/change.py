@@ -0,0 +1,37 @@
+"""Модуль с моделью изменения набора данных"""
+
+from typing import Optional
+
+from dictionary_service.models.term import Term
+
+class TermChange:
+    """Изменение одного термина, зафиксированное в базе данных"""
+    
+    ADDED = 'added'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    
+    def __init__(self, 
+                 kind: str,
+                 version: int,
+                 term_id: int,
+                 term: Optional[Term] = None,
+                 previous_name: Optional[str] = None):
+        """
+        Инициализация изменения
+        
+        Args:
+            kind: Тип изменения (ADDED, UPDATED, DELETED)
+            version: Версия набора данных после изменения
+            term_id: ID термина
+            term: Состояние термина после изменения (нет для DELETED)
+            previous_name: Имя термина до изменения (для UPDATED и DELETED)
+        """
+        self.kind = kind
+        self.version = version
+        self.term_id = term_id
+        self.term = term
+        self.previous_name = previous_name
+    
+    def __repr__(self) -> str:
+        return f"TermChange({self.kind}, version={self.version}, term_id={self.term_id})"
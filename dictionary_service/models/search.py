@@ -0,0 +1,22 @@
+"""Модуль с моделью результата полнотекстового поиска"""
+
+class SearchHit:
+    """Термин, найденный полнотекстовым поиском"""
+    
+    def __init__(self, term_id: int, name: str, snippet: str, score: float):
+        """
+        Инициализация результата поиска
+        
+        Args:
+            term_id: ID термина
+            name: Имя термина с выделенными совпадениями
+            snippet: Фрагмент определения с выделенными совпадениями
+            score: Релевантность BM25 (чем меньше, тем релевантнее)
+        """
+        self.term_id = term_id
+        self.name = name
+        self.snippet = snippet
+        self.score = score
+    
+    def __repr__(self) -> str:
+        return f"SearchHit({self.term_id}, {self.name!r}, score={self.score:.3f})"
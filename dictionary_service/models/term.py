@@ -1,17 +1,59 @@
 """Модуль с моделью термина"""
 
-from typing import Dict, List, Optional
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 import dictionary_pb2
 
+def normalize_name(name: str) -> str:
+    """
+    Нормализация имени термина для регистронезависимого поиска
+    
+    В отличие от LOWER в SQLite, casefold корректно обрабатывает кириллицу
+    и прочие не-ASCII символы.
+    
+    Args:
+        name: Имя термина
+    Returns:
+        str: Нормализованное имя
+    """
+    return name.casefold()
+
+# Тип связи по умолчанию для связанных терминов без явного типа
+DEFAULT_RELATION = 'связан с'
+
+def intern_relation(relation: Optional[str]) -> Optional[str]:
+    """
+    Интернирование типа связи
+    
+    Типов связей немного, а ссылок на них в рабочем наборе миллионы,
+    поэтому все термины разделяют один объект строки каждого типа.
+    
+    Args:
+        relation: Тип связи или None
+    Returns:
+        Optional[str]: Интернированная строка или None
+    """
+    return sys.intern(relation) if relation is not None else None
+
 class Term:
-    """Модель термина"""
+    """
+    Модель термина
+    
+    Экземпляры компактны для больших рабочих наборов: атрибуты хранятся в
+    __slots__, связи - один раз в параллельных кортежах related_terms и
+    relation_types (None - тип не задан), типы связей и источники
+    интернированы. Словарь relations строится по запросу.
+    """
+    
+    __slots__ = ('id', 'name', 'definition', 'source', 'related_terms', 
+                 'relation_types', 'created_at', 'updated_at')
     
     def __init__(self, 
                  name: str,
                  definition: str,
                  source: Optional[str] = None,
-                 related_terms: Optional[List[str]] = None,
+                 related_terms: Optional[Iterable[str]] = None,
                  relations: Optional[Dict[str, str]] = None,
                  term_id: Optional[int] = None,
                  created_at: Optional[str] = None,
@@ -26,39 +68,92 @@ class Term:
             related_terms: Список связанных терминов
             relations: Словарь связей термина
             term_id: ID термина
-            created_at: Дата создания
+            created_at: Дата создания (текущее время, если не задана)
             updated_at: Дата обновления
         """
         self.id = term_id
         self.name = name
         self.definition = definition
-        self.source = source or ""
-        self.related_terms = related_terms or []
-        self.relations = relations or {}
+        self.source = sys.intern(source) if source else ""
+        self.related_terms: Tuple[str, ...] = tuple(related_terms or ())
+        relations = relations or {}
+        self.relation_types: Tuple[Optional[str], ...] = tuple(
+            intern_relation(relations.get(related)) for related in self.related_terms
+        )
         self.created_at = created_at or datetime.utcnow().isoformat()
         self.updated_at = updated_at or self.created_at
 
+    @property
+    def relations(self) -> Dict[str, str]:
+        """Словарь связей (связанный термин -> тип связи) с заданным типом"""
+        return {
+            related: relation 
+            for related, relation in zip(self.related_terms, self.relation_types)
+            if relation is not None
+        }
+
+    def iter_relations(self) -> Iterator[Tuple[str, str]]:
+        """
+        Обход связей с подстановкой типа по умолчанию
+        
+        Yields:
+            Tuple[str, str]: (связанный термин, тип связи)
+        """
+        for related, relation in zip(self.related_terms, self.relation_types):
+            yield related, DEFAULT_RELATION if relation is None else relation
+
     @classmethod
     def from_db_row(cls, row: Dict, related_data: List[Dict]) -> 'Term':
         """
         Создание термина из данных БД
         
+        Конструктор не вызывается: значения строки уже нормализованы, а
+        временные метки всегда заполнены.
+        
         Args:
             row: Строка из таблицы terms
             related_data: Данные о связанных терминах
         Returns:
             Term: Объект термина
         """
-        return cls(
-            term_id=row['id'],
+        term = cls.__new__(cls)
+        term.id = row['id']
+        term.name = row['name']
+        term.definition = row['definition']
+        source = row['source']
+        term.source = sys.intern(source) if source else ""
+        term.related_terms = tuple([r['related_term'] for r in related_data])
+        term.relation_types = tuple([intern_relation(r['relation_type']) for r in related_data])
+        term.created_at = row['created_at']
+        term.updated_at = row['updated_at']
+        return term
+
+    @staticmethod
+    def proto_from_db_row(row: Dict, related_data: List[Dict]) -> dictionary_pb2.Term:
+        """
+        Создание protobuf объекта напрямую из данных БД, без объекта Term
+        
+        Используется на путях чтения, которым нужен только ответ клиенту.
+        
+        Args:
+            row: Строка из таблицы terms
+            related_data: Данные о связанных терминах
+        Returns:
+            dictionary_pb2.Term: Protobuf объект термина
+        """
+        proto = dictionary_pb2.Term(
+            id=row['id'],
             name=row['name'],
             definition=row['definition'],
-            source=row['source'],
+            source=row['source'] or "",
             related_terms=[r['related_term'] for r in related_data],
-            relations={r['related_term']: r['relation_type'] for r in related_data},
             created_at=row['created_at'],
             updated_at=row['updated_at']
         )
+        for r in related_data:
+            if r['relation_type'] is not None:
+                proto.relations[r['related_term']] = r['relation_type']
+        return proto
 
     @classmethod
     def from_proto(cls, proto: dictionary_pb2.Term) -> 'Term':
@@ -74,7 +169,7 @@ class Term:
             name=proto.name,
             definition=proto.definition,
             source=proto.source,
-            related_terms=list(proto.related_terms),
+            related_terms=proto.related_terms,
             relations=dict(proto.relations)
         )
 
@@ -94,8 +189,9 @@ class Term:
             created_at=self.created_at,
             updated_at=self.updated_at
         )
-        for related, relation in self.relations.items():
-            proto.relations[related] = relation
+        for related, relation in zip(self.related_terms, self.relation_types):
+            if relation is not None:
+                proto.relations[related] = relation
         return proto
 
     def to_dict(self) -> Dict:
@@ -110,8 +206,8 @@ class Term:
             'name': self.name,
             'definition': self.definition,
             'source': self.source,
-            'related_terms': self.related_terms,
+            'related_terms': list(self.related_terms),
             'relations': self.relations,
             'created_at': self.created_at,
             'updated_at': self.updated_at
-        } 
\ No newline at end of file
+        }
@@ -0,0 +1,159 @@
+"""Модуль с моделью изменения термина для групповой записи"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import dictionary_pb2
+
+from dictionary_service.models.term import DEFAULT_RELATION, Term
+
+# Результат записи: (успех, сообщение, ID термина)
+WriteResult = Tuple[bool, str, Optional[int]]
+
+class TermPatch:
+    """
+    Частичное изменение термина
+    
+    Поля со значением None не изменяются. Связи задаются целиком
+    (relations) и/или изменениями: сначала удаляются remove_relations,
+    затем добавляются или меняют тип add_relations.
+    """
+    
+    # Пути маски полей PatchTermRequest
+    FIELDS = ('name', 'definition', 'source', 'related_terms')
+    
+    def __init__(self,
+                 name: Optional[str] = None,
+                 definition: Optional[str] = None,
+                 source: Optional[str] = None,
+                 relations: Optional[Dict[str, Optional[str]]] = None,
+                 add_relations: Optional[Dict[str, Optional[str]]] = None,
+                 remove_relations: Iterable[str] = ()):
+        """
+        Инициализация изменения
+        
+        Args:
+            name: Новое название термина
+            definition: Новое определение термина
+            source: Новый источник термина
+            relations: Новый полный набор связей (связанный термин -> тип
+                связи, None - тип по умолчанию)
+            add_relations: Добавляемые связи и новые типы существующих
+            remove_relations: Удаляемые связи
+        """
+        self.name = name
+        self.definition = definition
+        self.source = source
+        self.relations = relations
+        self.add_relations = add_relations or {}
+        self.remove_relations = tuple(remove_relations)
+    
+    @classmethod
+    def replace(cls, term: Term) -> 'TermPatch':
+        """Замена всех полей и связей термина (UpdateTerm)"""
+        return cls(
+            name=term.name,
+            definition=term.definition,
+            source=term.source,
+            relations=dict(zip(term.related_terms, term.relation_types))
+        )
+    
+    @classmethod
+    def from_proto(cls, request: dictionary_pb2.PatchTermRequest) -> 'TermPatch':
+        """
+        Создание изменения из запроса PatchTerm
+        
+        Args:
+            request: Запрос с маской полей и изменениями связей
+        Returns:
+            TermPatch: Изменение термина
+        Raises:
+            ValueError: Если маска содержит неизвестное поле или пустое имя
+        """
+        paths = set(request.update_mask.paths)
+        unknown = paths.difference(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Неизвестные поля в update_mask: {', '.join(sorted(unknown))}")
+        term = Term.from_proto(request.term)
+        if 'name' in paths and not term.name.strip():
+            raise ValueError("Имя термина не может быть пустым")
+        return cls(
+            name=term.name if 'name' in paths else None,
+            definition=term.definition if 'definition' in paths else None,
+            source=term.source if 'source' in paths else None,
+            relations=(dict(zip(term.related_terms, term.relation_types))
+                       if 'related_terms' in paths else None),
+            add_relations={
+                related: relation or None
+                for related, relation in request.add_relations.items()
+            },
+            remove_relations=request.remove_relations
+        )
+    
+    def apply_relations(self, current: Dict[str, Optional[str]]) -> Dict[str, str]:
+        """
+        Итоговый набор связей после изменения
+        
+        Args:
+            current: Текущие связи термина (связанный термин -> тип связи)
+        Returns:
+            Dict[str, str]: Связи с подставленным типом по умолчанию
+        """
+        relations = dict(current if self.relations is None else self.relations)
+        for related in self.remove_relations:
+            relations.pop(related, None)
+        relations.update(self.add_relations)
+        return {
+            related: DEFAULT_RELATION if relation is None else relation
+            for related, relation in relations.items()
+        }
+
+class TermWrite:
+    """Добавление, обновление или удаление одного термина"""
+    
+    ADD = 'add'
+    UPDATE = 'update'
+    PATCH = 'patch'
+    DELETE = 'delete'
+    
+    def __init__(self, kind: str, term: Optional[Term] = None, term_id: Optional[int] = None,
+                 term_patch: Optional[TermPatch] = None):
+        """
+        Инициализация изменения
+        
+        Args:
+            kind: Тип изменения (ADD, UPDATE, PATCH, DELETE)
+            term: Новые данные термина (для ADD и UPDATE)
+            term_id: ID термина (для UPDATE, PATCH и DELETE)
+            term_patch: Изменяемые поля и связи (для UPDATE и PATCH)
+        """
+        self.kind = kind
+        self.term = term
+        self.term_id = term_id
+        self.term_patch = term_patch
+        # Состояние термина после записи (для UPDATE и PATCH) и признак
+        # изменения данных; заполняются в транзакции записи
+        self.result: Optional[Term] = None
+        self.changed = False
+    
+    @classmethod
+    def add(cls, term: Term) -> 'TermWrite':
+        """Добавление нового термина"""
+        return cls(cls.ADD, term=term)
+    
+    @classmethod
+    def update(cls, term_id: int, term: Term) -> 'TermWrite':
+        """Обновление существующего термина"""
+        return cls(cls.UPDATE, term=term, term_id=term_id, term_patch=TermPatch.replace(term))
+    
+    @classmethod
+    def patch(cls, term_id: int, term_patch: TermPatch) -> 'TermWrite':
+        """Частичное обновление существующего термина"""
+        return cls(cls.PATCH, term_id=term_id, term_patch=term_patch)
+    
+    @classmethod
+    def delete(cls, term_id: int) -> 'TermWrite':
+        """Удаление термина"""
+        return cls(cls.DELETE, term_id=term_id)
+    
+    def __repr__(self) -> str:
+        return f"TermWrite({self.kind}, term_id={self.term_id})"
@@ -1,37 +1,319 @@
 """Модуль для запуска gRPC сервера"""
 
+import argparse
+import asyncio
 import logging
+import multiprocessing
+import os
+import signal
 from concurrent import futures
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Tuple
 import grpc
-import dictionary_pb2_grpc
-from dictionary_service.services.dictionary_service import DictionaryService
+from dictionary_service.database.db import DictionaryDB
+from dictionary_service.database.snapshot_file import open_snapshot
+from dictionary_service.services.async_service import AsyncDictionaryService
+from dictionary_service.services.dictionary_service import DictionaryService, add_to_server
 
 logger = logging.getLogger(__name__)
 
-def serve(host: str = "[::]:50051", max_workers: int = 10) -> None:
+# Режимы сервера: пул потоков grpc.server или цикл событий grpc.aio
+SERVER_MODES = ('sync', 'async')
+
+# Полный список терминов может превышать стандартные 4 МБ gRPC
+DEFAULT_MAX_MESSAGE_LENGTH = 256 * 1024 * 1024
+DEFAULT_KEEPALIVE_TIME_MS = 60_000
+DEFAULT_KEEPALIVE_TIMEOUT_MS = 20_000
+# Интервал проверки изменений других рабочих процессов в секундах
+WORKER_SYNC_INTERVAL = 0.2
+# Сжатие ответов сервера (клиент сообщает поддерживаемые алгоритмы сам)
+COMPRESSION = {
+    'none': grpc.Compression.NoCompression,
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+}
+LOG_FORMAT = '%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'
+
+def server_options(max_message_length: int = DEFAULT_MAX_MESSAGE_LENGTH,
+                   keepalive_time_ms: int = DEFAULT_KEEPALIVE_TIME_MS,
+                   keepalive_timeout_ms: int = DEFAULT_KEEPALIVE_TIMEOUT_MS,
+                   reuse_port: bool = False) -> List[Tuple[str, int]]:
+    """
+    Параметры канала сервера
+
+    Args:
+        max_message_length: Максимальный размер входящего и исходящего сообщения
+        keepalive_time_ms: Интервал пингов keepalive к клиенту
+        keepalive_timeout_ms: Время ожидания ответа на пинг
+        reuse_port: Разрешить нескольким процессам слушать один порт
+            (SO_REUSEPORT, ядро распределяет между ними соединения)
+    Returns:
+        List[Tuple[str, int]]: Параметры для grpc.server / grpc.aio.server
+    """
+    options = [
+        ('grpc.max_receive_message_length', max_message_length),
+        ('grpc.max_send_message_length', max_message_length),
+        ('grpc.keepalive_time_ms', keepalive_time_ms),
+        ('grpc.keepalive_timeout_ms', keepalive_timeout_ms),
+        ('grpc.keepalive_permit_without_calls', 1),
+        # Клиентам разрешено пинговать не чаще keepalive_time_ms
+        ('grpc.http2.min_ping_interval_without_data_ms', keepalive_time_ms),
+        ('grpc.http2.max_pings_without_data', 0),
+    ]
+    if reuse_port:
+        options.append(('grpc.so_reuseport', 1))
+    return options
+
+def serve(host: str = "[::]:50051", max_workers: int = 10,
+          pool_size: Optional[int] = None,
+          bulk_chunk_size: int = DictionaryDB.BULK_CHUNK_SIZE,
+          cache_size: int = 10000, watch_queue_size: int = 1000,
+          mode: str = 'sync', maximum_concurrent_rpcs: Optional[int] = None,
+          max_message_length: int = DEFAULT_MAX_MESSAGE_LENGTH,
+          keepalive_time_ms: int = DEFAULT_KEEPALIVE_TIME_MS,
+          keepalive_timeout_ms: int = DEFAULT_KEEPALIVE_TIMEOUT_MS,
+          workers: int = 1, sync_interval: Optional[float] = None,
+          compression: str = 'gzip', snapshot_path: Optional[str] = None,
+          write_batch_window: Optional[float] = None, write_batch_size: int = 64) -> None:
     """
     Запуск gRPC сервера
-    
+
     Args:
         host: Адрес и порт для прослушивания
-        max_workers: Максимальное количество рабочих потоков
+        max_workers: Максимальное количество рабочих потоков (в режиме async -
+            потоков для обращений к базе данных)
+        pool_size: Размер пула соединений с БД (по умолчанию равен max_workers)
+        bulk_chunk_size: Количество терминов в одной транзакции пакетной записи
+        cache_size: Емкость кеша терминов (0 - кеш отключен)
+        watch_queue_size: Емкость очереди одного подписчика WatchTerms
+        mode: 'sync' - grpc.server с пулом потоков, 'async' - grpc.aio
+        maximum_concurrent_rpcs: Предел одновременных RPC, сверх которого
+            сервер отвечает RESOURCE_EXHAUSTED (None - без ограничения)
+        max_message_length: Максимальный размер сообщения
+        keepalive_time_ms: Интервал пингов keepalive
+        keepalive_timeout_ms: Время ожидания ответа на пинг
+        workers: Количество процессов сервера (см. serve_workers)
+        sync_interval: Интервал проверки изменений других процессов
+            (None - база используется одним процессом)
+        compression: Сжатие ответов: none, gzip или deflate
+        snapshot_path: Файл снимка словаря для чтения через mmap, общий для
+            всех процессов (None - без снимка)
+        write_batch_window: Время накопления пакета изменений для общей
+            транзакции в секундах (None - каждое изменение отдельно)
+        write_batch_size: Максимальное количество изменений в пакете
     """
+    if mode not in SERVER_MODES:
+        raise ValueError(f"Неизвестный режим сервера: {mode}")
+    if workers > 1:
+        serve_workers(workers, dict(
+            host=host, max_workers=max_workers, pool_size=pool_size,
+            bulk_chunk_size=bulk_chunk_size, cache_size=cache_size,
+            watch_queue_size=watch_queue_size, mode=mode,
+            maximum_concurrent_rpcs=maximum_concurrent_rpcs,
+            max_message_length=max_message_length,
+            keepalive_time_ms=keepalive_time_ms,
+            keepalive_timeout_ms=keepalive_timeout_ms,
+            sync_interval=WORKER_SYNC_INTERVAL, compression=compression,
+            snapshot_path=snapshot_path, write_batch_window=write_batch_window,
+            write_batch_size=write_batch_size
+        ))
+        return
     try:
-        server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
-        dictionary_pb2_grpc.add_DictionaryServiceServicer_to_server(
-            DictionaryService(), server
+        service = DictionaryService(
+            pool_size=pool_size or max_workers,
+            bulk_chunk_size=bulk_chunk_size,
+            cache_size=cache_size,
+            watch_queue_size=watch_queue_size,
+            sync_interval=sync_interval,
+            snapshot_path=snapshot_path,
+            write_batch_window=write_batch_window,
+            write_batch_size=write_batch_size
         )
+        options = server_options(
+            max_message_length, keepalive_time_ms, keepalive_timeout_ms,
+            reuse_port=sync_interval is not None
+        )
+        if mode == 'async':
+            asyncio.run(serve_async(
+                service, host, max_workers, maximum_concurrent_rpcs, options,
+                COMPRESSION[compression]
+            ))
+            return
+
+        server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=max_workers),
+            options=options,
+            maximum_concurrent_rpcs=maximum_concurrent_rpcs,
+            compression=COMPRESSION[compression]
+        )
+        add_to_server(service, server)
         server.add_insecure_port(host)
         server.start()
-        logger.info(f"Сервер запущен на {host}")
+        logger.info(f"Сервер запущен на {host} (sync, потоков: {max_workers})")
         server.wait_for_termination()
     except Exception as e:
         logger.error(f"Ошибка при запуске сервера: {e}")
         raise
 
-if __name__ == "__main__":
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+def serve_workers(workers: int, serve_kwargs: Dict[str, Any]) -> None:
+    """
+    Пре-форк запуск нескольких процессов сервера на одном порту
+
+    Каждый процесс открывает порт с SO_REUSEPORT и имеет собственные
+    соединения с базой, кеш и индексы; запись в любом процессе доходит до
+    остальных через журнал изменений в общем файле базы (WAL). Процессы
+    запускаются через spawn, до создания объектов gRPC в родителе, и
+    перезапускаются при аварийном завершении.
+
+    Args:
+        workers: Количество процессов
+        serve_kwargs: Аргументы serve для каждого процесса
+    """
+    # Схема, начальные данные и файл снимка создаются один раз до запуска
+    # процессов, которые затем открывают снимок без чтения базы
+    db = DictionaryDB()
+    if serve_kwargs.get('snapshot_path'):
+        open_snapshot(db, serve_kwargs['snapshot_path'])
+    db.pool.close()
+    context = multiprocessing.get_context('spawn')
+    processes: Dict[int, multiprocessing.Process] = {}
+
+    def start(index: int) -> None:
+        process = context.Process(
+            target=_worker_main, args=(serve_kwargs,), name=f'dictionary-worker-{index}'
+        )
+        process.start()
+        processes[index] = process
+
+    def stop(signum, frame) -> None:
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    for index in range(workers):
+        start(index)
+    logger.info(f"Запущено процессов сервера: {workers} на {serve_kwargs['host']}")
+    try:
+        while True:
+            wait([process.sentinel for process in processes.values()])
+            for index, process in list(processes.items()):
+                if process.exitcode is not None:
+                    logger.error(
+                        f"Процесс {process.name} завершился с кодом {process.exitcode}, перезапуск"
+                    )
+                    start(index)
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Остановка процессов сервера")
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join()
+
+def _worker_main(serve_kwargs: Dict[str, Any]) -> None:
+    """Точка входа рабочего процесса serve_workers"""
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    try:
+        serve(**serve_kwargs)
+    except KeyboardInterrupt:
+        pass
+
+async def serve_async(service: DictionaryService, host: str, db_workers: int,
+                      maximum_concurrent_rpcs: Optional[int],
+                      options: List[Tuple[str, int]],
+                      compression: grpc.Compression = grpc.Compression.NoCompression) -> None:
+    """
+    Запуск сервера grpc.aio
+
+    Args:
+        service: Синхронная реализация сервиса
+        host: Адрес и порт для прослушивания
+        db_workers: Количество потоков для обращений к базе данных
+        maximum_concurrent_rpcs: Предел одновременных RPC
+        options: Параметры канала сервера
+        compression: Сжатие ответов
+    """
+    servicer = AsyncDictionaryService(service, db_workers)
+    server = grpc.aio.server(options=options, maximum_concurrent_rpcs=maximum_concurrent_rpcs,
+                             compression=compression)
+    add_to_server(servicer, server)
+    server.add_insecure_port(host)
+    await server.start()
+    logger.info(f"Сервер запущен на {host} (async, потоков БД: {db_workers})")
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(grace=5)
+        servicer.shutdown()
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки
+
+    Значения по умолчанию берутся из переменных окружения DICTIONARY_*.
+    """
+    parser = argparse.ArgumentParser(description="gRPC сервер словаря терминов")
+    parser.add_argument('--host', default=os.getenv('DICTIONARY_LISTEN', '[::]:50051'),
+                        help="Адрес и порт для прослушивания")
+    parser.add_argument('--mode', choices=SERVER_MODES,
+                        default=os.getenv('DICTIONARY_SERVER_MODE', 'sync'),
+                        help="sync - пул потоков grpc.server, async - grpc.aio")
+    parser.add_argument('--max-workers', type=int,
+                        default=int(os.getenv('DICTIONARY_MAX_WORKERS', '10')),
+                        help="Рабочие потоки (в режиме async - потоки базы данных)")
+    parser.add_argument('--workers', type=int,
+                        default=int(os.getenv('DICTIONARY_WORKERS', '1')),
+                        help="Количество процессов сервера на одном порту (SO_REUSEPORT)")
+    parser.add_argument('--max-concurrent-rpcs', type=int,
+                        default=int(os.getenv('DICTIONARY_MAX_CONCURRENT_RPCS', '0')),
+                        help="Предел одновременных RPC (0 - без ограничения)")
+    parser.add_argument('--max-message-length', type=int,
+                        default=int(os.getenv('DICTIONARY_MAX_MESSAGE_LENGTH',
+                                              str(DEFAULT_MAX_MESSAGE_LENGTH))),
+                        help="Максимальный размер сообщения в байтах")
+    parser.add_argument('--keepalive-time-ms', type=int,
+                        default=int(os.getenv('DICTIONARY_KEEPALIVE_TIME_MS',
+                                              str(DEFAULT_KEEPALIVE_TIME_MS))),
+                        help="Интервал пингов keepalive")
+    parser.add_argument('--keepalive-timeout-ms', type=int,
+                        default=int(os.getenv('DICTIONARY_KEEPALIVE_TIMEOUT_MS',
+                                              str(DEFAULT_KEEPALIVE_TIMEOUT_MS))),
+                        help="Время ожидания ответа на пинг")
+    parser.add_argument('--cache-size', type=int,
+                        default=int(os.getenv('DICTIONARY_CACHE_SIZE', '10000')),
+                        help="Емкость кеша терминов (0 - кеш отключен)")
+    parser.add_argument('--compression', choices=tuple(COMPRESSION),
+                        default=os.getenv('DICTIONARY_COMPRESSION', 'gzip'),
+                        help="Сжатие ответов")
+    parser.add_argument('--snapshot-path', default=os.getenv('DICTIONARY_SNAPSHOT_PATH'),
+                        help="Файл снимка словаря для GetDefinition и ListTerms через mmap")
+    parser.add_argument('--write-batch-window-ms', type=float,
+                        default=float(os.getenv('DICTIONARY_WRITE_BATCH_WINDOW_MS', '0')),
+                        help="Время накопления пакета изменений для общей транзакции "
+                             "(0 - каждое изменение отдельно)")
+    parser.add_argument('--write-batch-size', type=int,
+                        default=int(os.getenv('DICTIONARY_WRITE_BATCH_SIZE', '64')),
+                        help="Максимальное количество изменений в пакете")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки"""
+    args = parse_args(argv)
+    serve(
+        host=args.host,
+        max_workers=args.max_workers,
+        cache_size=args.cache_size,
+        mode=args.mode,
+        maximum_concurrent_rpcs=args.max_concurrent_rpcs or None,
+        max_message_length=args.max_message_length,
+        keepalive_time_ms=args.keepalive_time_ms,
+        keepalive_timeout_ms=args.keepalive_timeout_ms,
+        workers=args.workers,
+        compression=args.compression,
+        snapshot_path=args.snapshot_path,
+        write_batch_window=args.write_batch_window_ms / 1000 if args.write_batch_window_ms else None,
+        write_batch_size=args.write_batch_size
     )
-    serve() 
\ No newline at end of file
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    main()
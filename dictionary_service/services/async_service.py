@@ -0,0 +1,268 @@
+"""Модуль с асинхронной (grpc.aio) оберткой над сервисом словаря"""
+
+import asyncio
+import logging
+import threading
+from concurrent import futures
+from functools import partial
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+
+import grpc
+import dictionary_pb2_grpc
+
+from dictionary_service.exceptions.errors import DatabaseError
+from dictionary_service.services.dictionary_service import (
+    WATCH_OVERFLOW_MESSAGE, DictionaryService
+)
+
+logger = logging.getLogger(__name__)
+
+# Количество сообщений потока, получаемых из рабочего потока за один переход
+STREAM_BATCH_SIZE = 256
+
+class _Aborted(Exception):
+    """Вызов context.abort в рабочем потоке"""
+
+class _ThreadContext:
+    """
+    Контекст вызова для синхронного обработчика в рабочем потоке
+
+    Код и описание ответа запоминаются и переносятся в контекст grpc.aio
+    уже в потоке цикла событий; abort прерывает обработчик исключением.
+    """
+
+    def __init__(self, context: grpc.aio.ServicerContext):
+        self.code: Optional[grpc.StatusCode] = None
+        self.details: Optional[str] = None
+        self._done = threading.Event()
+        context.add_done_callback(lambda _: self._done.set())
+
+    def set_code(self, code: grpc.StatusCode) -> None:
+        self.code = code
+
+    def set_details(self, details: str) -> None:
+        self.details = details
+
+    def is_active(self) -> bool:
+        return not self._done.is_set()
+
+    def abort(self, code: grpc.StatusCode, details: str) -> None:
+        self.code = code
+        self.details = details
+        raise _Aborted()
+
+    async def apply(self, context: grpc.aio.ServicerContext, aborted: bool = False) -> None:
+        """Перенос кода ответа в контекст grpc.aio"""
+        if aborted:
+            await context.abort(self.code, self.details or '')
+        if self.code is not None:
+            context.set_code(self.code)
+        if self.details is not None:
+            context.set_details(self.details)
+
+def _next_batch(iterator: Iterator, size: int) -> List:
+    """Следующие size элементов итератора (меньше - итератор исчерпан)"""
+    batch = []
+    for item in iterator:
+        batch.append(item)
+        if len(batch) >= size:
+            break
+    return batch
+
+def _close(generator) -> None:
+    """Закрытие генератора, если он не выполняется в другом потоке"""
+    try:
+        generator.close()
+    except ValueError:
+        pass
+
+def _unary(name: str, inline: bool = False) -> Callable:
+    """
+    Асинхронный обработчик унарного или клиентского потокового вызова
+
+    Args:
+        name: Имя метода DictionaryService
+        inline: Выполнять в цикле событий (только для вызовов без обращения
+            к базе данных, занимающих микросекунды). Если сервис учитывает
+            изменения других процессов (задан sync_interval), вызов перед
+            чтением проверяет базу и берет блокировку записи, поэтому
+            выполняется в пуле потоков
+    """
+    async def handler(self, request, context):
+        method = getattr(self.service, name)
+        if inline and self.service.sync_interval is None:
+            return method(request, context)
+        if hasattr(request, '__aiter__'):
+            request = self._sync_iterator(request)
+        proxy = _ThreadContext(context)
+        try:
+            response = await self._run(self.executor, partial(method, request, proxy))
+        except _Aborted:
+            await proxy.apply(context, aborted=True)
+        await proxy.apply(context)
+        return response
+    handler.__name__ = name
+    handler.__doc__ = getattr(DictionaryService, name).__doc__
+    return handler
+
+def _stream(name: str, batch_size: int = STREAM_BATCH_SIZE) -> Callable:
+    """
+    Асинхронный обработчик серверного потокового вызова
+
+    Синхронный генератор выполняется в рабочем потоке порциями по
+    batch_size сообщений, чтобы не переключать потоки на каждое сообщение.
+
+    Args:
+        name: Имя метода DictionaryService
+        batch_size: Размер порции
+    """
+    async def handler(self, request, context) -> AsyncIterator:
+        executor = self.executor
+        proxy = _ThreadContext(context)
+        generator = getattr(self.service, name)(request, proxy)
+        try:
+            while True:
+                try:
+                    batch = await self._run(executor, _next_batch, generator, batch_size)
+                except _Aborted:
+                    await proxy.apply(context, aborted=True)
+                for message in batch:
+                    yield message
+                if len(batch) < batch_size:
+                    break
+            await proxy.apply(context)
+        finally:
+            await self._run(executor, _close, generator)
+    handler.__name__ = name
+    handler.__doc__ = getattr(DictionaryService, name).__doc__
+    return handler
+
+class AsyncDictionaryService(dictionary_pb2_grpc.DictionaryServiceServicer):
+    """
+    Реализация сервиса словаря для сервера grpc.aio
+
+    Обработчики DictionaryService выполняются в выделенном пуле потоков
+    базы данных, поэтому количество одновременных RPC ограничено только
+    maximum_concurrent_rpcs сервера, а не числом потоков. Подписки
+    WatchTerms ожидают событий в цикле событий и потоков не занимают.
+    """
+
+    def __init__(self, service: DictionaryService, db_workers: int = 10):
+        """
+        Инициализация сервиса
+
+        Args:
+            service: Синхронная реализация сервиса
+            db_workers: Количество потоков для обращений к базе данных
+        """
+        self.service = service
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=db_workers, thread_name_prefix='dictionary-db'
+        )
+
+    @staticmethod
+    async def _run(executor: futures.Executor, func: Callable, *args):
+        """Выполнение функции в пуле потоков"""
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+    @staticmethod
+    def _sync_iterator(request_iterator: AsyncIterator) -> Iterator:
+        """
+        Синхронный итератор по входящему потоку для рабочего потока
+
+        Каждое сообщение читается в цикле событий; рабочий поток ждет его,
+        не блокируя цикл.
+        """
+        loop = asyncio.get_running_loop()
+        end = object()
+
+        async def read():
+            try:
+                return await request_iterator.__anext__()
+            except StopAsyncIteration:
+                return end
+
+        def iterate():
+            while True:
+                message = asyncio.run_coroutine_threadsafe(read(), loop).result()
+                if message is end:
+                    return
+                yield message
+        return iterate()
+
+    def shutdown(self) -> None:
+        """Остановка пула потоков"""
+        self.executor.shutdown(wait=False)
+
+    async def WatchTerms(self, request, context) -> AsyncIterator:
+        """
+        Поток изменений терминов (см. DictionaryService.WatchTerms)
+
+        Снимок или история читаются в пуле потоков базы данных, новые
+        изменения ожидаются в цикле событий: лента изменений будит
+        подписку через call_soon_threadsafe.
+        """
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        feed = self.service.feed
+        from_version = self.service.watch_from_version(request)
+        subscription = feed.subscribe(
+            from_version, lambda: loop.call_soon_threadsafe(wakeup.set)
+        )
+        try:
+            try:
+                events, skip_through = await self._run(
+                    self.executor, self.service.initial_watch_events,
+                    request, from_version, subscription
+                )
+                while True:
+                    batch = await self._run(
+                        self.executor, _next_batch, events, STREAM_BATCH_SIZE
+                    )
+                    for event in batch:
+                        yield event
+                    if len(batch) < STREAM_BATCH_SIZE:
+                        break
+            except DatabaseError as e:
+                await context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+            while True:
+                if subscription.overflowed:
+                    await context.abort(
+                        grpc.StatusCode.RESOURCE_EXHAUSTED, WATCH_OVERFLOW_MESSAGE
+                    )
+                change = subscription.poll()
+                if change is None:
+                    # Флаг сбрасывается до повторной проверки очереди, чтобы
+                    # не пропустить изменение, добавленное между ними
+                    wakeup.clear()
+                    change = subscription.poll()
+                    if change is None:
+                        await wakeup.wait()
+                        continue
+                if change.version > skip_through:
+                    yield self.service.change_to_event(change)
+        finally:
+            feed.unsubscribe(subscription)
+
+    GetDefinition = _unary('GetDefinition')
+    GetDefinitionSerialized = _unary('GetDefinitionSerialized')
+    GetTermsByNames = _unary('GetTermsByNames')
+    SearchTerms = _unary('SearchTerms')
+    SuggestTerms = _unary('SuggestTerms', inline=True)
+    ListTerms = _unary('ListTerms')
+    ListTermsSerialized = _unary('ListTermsSerialized')
+    GetFacets = _unary('GetFacets')
+    StreamTerms = _stream('StreamTerms')
+    AddTerm = _unary('AddTerm')
+    BulkAddTerms = _unary('BulkAddTerms')
+    BulkUpsertTerms = _unary('BulkUpsertTerms')
+    UpdateTerm = _unary('UpdateTerm')
+    PatchTerm = _unary('PatchTerm')
+    DeleteTerm = _unary('DeleteTerm')
+    GetVersion = _unary('GetVersion')
+    GetNeighborhood = _unary('GetNeighborhood')
+    GetBacklinks = _unary('GetBacklinks', inline=True)
+    ShortestPath = _unary('ShortestPath')
+    GetGraph = _unary('GetGraph')
+    GetCacheStats = _unary('GetCacheStats', inline=True)
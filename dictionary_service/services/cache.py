@@ -0,0 +1,196 @@
+"""Модуль с кешем терминов сервиса словаря"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import dictionary_pb2
+
+from dictionary_service.models.change import TermChange
+from dictionary_service.models.term import normalize_name
+
+class ListSnapshot(NamedTuple):
+    """Сериализованный ответ ListTerms со всеми терминами"""
+    version: int
+    modified_at: str
+    # Байты сообщения ListTermsResponse
+    data: bytes
+
+class TermCache:
+    """
+    Ограниченный LRU-кеш готовых protobuf сообщений терминов
+    
+    Термины хранятся по ID, дополнительный индекс связывает нормализованное
+    имя с ID, поэтому инвалидация по ID удаляет и запись по прежнему имени.
+    Отдельно хранится сериализованный ответ ListTerms со всеми терминами.
+    
+    Чтобы результат чтения, начатого до изменения, не попал в кеш после
+    инвалидации, запись принимается только с поколением, полученным до
+    обращения к базе (см. generation).
+    """
+    
+    def __init__(self, max_size: int = 10000):
+        """
+        Инициализация кеша
+        
+        Args:
+            max_size: Максимальное количество терминов (0 - кеш отключен)
+        """
+        self.max_size = max(0, max_size)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._terms: 'OrderedDict[int, dictionary_pb2.Term]' = OrderedDict()
+        self._ids_by_name: Dict[str, int] = {}
+        self._snapshot: Optional[ListSnapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        """Включен ли кеш"""
+        return self.max_size > 0
+    
+    @property
+    def generation(self) -> int:
+        """Поколение кеша, увеличивается при каждой инвалидации"""
+        return self._generation
+    
+    def get_by_id(self, term_id: int) -> Optional[dictionary_pb2.Term]:
+        """
+        Получение термина по ID
+        
+        Args:
+            term_id: ID термина
+        Returns:
+            Optional[dictionary_pb2.Term]: Термин или None при промахе
+        """
+        with self._lock:
+            return self._lookup(term_id)
+    
+    def get_by_name(self, name: str) -> Optional[dictionary_pb2.Term]:
+        """
+        Получение термина по имени без учета регистра
+        
+        Args:
+            name: Имя термина
+        Returns:
+            Optional[dictionary_pb2.Term]: Термин или None при промахе
+        """
+        with self._lock:
+            return self._lookup(self._ids_by_name.get(normalize_name(name)))
+    
+    def _lookup(self, term_id: Optional[int]) -> Optional[dictionary_pb2.Term]:
+        """Поиск по ID с учетом статистики; вызывается под блокировкой"""
+        term = self._terms.get(term_id) if term_id is not None else None
+        if term is None:
+            self.misses += 1
+            return None
+        self._terms.move_to_end(term_id)
+        self.hits += 1
+        return term
+    
+    def put(self, term: dictionary_pb2.Term, generation: int) -> None:
+        """
+        Сохранение термина
+        
+        Args:
+            term: Protobuf сообщение термина
+            generation: Поколение кеша на момент начала чтения из базы
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._terms[term.id] = term
+            self._terms.move_to_end(term.id)
+            self._ids_by_name[normalize_name(term.name)] = term.id
+            while len(self._terms) > self.max_size:
+                _, evicted = self._terms.popitem(last=False)
+                self._ids_by_name.pop(normalize_name(evicted.name), None)
+                self.evictions += 1
+    
+    def get_snapshot(self) -> Optional[ListSnapshot]:
+        """
+        Получение готового ответа ListTerms со всеми терминами
+        
+        Returns:
+            Optional[ListSnapshot]: Ответ или None при промахе
+        """
+        with self._lock:
+            if self._snapshot is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return self._snapshot
+    
+    def put_snapshot(self, snapshot: ListSnapshot, generation: int) -> None:
+        """
+        Сохранение готового ответа ListTerms
+        
+        Args:
+            snapshot: Сериализованный ответ со всеми терминами
+            generation: Поколение кеша на момент начала чтения из базы
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation == self._generation:
+                self._snapshot = snapshot
+    
+    def invalidate(self, term_ids: Iterable[int] = (), names: Iterable[str] = ()) -> None:
+        """
+        Инвалидация терминов и снимка списка
+        
+        Args:
+            term_ids: ID измененных терминов
+            names: Имена измененных терминов
+        """
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+            for name in names:
+                term_id = self._ids_by_name.pop(normalize_name(name), None)
+                if term_id is not None:
+                    self._terms.pop(term_id, None)
+            for term_id in term_ids:
+                term = self._terms.pop(term_id, None)
+                if term is not None:
+                    self._ids_by_name.pop(normalize_name(term.name), None)
+    
+    def apply(self, changes: List[TermChange]) -> None:
+        """
+        Инвалидация по зафиксированным изменениям
+        
+        Args:
+            changes: Изменения одной транзакции или другого процесса
+        """
+        self.invalidate(
+            term_ids=[change.term_id for change in changes],
+            names=[change.previous_name for change in changes if change.previous_name]
+        )
+    
+    def clear(self) -> None:
+        """Полная очистка кеша"""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+            self._terms.clear()
+            self._ids_by_name.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Счетчики кеша
+        
+        Returns:
+            Dict[str, int]: Попадания, промахи, вытеснения, размер и емкость
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._terms),
+                'capacity': self.max_size
+            }
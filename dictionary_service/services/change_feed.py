@@ -0,0 +1,166 @@
+"""Модуль с лентой изменений для подписчиков WatchTerms"""
+
+import logging
+import queue
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional, Set
+
+from dictionary_service.models.change import TermChange
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """Подписка на ленту изменений с ограниченной очередью"""
+    
+    def __init__(self, queue_size: int, backlog: Optional[List[TermChange]],
+                 notify: Optional[Callable[[], None]] = None):
+        """
+        Инициализация подписки
+        
+        Args:
+            queue_size: Максимальное количество недоставленных изменений
+            backlog: Изменения из истории на момент подписки или None,
+                если история их не покрывает
+            notify: Вызывается после добавления изменений в очередь и при
+                переполнении (из потока, зафиксировавшего изменения)
+        """
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.backlog = backlog
+        self.overflowed = False
+        self.notify = notify
+    
+    def get(self, timeout: float) -> Optional[TermChange]:
+        """
+        Получение следующего изменения
+        
+        Args:
+            timeout: Время ожидания в секундах
+        Returns:
+            Optional[TermChange]: Изменение или None, если за timeout их не было
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def poll(self) -> Optional[TermChange]:
+        """
+        Получение следующего изменения без ожидания
+        
+        Returns:
+            Optional[TermChange]: Изменение или None, если очередь пуста
+        """
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+class ChangeFeed:
+    """
+    Рассылка зафиксированных изменений подписчикам
+    
+    Каждый подписчик получает изменения через собственную ограниченную
+    очередь. Если подписчик не успевает их забирать и очередь заполняется,
+    подписка помечается переполненной и отключается от рассылки: подписчик
+    должен переподключиться и догнать состояние по версии или снимку.
+    Последние изменения хранятся в истории, чтобы подписчик мог
+    продолжить с известной ему версии.
+    """
+    
+    def __init__(self, base_version: int, history_size: int = 10000, queue_size: int = 1000):
+        """
+        Инициализация ленты
+        
+        Args:
+            base_version: Версия набора данных на момент создания ленты
+            history_size: Количество последних изменений в истории
+            queue_size: Емкость очереди одного подписчика
+        """
+        self.history_size = history_size
+        self.queue_size = queue_size
+        # История содержит все изменения с версией больше base_version
+        self._base_version = base_version
+        self._history: Deque[TermChange] = deque()
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+    
+    def publish(self, changes: List[TermChange]) -> None:
+        """
+        Публикация изменений одной транзакции
+        
+        Args:
+            changes: Зафиксированные изменения
+        """
+        with self._lock:
+            self._history.extend(changes)
+            while len(self._history) > self.history_size:
+                self._base_version = self._history.popleft().version
+            for subscription in list(self._subscriptions):
+                try:
+                    for change in changes:
+                        subscription.queue.put_nowait(change)
+                except queue.Full:
+                    logger.warning("Подписчик ленты изменений не успевает и будет отключен")
+                    subscription.overflowed = True
+                    self._subscriptions.discard(subscription)
+                if subscription.notify is not None:
+                    subscription.notify()
+    
+    def reset(self, version: int) -> None:
+        """
+        Сброс истории и отключение всех подписчиков
+        
+        Вызывается, когда изменения до version не могут быть переданы по
+        одному: подписчики переподключаются и получают снимок.
+        
+        Args:
+            version: Текущая версия набора данных
+        """
+        with self._lock:
+            self._history.clear()
+            self._base_version = version
+            for subscription in self._subscriptions:
+                subscription.overflowed = True
+                if subscription.notify is not None:
+                    subscription.notify()
+            self._subscriptions.clear()
+    
+    def subscribe(self, from_version: Optional[int] = None, 
+                  notify: Optional[Callable[[], None]] = None) -> Subscription:
+        """
+        Создание подписки
+        
+        Args:
+            from_version: Версия, после которой нужны изменения из истории
+            notify: Уведомление о новых изменениях (см. Subscription)
+        Returns:
+            Subscription: Подписка; backlog равен None, если история не
+                покрывает изменения после from_version
+        """
+        with self._lock:
+            backlog: Optional[List[TermChange]] = []
+            if from_version is not None:
+                if from_version < self._base_version:
+                    backlog = None
+                else:
+                    backlog = [change for change in self._history if change.version > from_version]
+            subscription = Subscription(self.queue_size, backlog, notify)
+            self._subscriptions.add(subscription)
+            return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Удаление подписки
+        
+        Args:
+            subscription: Подписка
+        """
+        with self._lock:
+            self._subscriptions.discard(subscription)
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Количество активных подписчиков"""
+        with self._lock:
+            return len(self._subscriptions)
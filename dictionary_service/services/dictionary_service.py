@@ -1,34 +1,298 @@
 """Модуль с реализацией gRPC сервиса"""
 
+import base64
+import binascii
 import logging
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
 import grpc
 import dictionary_pb2
 import dictionary_pb2_grpc
 
 from dictionary_service.database.db import DictionaryDB
-from dictionary_service.models.term import Term
+from dictionary_service.database.snapshot_file import GlossarySnapshot, open_snapshot
+from dictionary_service.models.change import TermChange
+from dictionary_service.services.cache import ListSnapshot, TermCache
+from dictionary_service.services.change_feed import ChangeFeed, Subscription
+from dictionary_service.services.graph import TermGraph
+from dictionary_service.services.layout import compute_layout
+from dictionary_service.services.suggest import NameIndex
+from dictionary_service.services.write_coalescer import WriteCoalescer
+from dictionary_service.models.term import Term, normalize_name
+from dictionary_service.models.write import TermPatch, TermWrite, WriteResult
 from dictionary_service.exceptions.errors import DatabaseError, TermNotFoundError
 
 logger = logging.getLogger(__name__)
 
+MAX_PAGE_SIZE = 1000
+
+# Ограничения полнотекстового поиска
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Ограничения подсказок по префиксу имени
+DEFAULT_SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 100
+
+# Ограничения запросов к графу связей
+MAX_GRAPH_DEPTH = 5
+MAX_GRAPH_NODES = 5000
+DEFAULT_GRAPH_DEPTH = 1
+DEFAULT_GRAPH_NODES = 100
+DEFAULT_PATH_DEPTH = 10
+
+# Задержка перезаписи файла снимка после изменения в секундах: изменения,
+# пришедшие за это время, попадают в одну перезапись
+SNAPSHOT_REFRESH_DELAY = 1.0
+
+# Интервал проверки активности подписчика WatchTerms в секундах
+WATCH_POLL_INTERVAL = 1.0
+WATCH_OVERFLOW_MESSAGE = "Подписчик не успевает получать изменения, переподключитесь"
+
+CHANGE_EVENT_TYPES = {
+    TermChange.ADDED: dictionary_pb2.TermEvent.ADDED,
+    TermChange.UPDATED: dictionary_pb2.TermEvent.UPDATED,
+    TermChange.DELETED: dictionary_pb2.TermEvent.DELETED,
+}
+
+def encode_page_token(last_id: int) -> str:
+    """
+    Формирование непрозрачного токена страницы
+    
+    Args:
+        last_id: ID последнего выданного термина
+    Returns:
+        str: Токен страницы
+    """
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode()
+
+def decode_page_token(token: str) -> int:
+    """
+    Разбор токена страницы
+    
+    Args:
+        token: Токен страницы (пустая строка - начало списка)
+    Returns:
+        int: ID, после которого продолжается выдача
+    Raises:
+        ValueError: Если токен некорректен
+    """
+    if not token:
+        return 0
+    try:
+        prefix, _, value = base64.urlsafe_b64decode(token.encode()).decode().partition(':')
+        if prefix != 'id':
+            raise ValueError(token)
+        last_id = int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Некорректный токен страницы: {token}")
+    if last_id < 0:
+        raise ValueError(f"Некорректный токен страницы: {token}")
+    return last_id
+
+def encode_sort_token(order: str, value: str, last_id: int) -> str:
+    """
+    Формирование токена страницы для сортировки по колонке
+    
+    Args:
+        order: Порядок сортировки (имя колонки, с '-' для убывания)
+        value: Значение колонки у последнего выданного термина
+        last_id: ID последнего выданного термина
+    Returns:
+        str: Токен страницы
+    """
+    return base64.urlsafe_b64encode(f"{order}:{last_id}:{value}".encode()).decode()
+
+def decode_sort_token(token: str, order: str) -> Tuple[str, int]:
+    """
+    Разбор токена страницы для сортировки по колонке
+    
+    Args:
+        token: Токен страницы
+        order: Порядок сортировки текущего запроса
+    Returns:
+        Tuple[str, int]: (значение колонки, ID), после которых продолжается выдача
+    Raises:
+        ValueError: Если токен некорректен или выдан для другого порядка
+    """
+    try:
+        token_order, last_id, value = base64.urlsafe_b64decode(
+            token.encode()
+        ).decode().split(':', 2)
+        if token_order != order:
+            raise ValueError(token)
+        return value, int(last_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Некорректный токен страницы: {token}")
+
 class DictionaryService(dictionary_pb2_grpc.DictionaryServiceServicer):
     """Реализация gRPC сервиса словаря"""
     
-    def __init__(self, db_path: str = 'dictionary.db'):
+    def __init__(self, db_path: str = 'dictionary.db', pool_size: int = 10, 
+                 bulk_chunk_size: int = DictionaryDB.BULK_CHUNK_SIZE, 
+                 cache_size: int = 10000, watch_queue_size: int = 1000,
+                 sync_interval: Optional[float] = None, 
+                 snapshot_path: Optional[str] = None,
+                 write_batch_window: Optional[float] = None, write_batch_size: int = 64):
         """
         Инициализация сервиса
         
         Args:
             db_path: Путь к файлу базы данных
+            pool_size: Размер пула соединений с базой данных
+            bulk_chunk_size: Количество терминов в одной транзакции пакетной записи
+            cache_size: Емкость кеша терминов (0 - кеш отключен)
+            watch_queue_size: Емкость очереди одного подписчика WatchTerms
+            sync_interval: Интервал проверки изменений, зафиксированных другими
+                процессами с тем же файлом базы, в секундах (None - база
+                используется одним процессом)
+            snapshot_path: Файл снимка словаря для GetDefinition и ListTerms
+                через mmap (None - чтение из базы и кеша)
+            write_batch_window: Время накопления пакета изменений AddTerm,
+                UpdateTerm и DeleteTerm для общей транзакции в секундах
+                (None - каждое изменение фиксируется отдельно)
+            write_batch_size: Максимальное количество изменений в пакете
+        """
+        self.db = DictionaryDB(db_path, pool_size=pool_size)
+        self.bulk_chunk_size = bulk_chunk_size
+        self.writer: Optional[WriteCoalescer] = None
+        if write_batch_window is not None:
+            self.writer = WriteCoalescer(self.db, write_batch_window, write_batch_size)
+        self.cache = TermCache(cache_size)
+        self.feed = ChangeFeed(self.db.get_version()[0], queue_size=watch_queue_size)
+        self.db.add_listener(self.feed.publish)
+        # Снимок текущей версии (None - устарел и перезаписывается) и версия,
+        # которой должен соответствовать принимаемый снимок
+        self.snapshot_path = snapshot_path
+        self._glossary: Optional[GlossarySnapshot] = None
+        self._glossary_version = 0
+        self._glossary_lock = threading.Lock()
+        self._glossary_stale = threading.Event()
+        if snapshot_path is not None:
+            self._glossary = self._open_glossary()
+        if self._glossary is not None:
+            # Индексы строятся по снимку без чтения всех терминов из базы
+            version = self._glossary_version = self._glossary.version
+            terms = list(self._glossary.iter_terms())
+        else:
+            version, _, terms = self.db.list_terms_with_version()
+        self.graph = TermGraph(terms, version)
+        self.db.add_listener(self.graph.apply)
+        self.names = NameIndex(terms)
+        self.db.add_listener(self.names.apply)
+        self.db.add_listener(self.cache.apply)
+        self.db.add_reset_listener(self._reset_state)
+        # Последний рассчитанный граф с раскладкой и координаты узлов по ключу
+        self._graph_layout: Optional[dictionary_pb2.FullGraphResponse] = None
+        self._graph_positions: Dict[str, Tuple[float, float]] = {}
+        self._graph_lock = threading.Lock()
+        # Снимок списка после изменения строит один поток, остальные ждут его
+        self._snapshot_lock = threading.Lock()
+        self.sync_interval = sync_interval
+        if sync_interval is not None:
+            threading.Thread(
+                target=self._sync_loop, name='dictionary-sync', daemon=True
+            ).start()
+        if snapshot_path is not None:
+            self.db.add_listener(self._expire_glossary_on)
+            threading.Thread(
+                target=self._glossary_loop, name='dictionary-snapshot', daemon=True
+            ).start()
+    
+    def _sync_external(self) -> None:
         """
-        self.db = DictionaryDB(db_path)
+        Учет изменений других процессов перед чтением из памяти
+        
+        Без изменений проверка стоит одного PRAGMA data_version, поэтому
+        выполняется перед каждым запросом к кешу и индексам: запись через
+        один процесс сразу видна при чтении через другой.
+        """
+        if self.sync_interval is None:
+            return
+        try:
+            self.db.sync_changes()
+        except DatabaseError as e:
+            logger.error(f"Ошибка синхронизации с другими процессами: {e}")
+    
+    def _sync_loop(self) -> None:
+        """Периодическая синхронизация для подписчиков WatchTerms"""
+        while True:
+            time.sleep(self.sync_interval)
+            self._sync_external()
+    
+    def _reset_state(self) -> None:
+        """Построение кеша и индексов заново по базе данных"""
+        self.cache.clear()
+        try:
+            version, _, terms = self.db.list_terms_with_version()
+        except DatabaseError as e:
+            logger.error(f"Ошибка при перестроении индексов: {e}")
+            return
+        self.graph.reset(terms, version)
+        self.names.reset(terms)
+        self.feed.reset(version)
+        if self.snapshot_path is not None:
+            self._expire_glossary(version)
+    
+    def _open_glossary(self) -> Optional[GlossarySnapshot]:
+        """Открытие снимка текущей версии, с перезаписью при необходимости"""
+        try:
+            return open_snapshot(self.db, self.snapshot_path)
+        except (DatabaseError, OSError, ValueError) as e:
+            logger.error(f"Ошибка при открытии снимка {self.snapshot_path}: {e}")
+            return None
+    
+    def _expire_glossary_on(self, changes: List[TermChange]) -> None:
+        """Отказ от снимка при изменении данных"""
+        if changes:
+            self._expire_glossary(max(change.version for change in changes))
+    
+    def _expire_glossary(self, version: int) -> None:
+        """
+        Отказ от снимка до перезаписи
+        
+        Пока новый снимок не открыт, чтение идет через базу и кеш.
+        
+        Args:
+            version: Версия набора данных, которой должен соответствовать снимок
+        """
+        with self._glossary_lock:
+            self._glossary = None
+            self._glossary_version = version
+        self._glossary_stale.set()
+    
+    def _glossary_loop(self) -> None:
+        """Перезапись и открытие снимка после изменений"""
+        while True:
+            self._glossary_stale.wait()
+            time.sleep(SNAPSHOT_REFRESH_DELAY)
+            self._glossary_stale.clear()
+            glossary = self._open_glossary()
+            with self._glossary_lock:
+                if glossary is None:
+                    # Повтор после задержки
+                    self._glossary_stale.set()
+                elif glossary.version >= self._glossary_version:
+                    self._glossary = glossary
     
     def GetDefinition(self, request: dictionary_pb2.TermRequest, 
                      context: grpc.ServicerContext) -> dictionary_pb2.DefinitionResponse:
         """Получение определения термина"""
+        self._sync_external()
+        glossary = self._glossary
+        if glossary is not None:
+            return dictionary_pb2.DefinitionResponse.FromString(
+                self._glossary_definition(glossary, request.name, context)
+            )
         try:
-            term = self.db.get_term(name=request.name)
-            return dictionary_pb2.DefinitionResponse(term=term.to_proto())
+            term = self.cache.get_by_name(request.name)
+            if term is None:
+                generation = self.cache.generation
+                term = self.db.get_term(name=request.name, as_proto=True)
+                self.cache.put(term, generation)
+            return dictionary_pb2.DefinitionResponse(term=term)
         except TermNotFoundError as e:
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details(str(e))
@@ -38,57 +302,745 @@ class DictionaryService(dictionary_pb2_grpc.DictionaryServiceServicer):
             context.set_details(str(e))
             return dictionary_pb2.DefinitionResponse()
     
+    def GetDefinitionSerialized(self, request: dictionary_pb2.TermRequest, 
+                                context: grpc.ServicerContext) -> bytes:
+        """
+        GetDefinition с ответом в сериализованном виде (см. add_to_server)
+        
+        При открытом снимке ответ - срез файла снимка без разбора и
+        сериализации сообщения.
+        """
+        if self.snapshot_path is None:
+            return self.GetDefinition(request, context).SerializeToString()
+        self._sync_external()
+        glossary = self._glossary
+        if glossary is None:
+            return self.GetDefinition(request, context).SerializeToString()
+        return self._glossary_definition(glossary, request.name, context)
+    
+    @staticmethod
+    def _glossary_definition(glossary: GlossarySnapshot, name: str, 
+                             context: grpc.ServicerContext) -> bytes:
+        """Сериализованный DefinitionResponse из снимка"""
+        index = glossary.find(name)
+        if index is None:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(f"Термин не найден: {name}")
+            return b''
+        return glossary.records(index, index + 1).tobytes()
+    
+    def GetTermsByNames(self, request: dictionary_pb2.TermsByNamesRequest, 
+                        context: grpc.ServicerContext) -> dictionary_pb2.TermsByNamesResponse:
+        """Пакетное получение терминов по именам"""
+        self._sync_external()
+        try:
+            found = {}
+            uncached = []
+            for name in request.names:
+                term = self.cache.get_by_name(name)
+                if term is None:
+                    uncached.append(name)
+                else:
+                    found[normalize_name(name)] = term
+            if uncached:
+                generation = self.cache.generation
+                for key, term in self.db.get_terms_by_names(uncached, as_proto=True).items():
+                    found[key] = term
+                    self.cache.put(term, generation)
+            
+            response = dictionary_pb2.TermsByNamesResponse()
+            returned = set()
+            for name in request.names:
+                key = normalize_name(name)
+                term = found.get(key)
+                if term is None:
+                    response.missing.append(name)
+                elif key not in returned:
+                    returned.add(key)
+                    response.terms.append(term)
+            return response
+        except DatabaseError as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return dictionary_pb2.TermsByNamesResponse()
+    
+    def SearchTerms(self, request: dictionary_pb2.SearchTermsRequest, 
+                    context: grpc.ServicerContext) -> dictionary_pb2.SearchTermsResponse:
+        """Полнотекстовый поиск терминов с ранжированием BM25"""
+        if not request.query.strip():
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Пустой поисковый запрос")
+            return dictionary_pb2.SearchTermsResponse()
+        if request.limit < 0 or request.offset < 0:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("limit и offset не могут быть отрицательными")
+            return dictionary_pb2.SearchTermsResponse()
+        
+        limit = min(request.limit or DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT)
+        highlight = (request.highlight_start or '<mark>', request.highlight_end or '</mark>')
+        try:
+            hits = self.db.search_terms(request.query, limit, request.offset, highlight)
+        except DatabaseError as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return dictionary_pb2.SearchTermsResponse()
+        return dictionary_pb2.SearchTermsResponse(hits=[
+            dictionary_pb2.SearchHit(
+                id=hit.term_id, name=hit.name, snippet=hit.snippet, score=hit.score
+            )
+            for hit in hits
+        ])
+    
+    def SuggestTerms(self, request: dictionary_pb2.SuggestTermsRequest, 
+                     context: grpc.ServicerContext) -> dictionary_pb2.SuggestTermsResponse:
+        """Подсказки имен терминов по префиксу из индекса в памяти"""
+        self._sync_external()
+        if not request.prefix.strip():
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Пустой префикс")
+            return dictionary_pb2.SuggestTermsResponse()
+        if request.limit < 0:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("limit не может быть отрицательным")
+            return dictionary_pb2.SuggestTermsResponse()
+        
+        limit = min(request.limit or DEFAULT_SUGGEST_LIMIT, MAX_SUGGEST_LIMIT)
+        return dictionary_pb2.SuggestTermsResponse(suggestions=[
+            dictionary_pb2.TermSuggestion(id=term_id, name=name)
+            for term_id, name in self.names.suggest(request.prefix.strip(), limit)
+        ])
+    
     def ListTerms(self, request: dictionary_pb2.ListTermsRequest, 
                  context: grpc.ServicerContext) -> dictionary_pb2.ListTermsResponse:
-        """Получение списка всех терминов"""
+        """Получение списка терминов (целиком или постранично)"""
+        self._sync_external()
         try:
-            terms = self.db.list_terms()
-            return dictionary_pb2.ListTermsResponse(
-                terms=[term.to_proto() for term in terms]
+            if self._is_full_list(request):
+                return dictionary_pb2.ListTermsResponse.FromString(
+                    self._list_all_terms(request.if_version)
+                )
+            page_size = self._page_size(request)
+            if not self._is_id_page(request):
+                terms, next_page_token = self._sorted_page(request, page_size)
+            else:
+                after_id = decode_page_token(request.page_token)
+                # Запрашиваем на один термин больше, чтобы узнать о следующей странице
+                terms = list(self.db.iter_terms(after_id=after_id, limit=page_size + 1,
+                                                 as_proto=True))
+                next_page_token = ''
+                if len(terms) > page_size:
+                    terms = terms[:page_size]
+                    next_page_token = encode_page_token(terms[-1].id)
+            
+            response = dictionary_pb2.ListTermsResponse(
+                terms=terms,
+                next_page_token=next_page_token
             )
+            if request.include_total:
+                response.total_size = self.db.count_terms(
+                    request.source or None, request.relation_type or None
+                )
+            return response
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return dictionary_pb2.ListTermsResponse()
         except DatabaseError as e:
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return dictionary_pb2.ListTermsResponse()
     
+    def ListTermsSerialized(self, request: dictionary_pb2.ListTermsRequest, 
+                            context: grpc.ServicerContext) -> bytes:
+        """
+        ListTerms с ответом в сериализованном виде (см. add_to_server)
+        
+        Полный список отдается готовыми байтами из кеша или снимка без
+        построения и сериализации сообщения, при открытом снимке так же
+        отдаются страницы по ID; остальные страницы сериализуются как обычно.
+        """
+        full_list = self._is_full_list(request)
+        if not full_list and (self.snapshot_path is None or not self._is_id_page(request)):
+            return self.ListTerms(request, context).SerializeToString()
+        self._sync_external()
+        try:
+            if full_list:
+                return self._list_all_terms(request.if_version)
+            glossary = self._glossary
+            if glossary is None:
+                return self.ListTerms(request, context).SerializeToString()
+            return self._glossary_page(glossary, request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return b''
+        except DatabaseError as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return b''
+    
+    def _glossary_page(self, glossary: GlossarySnapshot, 
+                       request: dictionary_pb2.ListTermsRequest) -> bytes:
+        """
+        Сериализованная страница по ID из снимка
+        
+        Термины страницы - непрерывный срез файла; поля ответа после него
+        дописываются отдельным сообщением (сериализованные сообщения
+        protobuf объединяются конкатенацией).
+        
+        Raises:
+            ValueError: Если размер страницы или токен некорректны
+        """
+        page_size = self._page_size(request)
+        start = glossary.index_after(decode_page_token(request.page_token))
+        stop = min(start + page_size, len(glossary))
+        tail = dictionary_pb2.ListTermsResponse()
+        if stop < len(glossary):
+            tail.next_page_token = encode_page_token(glossary.term_id(stop - 1))
+        if request.include_total:
+            tail.total_size = len(glossary)
+        return b''.join((glossary.records(start, stop), tail.SerializeToString()))
+    
+    @staticmethod
+    def _is_full_list(request: dictionary_pb2.ListTermsRequest) -> bool:
+        """Запрошен ли полный список без страниц, сортировки и фильтров"""
+        return not (request.page_size or request.page_token or request.sort_by
+                    or request.descending or request.source or request.relation_type)
+    
+    @staticmethod
+    def _is_id_page(request: dictionary_pb2.ListTermsRequest) -> bool:
+        """Запрошена ли страница по ID без сортировки и фильтров"""
+        return not (request.sort_by or request.descending or request.source 
+                    or request.relation_type)
+    
+    @staticmethod
+    def _page_size(request: dictionary_pb2.ListTermsRequest) -> int:
+        """
+        Размер страницы ListTerms с учетом ограничения
+        
+        Raises:
+            ValueError: Если размер страницы отрицателен
+        """
+        if request.page_size < 0:
+            raise ValueError(f"Некорректный размер страницы: {request.page_size}")
+        return min(request.page_size or MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+    
+    def _sorted_page(self, request: dictionary_pb2.ListTermsRequest, 
+                     page_size: int) -> Tuple[List[Term], str]:
+        """
+        Страница терминов с сортировкой по колонке и фильтрами
+        
+        Args:
+            request: Запрос ListTerms
+            page_size: Размер страницы
+        Returns:
+            Tuple[List[Term], str]: (термины страницы, токен следующей страницы)
+        Raises:
+            ValueError: Если колонка сортировки или токен некорректны
+        """
+        order_by = request.sort_by or 'id'
+        if order_by not in DictionaryDB.SORT_COLUMNS:
+            raise ValueError(f"Некорректная колонка сортировки: {order_by}")
+        order = f"-{order_by}" if request.descending else order_by
+        after = decode_sort_token(request.page_token, order) if request.page_token else None
+        
+        terms = self.db.page_terms(
+            order_by, request.descending, after, page_size + 1,
+            request.source or None, request.relation_type or None, as_proto=True
+        )
+        next_page_token = ''
+        if len(terms) > page_size:
+            terms = terms[:page_size]
+            last = terms[-1]
+            value = {
+                'id': '',
+                'name': normalize_name(last.name),
+                'created_at': last.created_at,
+                'updated_at': last.updated_at,
+            }[order_by]
+            next_page_token = encode_sort_token(order, value, last.id)
+        return terms, next_page_token
+    
+    def GetFacets(self, request: dictionary_pb2.FacetsRequest, 
+                  context: grpc.ServicerContext) -> dictionary_pb2.FacetsResponse:
+        """Значения для фильтров списка терминов"""
+        try:
+            sources, relation_types = self.db.list_facets()
+            return dictionary_pb2.FacetsResponse(sources=sources, relation_types=relation_types)
+        except DatabaseError as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return dictionary_pb2.FacetsResponse()
+    
+    def _list_all_terms(self, if_version: int) -> bytes:
+        """
+        Полный список терминов с поддержкой условного запроса
+        
+        При открытом файле снимка ответ собирается из него. Иначе
+        сериализованный снимок хранится в кеше до следующего изменения и
+        строится заново при первом запросе после него.
+        
+        Args:
+            if_version: Версия данных, имеющаяся у клиента (0 - нет)
+        Returns:
+            bytes: Сериализованный ListTermsResponse - снимок или ответ not_modified
+        Raises:
+            DatabaseError: При ошибке чтения из базы
+        """
+        glossary = self._glossary
+        if glossary is not None:
+            if if_version and glossary.version == if_version:
+                return self._not_modified(glossary.version, glossary.modified_at)
+            return b''.join((glossary.records(), dictionary_pb2.ListTermsResponse(
+                version=glossary.version, modified_at=glossary.modified_at
+            ).SerializeToString()))
+        snapshot = self.cache.get_snapshot()
+        if snapshot is None:
+            if if_version:
+                version, modified_at = self.db.get_version()
+                if version == if_version:
+                    return self._not_modified(version, modified_at)
+            snapshot = self._build_snapshot()
+        
+        if if_version and snapshot.version == if_version:
+            return self._not_modified(snapshot.version, snapshot.modified_at)
+        return snapshot.data
+    
+    def _build_snapshot(self) -> ListSnapshot:
+        """
+        Построение и сохранение в кеш сериализованного полного списка
+        
+        Returns:
+            ListSnapshot: Снимок (построенный другим потоком, если тот успел раньше)
+        Raises:
+            DatabaseError: При ошибке чтения из базы
+        """
+        with self._snapshot_lock:
+            snapshot = self.cache.get_snapshot()
+            if snapshot is not None:
+                return snapshot
+            generation = self.cache.generation
+            version, modified_at, terms = self.db.list_terms_with_version(as_proto=True)
+            snapshot = ListSnapshot(version, modified_at, dictionary_pb2.ListTermsResponse(
+                terms=terms,
+                version=version,
+                modified_at=modified_at
+            ).SerializeToString())
+            self.cache.put_snapshot(snapshot, generation)
+            return snapshot
+    
+    @staticmethod
+    def _not_modified(version: int, modified_at: str) -> bytes:
+        """Сериализованный ответ о том, что версия клиента актуальна"""
+        return dictionary_pb2.ListTermsResponse(
+            version=version, modified_at=modified_at, not_modified=True
+        ).SerializeToString()
+    
+    def StreamTerms(self, request: dictionary_pb2.StreamTermsRequest, 
+                    context: grpc.ServicerContext) -> Iterator[dictionary_pb2.Term]:
+        """Потоковая выдача всех терминов"""
+        try:
+            after_id = decode_page_token(request.page_token)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        try:
+            yield from self.db.iter_terms(after_id=after_id, as_proto=True)
+        except DatabaseError as e:
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+    
     def AddTerm(self, request: dictionary_pb2.AddTermRequest, 
                 context: grpc.ServicerContext) -> dictionary_pb2.AddTermResponse:
         """Добавление нового термина"""
         try:
             term = Term.from_proto(request.term)
-            success, message, term_id = self.db.add_term(term)
+            success, message, term_id = self._write(TermWrite.add(term))
+            if success:
+                self.cache.invalidate(term_ids=[term_id], names=[term.name])
             return dictionary_pb2.AddTermResponse(success=success, message=message)
         except DatabaseError as e:
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return dictionary_pb2.AddTermResponse(success=False, message=str(e))
     
+    def _write(self, write: TermWrite) -> WriteResult:
+        """Запись одного изменения, в составе пакета при включенном объединении"""
+        if self.writer is not None:
+            return self.writer.submit(write)
+        return self.db.apply_writes([write])[0]
+    
+    def BulkAddTerms(self, request_iterator: Iterator[dictionary_pb2.AddTermRequest], 
+                     context: grpc.ServicerContext) -> dictionary_pb2.BulkTermsResponse:
+        """Пакетное добавление терминов"""
+        return self._bulk_write(request_iterator, context, upsert=False)
+    
+    def BulkUpsertTerms(self, request_iterator: Iterator[dictionary_pb2.AddTermRequest], 
+                        context: grpc.ServicerContext) -> dictionary_pb2.BulkTermsResponse:
+        """Пакетное добавление или обновление терминов"""
+        return self._bulk_write(request_iterator, context, upsert=True)
+    
+    def _bulk_write(self, request_iterator: Iterator[dictionary_pb2.AddTermRequest], 
+                    context: grpc.ServicerContext, upsert: bool) -> dictionary_pb2.BulkTermsResponse:
+        """Запись потока терминов порциями с постатусным ответом"""
+        try:
+            results = self.db.bulk_add_terms(
+                (Term.from_proto(request.term) for request in request_iterator),
+                chunk_size=self.bulk_chunk_size,
+                upsert=upsert
+            )
+            self.cache.invalidate(term_ids=[term_id for success, _, term_id in results if success])
+            response = dictionary_pb2.BulkTermsResponse()
+            for index, (success, message, term_id) in enumerate(results):
+                response.statuses.add(
+                    index=index, success=success, message=message, id=term_id or 0
+                )
+                if success:
+                    response.succeeded += 1
+                else:
+                    response.failed += 1
+            return response
+        except DatabaseError as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return dictionary_pb2.BulkTermsResponse()
+    
     def UpdateTerm(self, request: dictionary_pb2.UpdateTermRequest, 
                   context: grpc.ServicerContext) -> dictionary_pb2.UpdateTermResponse:
         """Обновление существующего термина"""
         try:
-            term = Term.from_proto(request.term)
-            success, message = self.db.update_term(request.id, term)
-            updated_term = None
-            if success:
-                updated_term = self.db.get_term(term_id=request.id).to_proto()
+            write = TermWrite.update(request.id, Term.from_proto(request.term))
+            success, message, updated_term = self._write_updated(write)
             return dictionary_pb2.UpdateTermResponse(
                 success=success, 
                 message=message, 
-                term=updated_term
+                term=updated_term,
+                changed=write.changed
             )
         except DatabaseError as e:
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return dictionary_pb2.UpdateTermResponse(success=False, message=str(e))
     
+    def PatchTerm(self, request: dictionary_pb2.PatchTermRequest, 
+                  context: grpc.ServicerContext) -> dictionary_pb2.PatchTermResponse:
+        """
+        Частичное обновление термина
+        
+        Изменяются только поля из update_mask и связи из add_relations и
+        remove_relations; в базу записываются только изменившиеся колонки
+        и строки связей.
+        """
+        try:
+            write = TermWrite.patch(request.id, TermPatch.from_proto(request))
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return dictionary_pb2.PatchTermResponse(success=False, message=str(e))
+        try:
+            success, message, updated_term = self._write_updated(write)
+            return dictionary_pb2.PatchTermResponse(
+                success=success, 
+                message=message, 
+                term=updated_term,
+                changed=write.changed
+            )
+        except DatabaseError as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return dictionary_pb2.PatchTermResponse(success=False, message=str(e))
+    
+    def _write_updated(self, write: TermWrite) -> Tuple[bool, str, Optional[dictionary_pb2.Term]]:
+        """
+        Запись обновления термина
+        
+        Термин для ответа строится в транзакции записи. В кеш он не
+        помещается: после фиксации термин могла изменить следующая
+        транзакция, поэтому кеш заполнит первое чтение из базы. Признак
+        изменения данных остается в write.changed.
+        
+        Args:
+            write: Изменение UPDATE или PATCH
+        Returns:
+            Tuple[bool, str, Optional[dictionary_pb2.Term]]: (успех, сообщение,
+                термин после изменения)
+        """
+        success, message, _ = self._write(write)
+        if not success:
+            return success, message, None
+        if write.changed:
+            self.cache.invalidate(term_ids=[write.term_id], names=[write.result.name])
+        return success, message, write.result.to_proto()
+    
     def DeleteTerm(self, request: dictionary_pb2.DeleteTermRequest, 
                   context: grpc.ServicerContext) -> dictionary_pb2.DeleteTermResponse:
         """Удаление термина"""
         try:
-            success, message = self.db.delete_term(request.id)
+            success, message, _ = self._write(TermWrite.delete(request.id))
+            if success:
+                self.cache.invalidate(term_ids=[request.id])
             return dictionary_pb2.DeleteTermResponse(success=success, message=message)
         except DatabaseError as e:
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
-            return dictionary_pb2.DeleteTermResponse(success=False, message=str(e)) 
\ No newline at end of file
+            return dictionary_pb2.DeleteTermResponse(success=False, message=str(e)) 
+    
+    def WatchTerms(self, request: dictionary_pb2.WatchTermsRequest, 
+                   context: grpc.ServicerContext) -> Iterator[dictionary_pb2.TermEvent]:
+        """
+        Поток изменений терминов
+        
+        С snapshot=true сначала передается полный снимок, завершающийся
+        событием SNAPSHOT_END. С from_version передаются изменения после этой
+        версии; если история их уже не содержит, передается снимок. Затем
+        поток передает новые изменения. Если подписчик не успевает их читать,
+        поток завершается с RESOURCE_EXHAUSTED, и клиент должен
+        переподключиться с последней полученной версией.
+        """
+        self._sync_external()
+        from_version = self.watch_from_version(request)
+        subscription = self.feed.subscribe(from_version)
+        try:
+            events, skip_through = self.initial_watch_events(request, from_version, subscription)
+            yield from events
+            
+            while context.is_active():
+                if subscription.overflowed:
+                    context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, WATCH_OVERFLOW_MESSAGE)
+                change = subscription.get(timeout=WATCH_POLL_INTERVAL)
+                if change is not None and change.version > skip_through:
+                    yield self.change_to_event(change)
+        except DatabaseError as e:
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+        finally:
+            self.feed.unsubscribe(subscription)
+    
+    def GetVersion(self, request: dictionary_pb2.VersionRequest, 
+                   context: grpc.ServicerContext) -> dictionary_pb2.VersionResponse:
+        """
+        Текущая версия набора данных
+        
+        Клиент может подписаться на WatchTerms с этой версией, чтобы не
+        пропустить изменения и не получать снимок.
+        """
+        try:
+            version, modified_at = self.db.get_version()
+            return dictionary_pb2.VersionResponse(version=version, modified_at=modified_at)
+        except DatabaseError as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return dictionary_pb2.VersionResponse()
+    
+    @staticmethod
+    def watch_from_version(request: dictionary_pb2.WatchTermsRequest) -> Optional[int]:
+        """Версия, после которой подписчику нужны изменения из истории"""
+        return request.from_version if request.from_version and not request.snapshot else None
+    
+    def initial_watch_events(self, request: dictionary_pb2.WatchTermsRequest,
+                             from_version: Optional[int], subscription: Subscription
+                             ) -> Tuple[Iterator[dictionary_pb2.TermEvent], int]:
+        """
+        События, предшествующие потоку новых изменений: снимок или история
+        
+        Args:
+            request: Запрос WatchTerms
+            from_version: Версия из watch_from_version
+            subscription: Подписка, созданная до чтения снимка
+        Returns:
+            Tuple[Iterator[dictionary_pb2.TermEvent], int]: (события, версия,
+                изменения до которой включительно уже учтены в снимке)
+        Raises:
+            DatabaseError: При ошибке чтения снимка
+        """
+        send_snapshot = request.snapshot or subscription.backlog is None
+        if from_version is not None and not send_snapshot:
+            # Версия клиента новее текущей: данные были заменены
+            send_snapshot = from_version > self.db.get_version()[0]
+        if not send_snapshot:
+            return (self.change_to_event(change) for change in subscription.backlog), 0
+        
+        version, _, terms = self.db.list_terms_with_version(as_proto=True)
+        def snapshot() -> Iterator[dictionary_pb2.TermEvent]:
+            for term in terms:
+                yield dictionary_pb2.TermEvent(
+                    type=dictionary_pb2.TermEvent.SNAPSHOT,
+                    version=version,
+                    term_id=term.id,
+                    term=term
+                )
+            yield dictionary_pb2.TermEvent(
+                type=dictionary_pb2.TermEvent.SNAPSHOT_END, version=version
+            )
+        # Изменения до версии снимка в нем уже учтены
+        return snapshot(), version
+    
+    @staticmethod
+    def change_to_event(change: TermChange) -> dictionary_pb2.TermEvent:
+        """Преобразование изменения в protobuf событие"""
+        return dictionary_pb2.TermEvent(
+            type=CHANGE_EVENT_TYPES[change.kind],
+            version=change.version,
+            term_id=change.term_id,
+            term=change.term.to_proto() if change.term else None,
+            previous_name=change.previous_name or ''
+        )
+    
+    def GetNeighborhood(self, request: dictionary_pb2.NeighborhoodRequest, 
+                        context: grpc.ServicerContext) -> dictionary_pb2.GraphResponse:
+        """Окрестность термина в графе связей"""
+        self._sync_external()
+        depth = min(request.depth or DEFAULT_GRAPH_DEPTH, MAX_GRAPH_DEPTH)
+        limit = min(request.limit or DEFAULT_GRAPH_NODES, MAX_GRAPH_NODES)
+        if request.cluster_size < 0:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("cluster_size не может быть отрицательным")
+            return dictionary_pb2.GraphResponse()
+        try:
+            nodes, edges, clusters, truncated = self.graph.neighborhood(
+                request.name, depth, limit, request.cluster_size
+            )
+        except KeyError:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(f"Термин не найден: {request.name}")
+            return dictionary_pb2.GraphResponse()
+        return dictionary_pb2.GraphResponse(
+            nodes=[
+                dictionary_pb2.GraphNode(
+                    name=node.name, id=node.term_id or 0, depth=node.depth,
+                    degree=node.degree, hidden=node.hidden
+                )
+                for node in nodes
+            ],
+            edges=[
+                dictionary_pb2.GraphEdge(source=source, target=target, relation=relation)
+                for source, target, relation in edges
+            ],
+            clusters=[
+                dictionary_pb2.GraphCluster(parent=parent, size=size)
+                for parent, size in clusters
+            ],
+            truncated=truncated
+        )
+    
+    def GetBacklinks(self, request: dictionary_pb2.TermRequest, 
+                     context: grpc.ServicerContext) -> dictionary_pb2.BacklinksResponse:
+        """Термины, ссылающиеся на данный"""
+        self._sync_external()
+        try:
+            edges = self.graph.backlinks(request.name)
+        except KeyError:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(f"Термин не найден: {request.name}")
+            return dictionary_pb2.BacklinksResponse()
+        return dictionary_pb2.BacklinksResponse(edges=[
+            dictionary_pb2.GraphEdge(source=source, target=target, relation=relation)
+            for source, target, relation in edges
+        ])
+    
+    def ShortestPath(self, request: dictionary_pb2.ShortestPathRequest, 
+                     context: grpc.ServicerContext) -> dictionary_pb2.PathResponse:
+        """Кратчайшая цепочка связей между терминами"""
+        self._sync_external()
+        try:
+            edges = self.graph.shortest_path(
+                request.source, request.target, request.max_depth or DEFAULT_PATH_DEPTH
+            )
+        except KeyError as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(f"Термин не найден: {e.args[0]}")
+            return dictionary_pb2.PathResponse()
+        if edges is None:
+            return dictionary_pb2.PathResponse(found=False)
+        return dictionary_pb2.PathResponse(found=True, edges=[
+            dictionary_pb2.GraphEdge(source=source, target=target, relation=relation)
+            for source, target, relation in edges
+        ])
+    
+    def GetGraph(self, request: dictionary_pb2.GetGraphRequest, 
+                 context: grpc.ServicerContext) -> dictionary_pb2.FullGraphResponse:
+        """
+        Весь граф связей с раскладкой, рассчитанной на сервере
+        
+        Раскладка кешируется для версии графа; после изменений она
+        пересчитывается при следующем запросе, начиная с прежних координат.
+        """
+        self._sync_external()
+        if request.if_version and request.if_version == self.graph.version:
+            return dictionary_pb2.FullGraphResponse(
+                version=self.graph.version, not_modified=True
+            )
+        with self._graph_lock:
+            cached = self._graph_layout
+            if cached is None or cached.version != self.graph.version:
+                cached = self._graph_layout = self._build_graph_layout()
+        if request.if_version and request.if_version == cached.version:
+            return dictionary_pb2.FullGraphResponse(version=cached.version, not_modified=True)
+        return cached
+    
+    def _build_graph_layout(self) -> dictionary_pb2.FullGraphResponse:
+        """Выгрузка графа и расчет раскладки; вызывается под _graph_lock"""
+        version, keys, names, ids, edges = self.graph.export()
+        positions = compute_layout(
+            keys, [(source, target) for source, target, _ in edges], self._graph_positions
+        )
+        self._graph_positions = dict(zip(keys, positions))
+        
+        relation_indexes: Dict[str, int] = {}
+        response = dictionary_pb2.FullGraphResponse(
+            version=version,
+            names=names,
+            ids=[term_id or 0 for term_id in ids],
+            xs=[x for x, _ in positions],
+            ys=[y for _, y in positions],
+            sources=[source for source, _, _ in edges],
+            targets=[target for _, target, _ in edges],
+            relation_indexes=[
+                relation_indexes.setdefault(relation, len(relation_indexes))
+                for _, _, relation in edges
+            ]
+        )
+        response.relations.extend(relation_indexes)
+        logger.info(f"Рассчитана раскладка графа версии {version}: {len(keys)} узлов")
+        return response
+    
+    def GetCacheStats(self, request: dictionary_pb2.CacheStatsRequest, 
+                      context: grpc.ServicerContext) -> dictionary_pb2.CacheStatsResponse:
+        """Получение счетчиков кеша терминов"""
+        return dictionary_pb2.CacheStatsResponse(**self.cache.stats())
+
+
+SERVICE_NAME = 'dictionary.DictionaryService'
+
+
+def add_to_server(servicer: dictionary_pb2_grpc.DictionaryServiceServicer, server) -> None:
+    """
+    Регистрация сервиса словаря на сервере grpc.server или grpc.aio.server
+    
+    Обработчики берутся из dictionary_pb2_grpc, кроме ListTerms и
+    GetDefinition: они вызывают ListTermsSerialized и
+    GetDefinitionSerialized и передают готовые байты без повторной
+    сериализации. Собственный обработчик регистрируется и как общий (до
+    сгенерированного, общие проверяются по порядку), и как
+    предрегистрированный (после него, заменяя сгенерированный).
+    
+    Args:
+        servicer: DictionaryService или AsyncDictionaryService
+        server: Сервер gRPC
+    """
+    handlers = {
+        'ListTerms': grpc.unary_unary_rpc_method_handler(
+            servicer.ListTermsSerialized,
+            request_deserializer=dictionary_pb2.ListTermsRequest.FromString,
+            # Без сериализатора gRPC отправляет ответ как есть
+            response_serializer=None
+        ),
+        'GetDefinition': grpc.unary_unary_rpc_method_handler(
+            servicer.GetDefinitionSerialized,
+            request_deserializer=dictionary_pb2.TermRequest.FromString,
+            response_serializer=None
+        ),
+    }
+    server.add_generic_rpc_handlers(
+        (grpc.method_handlers_generic_handler(SERVICE_NAME, handlers),)
+    )
+    dictionary_pb2_grpc.add_DictionaryServiceServicer_to_server(servicer, server)
+    if hasattr(server, 'add_registered_method_handlers'):
+        server.add_registered_method_handlers(SERVICE_NAME, handlers)
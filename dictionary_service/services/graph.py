@@ -0,0 +1,324 @@
+"""Модуль с индексом связей между терминами"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dictionary_service.models.change import TermChange
+from dictionary_service.models.term import Term, normalize_name
+
+logger = logging.getLogger(__name__)
+
+def relation_key(name: str) -> str:
+    """
+    Ключ узла графа для имени термина или ссылки на него
+    
+    Пояснение в скобках ("Docker (платформа)") не входит в ключ, как и при
+    построении графа в веб-интерфейсе.
+    
+    Args:
+        name: Имя термина или значение related_term
+    Returns:
+        str: Нормализованный ключ узла
+    """
+    return normalize_name(name.split('(')[0].strip())
+
+class GraphNode:
+    """Узел результата запроса к графу"""
+    
+    __slots__ = ('key', 'name', 'term_id', 'depth', 'degree', 'hidden')
+    
+    def __init__(self, key: str, name: str, term_id: Optional[int], depth: int,
+                 degree: int = 0, hidden: int = 0):
+        self.key = key
+        self.name = name
+        self.term_id = term_id
+        self.depth = depth
+        # Количество соседей узла в графе и не вошедших в результат
+        self.degree = degree
+        self.hidden = hidden
+
+class TermGraph:
+    """
+    Индекс связей между терминами в памяти
+    
+    Хранит исходящие и входящие ребра по нормализованным именам. Узлами
+    являются как существующие термины, так и имена, на которые ссылаются
+    связи, но которых нет в словаре. Индекс строится из базы данных один
+    раз и обновляется по изменениям (см. apply), поэтому запросы не
+    обращаются к базе.
+    """
+    
+    def __init__(self, terms: Iterable[Term] = (), version: int = 0):
+        """
+        Инициализация индекса
+        
+        Args:
+            terms: Термины для начального построения
+            version: Версия набора данных, соответствующая terms
+        """
+        self._lock = threading.RLock()
+        self.reset(terms, version)
+    
+    def reset(self, terms: Iterable[Term], version: int) -> None:
+        """
+        Построение индекса заново
+        
+        Args:
+            terms: Все термины набора данных
+            version: Версия набора данных, соответствующая terms
+        """
+        with self._lock:
+            self._names: Dict[str, str] = {}
+            self._ids: Dict[str, int] = {}
+            self._out: Dict[str, Dict[str, str]] = {}
+            self._in: Dict[str, Dict[str, str]] = {}
+            self.version = version
+            for term in terms:
+                self._add_term(term)
+    
+    def apply(self, changes: List[TermChange]) -> None:
+        """
+        Применение зафиксированных изменений
+        
+        Args:
+            changes: Изменения одной транзакции
+        """
+        with self._lock:
+            for change in changes:
+                if change.previous_name is not None:
+                    self._remove_term(relation_key(change.previous_name))
+                if change.term is not None:
+                    self._add_term(change.term)
+                self.version = max(self.version, change.version)
+    
+    def _add_term(self, term: Term) -> None:
+        """Добавление термина и его исходящих связей"""
+        key = relation_key(term.name)
+        self._names[key] = term.name
+        self._ids[key] = term.id
+        edges = self._out.setdefault(key, {})
+        for related, relation in term.iter_relations():
+            target = relation_key(related)
+            if not target or target == key:
+                continue
+            self._names.setdefault(target, related.split('(')[0].strip())
+            edges[target] = relation
+            self._in.setdefault(target, {})[key] = relation
+    
+    def _remove_term(self, key: str) -> None:
+        """Удаление термина и его исходящих связей"""
+        self._ids.pop(key, None)
+        for target in self._out.pop(key, {}):
+            incoming = self._in.get(target)
+            if incoming is not None:
+                incoming.pop(key, None)
+                if not incoming:
+                    del self._in[target]
+            self._drop_if_orphan(target)
+        self._drop_if_orphan(key)
+    
+    def _drop_if_orphan(self, key: str) -> None:
+        """Удаление узла, который не является термином и на который нет ссылок"""
+        if key not in self._ids and key not in self._in:
+            self._names.pop(key, None)
+    
+    def export(self) -> Tuple[int, List[str], List[str], List[Optional[int]], 
+                              List[Tuple[int, int, str]]]:
+        """
+        Согласованная выгрузка всего графа
+        
+        Returns:
+            Tuple: (версия, ключи узлов, имена узлов, ID терминов или None,
+                ребра (индекс источника, индекс цели, тип))
+        """
+        with self._lock:
+            keys = sorted(self._names)
+            index = {key: i for i, key in enumerate(keys)}
+            edges = [
+                (index[source], index[target], relation)
+                for source in keys
+                for target, relation in self._out.get(source, {}).items()
+            ]
+            return (self.version, keys, [self._names[key] for key in keys], 
+                    [self._ids.get(key) for key in keys], edges)
+    
+    def _neighbors(self, key: str) -> Iterable[str]:
+        """Соседи узла без учета направления связей"""
+        yield from self._out.get(key, ())
+        yield from self._in.get(key, ())
+    
+    def _node(self, key: str, depth: int) -> GraphNode:
+        """Описание узла для ответа"""
+        return GraphNode(key, self._names[key], self._ids.get(key), depth)
+    
+    def contains(self, name: str) -> bool:
+        """Есть ли узел с таким именем"""
+        with self._lock:
+            return relation_key(name) in self._names
+    
+    def degree(self, key: str) -> int:
+        """Количество связей узла в обоих направлениях"""
+        return len(self._out.get(key, ())) + len(self._in.get(key, ()))
+    
+    def neighborhood(self, name: str, depth: int = 1, limit: int = 100, 
+                     cluster_size: int = 0
+                     ) -> Tuple[List[GraphNode], List[Tuple[str, str, str]], 
+                                List[Tuple[str, int]], bool]:
+        """
+        Окрестность узла: узлы на расстоянии не более depth в обоих направлениях
+        
+        Обход идет по уровням; соседи каждого узла добавляются в порядке
+        убывания степени, поэтому при усечении по limit остаются наиболее
+        связанные узлы. Если cluster_size задан, у узла берется не более
+        cluster_size новых соседей, а остальные сворачиваются в кластер.
+        
+        Args:
+            name: Имя центрального узла
+            depth: Максимальное расстояние
+            limit: Максимальное количество узлов
+            cluster_size: Максимальное количество новых соседей одного узла;
+                0 - без ограничения
+        Returns:
+            Tuple: (узлы в порядке обхода, ребра (источник, цель, тип) между
+                ними, кластеры (имя узла, количество свернутых соседей),
+                признак усечения по limit)
+        Raises:
+            KeyError: Если узла нет в графе
+        """
+        with self._lock:
+            start = relation_key(name)
+            if start not in self._names:
+                raise KeyError(name)
+            
+            depths = {start: 0}
+            clusters: List[Tuple[str, int]] = []
+            frontier = [start]
+            truncated = False
+            level = 0
+            while frontier and level < depth and not truncated:
+                level += 1
+                next_frontier = []
+                for key in frontier:
+                    candidates = sorted(
+                        {neighbor for neighbor in self._neighbors(key) if neighbor not in depths},
+                        key=lambda neighbor: (-self.degree(neighbor), neighbor)
+                    )
+                    selected = candidates
+                    if cluster_size and len(candidates) > cluster_size:
+                        selected = candidates[:cluster_size]
+                        clusters.append((self._names[key], len(candidates) - cluster_size))
+                    room = max(limit - len(depths), 0)
+                    if len(selected) > room:
+                        selected = selected[:room]
+                        truncated = True
+                    for neighbor in selected:
+                        depths[neighbor] = level
+                    next_frontier.extend(selected)
+                    if truncated:
+                        break
+                frontier = next_frontier
+            
+            nodes = []
+            for key, level in depths.items():
+                neighbors = set(self._neighbors(key))
+                node = self._node(key, level)
+                node.degree = len(neighbors)
+                node.hidden = sum(1 for neighbor in neighbors if neighbor not in depths)
+                nodes.append(node)
+            edges = [
+                (self._names[source], self._names[target], relation)
+                for source in depths
+                for target, relation in self._out.get(source, {}).items()
+                if target in depths
+            ]
+            return nodes, edges, clusters, truncated
+    
+    def backlinks(self, name: str) -> List[Tuple[str, str, str]]:
+        """
+        Входящие связи узла
+        
+        Args:
+            name: Имя узла
+        Returns:
+            List[Tuple[str, str, str]]: Ребра (источник, цель, тип)
+        Raises:
+            KeyError: Если узла нет в графе
+        """
+        with self._lock:
+            key = relation_key(name)
+            if key not in self._names:
+                raise KeyError(name)
+            return [
+                (self._names[source], self._names[key], relation)
+                for source, relation in sorted(self._in.get(key, {}).items())
+            ]
+    
+    def shortest_path(self, source: str, target: str, max_depth: int = 10
+                      ) -> Optional[List[Tuple[str, str, str]]]:
+        """
+        Кратчайший путь между узлами без учета направления связей
+        
+        Поиск в ширину ведется одновременно с обоих концов.
+        
+        Args:
+            source: Имя начального узла
+            target: Имя конечного узла
+            max_depth: Максимальная длина пути
+        Returns:
+            Optional[List[Tuple[str, str, str]]]: Ребра пути в исходном
+                направлении связей (пустой список, если узлы совпадают)
+                или None, если путь не найден
+        Raises:
+            KeyError: Если какого-либо узла нет в графе
+        """
+        with self._lock:
+            start, goal = relation_key(source), relation_key(target)
+            for key, name in ((start, source), (goal, target)):
+                if key not in self._names:
+                    raise KeyError(name)
+            if start == goal:
+                return []
+            
+            parents = ({start: None}, {goal: None})
+            frontiers = ([start], [goal])
+            meeting = None
+            for _ in range(max_depth):
+                # Расширяем меньшую из границ
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                next_frontier = []
+                for key in frontiers[side]:
+                    for neighbor in self._neighbors(key):
+                        if neighbor in parents[side]:
+                            continue
+                        parents[side][neighbor] = key
+                        if neighbor in parents[1 - side]:
+                            meeting = neighbor
+                            break
+                        next_frontier.append(neighbor)
+                    if meeting is not None:
+                        break
+                if meeting is not None or not next_frontier:
+                    break
+                frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+            if meeting is None:
+                return None
+            
+            path = []
+            key = meeting
+            while key is not None:
+                path.append(key)
+                key = parents[0][key]
+            path.reverse()
+            key = parents[1][meeting]
+            while key is not None:
+                path.append(key)
+                key = parents[1][key]
+            return [self._edge(a, b) for a, b in zip(path, path[1:])]
+    
+    def _edge(self, a: str, b: str) -> Tuple[str, str, str]:
+        """Ребро между соседними узлами в исходном направлении связи"""
+        if b in self._out.get(a, {}):
+            return self._names[a], self._names[b], self._out[a][b]
+        return self._names[b], self._names[a], self._out[b][a]
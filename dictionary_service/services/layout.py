@@ -0,0 +1,142 @@
+"""Модуль с расчетом раскладки графа терминов"""
+
+import math
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Position = Tuple[float, float]
+
+# Желаемое расстояние между связанными узлами в пикселях
+NODE_SPACING = 160.0
+# Количество итераций при расчете с нуля и при дорасчете
+COLD_ITERATIONS = 60
+WARM_ITERATIONS = 15
+
+def compute_layout(keys: Sequence[str], edges: Sequence[Tuple[int, int]], 
+                   previous: Optional[Dict[str, Position]] = None) -> List[Position]:
+    """
+    Силовая раскладка графа (Fruchterman-Reingold) по компонентам связности
+    
+    Отталкивание считается только между узлами соседних ячеек сетки, поэтому
+    итерация занимает O(n + m), а не O(n^2). Компоненты раскладываются
+    отдельно и затем укладываются рядами. Если передана прежняя раскладка,
+    известные узлы начинают с прежних координат и выполняется короткий
+    дорасчет вместо полного.
+    
+    Args:
+        keys: Ключи узлов
+        edges: Ребра как пары индексов узлов
+        previous: Прежние координаты узлов по ключу
+    Returns:
+        List[Position]: Координаты узлов в порядке keys
+    """
+    count = len(keys)
+    adjacency: List[List[int]] = [[] for _ in range(count)]
+    for a, b in edges:
+        if a != b:
+            adjacency[a].append(b)
+            adjacency[b].append(a)
+    
+    positions: List[Position] = [(0.0, 0.0)] * count
+    offset_x = offset_y = row_height = 0.0
+    row_width = max(NODE_SPACING * 10, NODE_SPACING * math.sqrt(count) * 2)
+    for component in sorted(_components(adjacency), key=len, reverse=True):
+        local = _layout_component(component, adjacency, keys, previous)
+        min_x = min(x for x, _ in local)
+        min_y = min(y for _, y in local)
+        width = max(x for x, _ in local) - min_x + NODE_SPACING
+        height = max(y for _, y in local) - min_y + NODE_SPACING
+        if offset_x and offset_x + width > row_width:
+            offset_x, offset_y, row_height = 0.0, offset_y + row_height, 0.0
+        for node, (x, y) in zip(component, local):
+            positions[node] = (round(x - min_x + offset_x, 1), round(y - min_y + offset_y, 1))
+        offset_x += width
+        row_height = max(row_height, height)
+    return positions
+
+def _components(adjacency: List[List[int]]) -> List[List[int]]:
+    """Компоненты связности графа"""
+    seen = [False] * len(adjacency)
+    components = []
+    for start in range(len(adjacency)):
+        if seen[start]:
+            continue
+        seen[start] = True
+        component = [start]
+        for node in component:
+            for neighbor in adjacency[node]:
+                if not seen[neighbor]:
+                    seen[neighbor] = True
+                    component.append(neighbor)
+        components.append(component)
+    return components
+
+def _layout_component(component: List[int], adjacency: List[List[int]], keys: Sequence[str], 
+                      previous: Optional[Dict[str, Position]]) -> List[Position]:
+    """Раскладка одной компоненты связности в локальных координатах"""
+    size = len(component)
+    if size == 1:
+        return [(0.0, 0.0)]
+    
+    k = NODE_SPACING
+    side = k * math.sqrt(size)
+    rng = random.Random(size)
+    local_index = {node: i for i, node in enumerate(component)}
+    known = 0
+    xs, ys = [], []
+    for node in component:
+        position = previous.get(keys[node]) if previous else None
+        if position is None:
+            position = (rng.uniform(0, side), rng.uniform(0, side))
+        else:
+            known += 1
+        xs.append(position[0])
+        ys.append(position[1])
+    
+    warm = known >= size * 0.8
+    iterations = WARM_ITERATIONS if warm else COLD_ITERATIONS
+    temperature = k if warm else side / 4
+    cooling = temperature / (iterations + 1)
+    neighbors = [[local_index[n] for n in adjacency[node]] for node in component]
+    
+    for _ in range(iterations):
+        dx = [0.0] * size
+        dy = [0.0] * size
+        
+        # Отталкивание между узлами соседних ячеек сетки размером 2k
+        cell = 2 * k
+        grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i in range(size):
+            grid[(int(xs[i] // cell), int(ys[i] // cell))].append(i)
+        for (cx, cy), members in grid.items():
+            nearby = [j for ox in (-1, 0, 1) for oy in (-1, 0, 1) 
+                      for j in grid.get((cx + ox, cy + oy), ())]
+            for i in members:
+                xi, yi = xs[i], ys[i]
+                for j in nearby:
+                    if i == j:
+                        continue
+                    ddx, ddy = xi - xs[j], yi - ys[j]
+                    dist2 = ddx * ddx + ddy * ddy or 0.01
+                    force = k * k / dist2
+                    dx[i] += ddx * force
+                    dy[i] += ddy * force
+        
+        # Притяжение вдоль ребер
+        for i in range(size):
+            for j in neighbors[i]:
+                ddx, ddy = xs[i] - xs[j], ys[i] - ys[j]
+                dist = math.sqrt(ddx * ddx + ddy * ddy) or 0.1
+                dx[i] -= ddx * dist / k
+                dy[i] -= ddy * dist / k
+        
+        for i in range(size):
+            length = math.sqrt(dx[i] * dx[i] + dy[i] * dy[i])
+            if length > 0:
+                step = min(length, temperature) / length
+                xs[i] += dx[i] * step
+                ys[i] += dy[i] * step
+        temperature -= cooling
+    
+    return list(zip(xs, ys))
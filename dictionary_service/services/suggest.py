@@ -0,0 +1,151 @@
+"""Модуль с префиксным индексом имен терминов для автодополнения"""
+
+import logging
+import threading
+from bisect import bisect_left
+from typing import Iterable, List, Tuple
+
+from dictionary_service.models.change import TermChange
+from dictionary_service.models.term import Term, normalize_name
+
+logger = logging.getLogger(__name__)
+
+class NameIndex:
+    """
+    Отсортированный список нормализованных имен терминов
+    
+    Имена хранятся блоками до 2 * BLOCK_SIZE элементов, упорядоченными между
+    собой; для каждого блока известен наибольший ключ. Подсказка по префиксу
+    находится двумя бинарными поисками за O(log n + limit), а вставка и
+    удаление сдвигают только один блок, а не весь массив.
+    """
+    
+    BLOCK_SIZE = 1000
+    
+    def __init__(self, terms: Iterable[Term] = ()):
+        """
+        Инициализация индекса
+        
+        Args:
+            terms: Термины для начального построения
+        """
+        self._lock = threading.Lock()
+        self.reset(terms)
+    
+    def reset(self, terms: Iterable[Term]) -> None:
+        """
+        Построение индекса заново
+        
+        Args:
+            terms: Все термины набора данных
+        """
+        entries = sorted((normalize_name(term.name), term.name, term.id) for term in terms)
+        with self._lock:
+            # Параллельные списки блоков: ключи для поиска, исходные имена и ID
+            self._keys: List[List[str]] = []
+            self._names: List[List[str]] = []
+            self._ids: List[List[int]] = []
+            # Наибольший ключ каждого блока
+            self._maxes: List[str] = []
+            for start in range(0, len(entries), self.BLOCK_SIZE):
+                block = entries[start:start + self.BLOCK_SIZE]
+                self._keys.append([key for key, _, _ in block])
+                self._names.append([name for _, name, _ in block])
+                self._ids.append([term_id for _, _, term_id in block])
+                self._maxes.append(block[-1][0])
+            self._size = len(entries)
+        logger.info(f"Построен индекс подсказок: {self._size} имен")
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def apply(self, changes: List[TermChange]) -> None:
+        """
+        Применение изменений набора данных
+        
+        Args:
+            changes: Изменения в порядке фиксации
+        """
+        with self._lock:
+            for change in changes:
+                if change.previous_name is not None:
+                    self._remove(normalize_name(change.previous_name))
+                if change.term is not None:
+                    self._insert(change.term.name, change.term_id)
+    
+    def _insert(self, name: str, term_id: int) -> None:
+        """Вставка имени с сохранением порядка"""
+        key = normalize_name(name)
+        if not self._maxes:
+            self._keys.append([key])
+            self._names.append([name])
+            self._ids.append([term_id])
+            self._maxes.append(key)
+            self._size += 1
+            return
+        
+        block = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        keys = self._keys[block]
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            self._names[block][position] = name
+            self._ids[block][position] = term_id
+            return
+        keys.insert(position, key)
+        self._names[block].insert(position, name)
+        self._ids[block].insert(position, term_id)
+        self._maxes[block] = keys[-1]
+        self._size += 1
+        
+        if len(keys) > 2 * self.BLOCK_SIZE:
+            # Переполненный блок делится пополам
+            half = len(keys) // 2
+            for blocks in (self._keys, self._names, self._ids):
+                blocks.insert(block + 1, blocks[block][half:])
+                del blocks[block][half:]
+            self._maxes.insert(block, self._keys[block][-1])
+    
+    def _remove(self, key: str) -> None:
+        """Удаление имени по ключу, если оно есть"""
+        block = bisect_left(self._maxes, key)
+        if block == len(self._maxes):
+            return
+        keys = self._keys[block]
+        position = bisect_left(keys, key)
+        if position == len(keys) or keys[position] != key:
+            return
+        del keys[position]
+        del self._names[block][position]
+        del self._ids[block][position]
+        self._size -= 1
+        if keys:
+            self._maxes[block] = keys[-1]
+        else:
+            for blocks in (self._keys, self._names, self._ids, self._maxes):
+                del blocks[block]
+    
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """
+        Имена терминов, начинающиеся с префикса
+        
+        Args:
+            prefix: Начало имени (без учета регистра)
+            limit: Максимальное количество подсказок
+        Returns:
+            List[Tuple[int, str]]: (ID, имя) в алфавитном порядке
+        """
+        key = normalize_name(prefix)
+        result: List[Tuple[int, str]] = []
+        with self._lock:
+            block = bisect_left(self._maxes, key)
+            position = bisect_left(self._keys[block], key) if block < len(self._maxes) else 0
+            while block < len(self._maxes) and len(result) < limit:
+                keys = self._keys[block]
+                end = min(len(keys), position + limit - len(result))
+                for i in range(position, end):
+                    if not keys[i].startswith(key):
+                        return result
+                    result.append((self._ids[block][i], self._names[block][i]))
+                block += 1
+                position = 0
+        return result
@@ -0,0 +1,83 @@
+"""Модуль с групповой фиксацией изменений от параллельных вызовов"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+
+from dictionary_service.database.db import DictionaryDB
+from dictionary_service.models.write import TermWrite, WriteResult
+
+logger = logging.getLogger(__name__)
+
+class WriteCoalescer:
+    """
+    Объединение изменений параллельных вызовов в общие транзакции
+
+    Изменения ставятся в очередь, отдельный поток записывает их через
+    DictionaryDB.apply_writes пакетами: пакет закрывается через window
+    секунд после первого изменения или по достижении max_batch изменений.
+    Каждый вызывающий поток ждет и получает результат своего изменения,
+    поэтому одна транзакция и одна фиксация приходятся на весь пакет.
+    """
+
+    def __init__(self, db: DictionaryDB, window: float = 0.002, max_batch: int = 64):
+        """
+        Инициализация и запуск потока записи
+
+        Args:
+            db: База данных словаря
+            window: Время накопления пакета в секундах
+            max_batch: Максимальное количество изменений в пакете
+        """
+        self.db = db
+        self.window = max(0.0, window)
+        self.max_batch = max(1, max_batch)
+        self.batches = 0
+        self.writes = 0
+        self._queue: 'queue.Queue[Tuple[TermWrite, Future]]' = queue.Queue()
+        threading.Thread(target=self._run, name='dictionary-writer', daemon=True).start()
+
+    def submit(self, write: TermWrite) -> WriteResult:
+        """
+        Запись изменения в составе ближайшего пакета
+
+        Args:
+            write: Изменение
+        Returns:
+            WriteResult: (успех, сообщение, ID термина)
+        """
+        future: Future = Future()
+        self._queue.put((write, future))
+        return future.result()
+
+    def _next_batch(self) -> List[Tuple[TermWrite, Future]]:
+        """Ожидание первого изменения и накопление пакета"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Цикл потока записи"""
+        while True:
+            batch = self._next_batch()
+            try:
+                results = self.db.apply_writes([write for write, _ in batch])
+            except Exception as e:
+                logger.error(f"Ошибка при групповой записи {len(batch)} изменений: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.writes += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,331 @@
+"""
+Асинхронный режим веб-сервиса словаря
+
+Те же страницы и API, что и в web_service.py, на Quart (асинхронный
+аналог Flask с тем же API) с клиентом grpc.aio. Обработчик не занимает
+поток, пока ждет ответа сервиса словаря, поэтому число одновременных
+запросов не ограничено пулом потоков веб-сервера. Параметры каналов,
+разбор запросов, формирование JSON, обработка ошибок и сжатие - общие
+функции из web_service.py; здесь только асинхронные вызовы сервиса.
+
+Запуск:
+    python async_web_service.py
+    hypercorn async_web_service:app --bind 0.0.0.0:5000
+"""
+
+import logging
+from functools import wraps
+from typing import List, Optional, Tuple, Union
+
+import grpc
+from quart import Quart, Response, jsonify, render_template, request, send_from_directory
+from quart_cors import cors
+
+import dictionary_pb2
+import dictionary_pb2_grpc
+from web_service import (
+    COMPRESSION, PROTOBUF_MIMETYPE, Config, ApiCall, api_error, error_page,
+    full_list_requested, grpc_channel_options, grpc_target, graph_json, list_terms_request,
+    mindmap_options, requested_version, response_encoding, set_compressed,
+    set_version_headers, terms_page_json, term_from_json, update_json, write_json, write_status,
+    FACETS_CALL, LIST_TERMS_CALL, NEIGHBORHOOD_CALL, SEARCH_CALL, SUGGEST_CALL, TERM_CALL
+)
+
+logger = logging.getLogger(__name__)
+
+app = cors(Quart(__name__), allow_origin='*')
+
+class AsyncGrpcClient:
+    """
+    Пул каналов grpc.aio к сервису словаря
+
+    Каналы привязаны к циклу событий, поэтому создаются при первом
+    запросе, а закрываются при остановке приложения.
+    """
+    _channels: List[grpc.aio.Channel] = []
+    _stubs: List[dictionary_pb2_grpc.DictionaryServiceStub] = []
+    _next = 0
+
+    @classmethod
+    def _next_index(cls) -> int:
+        """Номер следующего канала пула"""
+        if not cls._channels:
+            cls._channels = [
+                grpc.aio.insecure_channel(
+                    grpc_target(),
+                    options=grpc_channel_options(),
+                    compression=COMPRESSION[Config.GRPC_COMPRESSION]
+                )
+                for _ in range(max(1, Config.GRPC_CHANNELS))
+            ]
+            cls._stubs = [dictionary_pb2_grpc.DictionaryServiceStub(channel)
+                          for channel in cls._channels]
+        cls._next = (cls._next + 1) % len(cls._channels)
+        return cls._next
+
+    @classmethod
+    def get_instance(cls) -> dictionary_pb2_grpc.DictionaryServiceStub:
+        """Получение заглушки следующего канала пула"""
+        index = cls._next_index()
+        return cls._stubs[index]
+
+    @classmethod
+    def get_raw_method(cls, method: str, request_type) -> grpc.aio.UnaryUnaryMultiCallable:
+        """Вызов метода без разбора ответа (см. web_service.GrpcClient.get_raw_method)"""
+        index = cls._next_index()
+        return cls._channels[index].unary_unary(
+            f'/dictionary.DictionaryService/{method}',
+            request_serializer=request_type.SerializeToString
+        )
+
+    @classmethod
+    async def close(cls) -> None:
+        """Закрытие каналов пула"""
+        for channel in cls._channels:
+            await channel.close()
+        cls._channels = []
+        cls._stubs = []
+
+@app.after_serving
+async def close_grpc_channels() -> None:
+    """Закрытие каналов к сервису словаря при остановке"""
+    await AsyncGrpcClient.close()
+
+@app.after_request
+async def compress_response(response: Response) -> Response:
+    """Сжатие ответов по Accept-Encoding (см. web_service.compress_response)"""
+    encoding = response_encoding(response, request.accept_encodings)
+    if encoding is not None:
+        set_compressed(response, await response.get_data(), encoding)
+    return response
+
+def handle_grpc_error(f):
+    """Декоратор для обработки gRPC ошибок (см. web_service.handle_grpc_error)"""
+    @wraps(f)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await f(*args, **kwargs)
+        except Exception as e:
+            template, context = error_page(e, f.__name__, kwargs.get('name', 'Unknown'))
+            return await render_template(template, **context)
+    return wrapper
+
+async def current_version() -> Optional[int]:
+    """Версия набора данных для заголовка ETag (см. web_service.current_version)"""
+    try:
+        return (await AsyncGrpcClient.get_instance().GetVersion(
+            dictionary_pb2.VersionRequest(), timeout=Config.GRPC_TIMEOUT
+        )).version
+    except grpc.RpcError as e:
+        logger.warning(f"Не удалось получить версию данных для ETag: {e.code()}")
+        return None
+
+def conditional_response(f):
+    """Декоратор: ETag по версии набора данных и 304 (см. web_service.conditional_response)"""
+    @wraps(f)
+    async def wrapper(*args, **kwargs):
+        version = await current_version()
+        if version and requested_version(request.if_none_match) == version:
+            response = Response('', status=304)
+        else:
+            response = await app.make_response(await f(*args, **kwargs))
+            if not version or response.status_code != 200:
+                return response
+        set_version_headers(response, version)
+        return response
+    return wrapper
+
+async def call_api(call: ApiCall, **view_args) -> Tuple[Response, int]:
+    """Выполнение читающего JSON endpoint (см. web_service.call_api)"""
+    call_request = None
+    try:
+        call_request = call.request(request.args, **view_args)
+        response = await getattr(AsyncGrpcClient.get_instance(), call.method)(
+            call_request, timeout=Config.GRPC_TIMEOUT
+        ) if call_request is not None else None
+    except (ValueError, grpc.RpcError) as e:
+        body, status = api_error(e, call.method, call_request, call.not_found)
+        return jsonify(body), status
+    return jsonify(call.json(call_request, response)), 200
+
+@app.route('/static/<path:path>')
+async def send_static(path: str) -> Response:
+    """Отправка статических файлов"""
+    return await send_from_directory('static', path)
+
+@app.route('/')
+@conditional_response
+async def index() -> str:
+    """Главная страница со списком терминов"""
+    return await render_template('database.html', page_size=Config.TERMS_PAGE_SIZE,
+                                 transport=Config.TERMS_TRANSPORT)
+
+@app.route('/term/<name>')
+@handle_grpc_error
+async def get_term(name: str) -> str:
+    """
+    Страница с определением термина
+
+    Args:
+        name: Имя термина
+    Returns:
+        str: HTML страница с определением термина
+    """
+    stub = AsyncGrpcClient.get_instance()
+    response = await stub.GetDefinition(
+        dictionary_pb2.TermRequest(name=name), timeout=Config.GRPC_TIMEOUT
+    )
+    missing = set()
+    if response.term.related_terms:
+        related = await stub.GetTermsByNames(
+            dictionary_pb2.TermsByNamesRequest(names=response.term.related_terms),
+            timeout=Config.GRPC_TIMEOUT
+        )
+        missing = set(related.missing)
+    return await render_template('term.html', term=response.term, missing_related=missing)
+
+@app.route('/api/terms', methods=['GET'])
+async def list_terms() -> Union[Response, tuple[Response, int]]:
+    """API endpoint для постраничного получения терминов (см. web_service.list_terms)"""
+    if not full_list_requested(request.args):
+        return await list_terms_page()
+    try:
+        terms_request = list_terms_request(request.args)
+        terms_request.if_version = requested_version(request.if_none_match)
+        terms = await AsyncGrpcClient.get_instance().ListTerms(
+            terms_request, timeout=Config.GRPC_TIMEOUT
+        )
+    except (ValueError, grpc.RpcError) as e:
+        error, status = api_error(e, 'ListTerms')
+        return jsonify(error), status
+    # Как и в get_graph, версии сравнивает сервис словаря
+    if terms.not_modified:
+        response = Response('', status=304)
+    else:
+        response = jsonify(terms_page_json(terms, terms_request.include_total))
+    if terms.version:
+        set_version_headers(response, terms.version, terms.modified_at)
+    return response
+
+@conditional_response
+async def list_terms_page() -> tuple[Response, int]:
+    """Страница терминов /api/terms"""
+    return await call_api(LIST_TERMS_CALL)
+
+@app.route('/api/terms.pb', methods=['GET'])
+@conditional_response
+async def list_terms_protobuf() -> tuple[Response, int]:
+    """API endpoint со страницей терминов в формате protobuf (см. web_service.list_terms_protobuf)"""
+    try:
+        terms_request = list_terms_request(request.args)
+        body = await AsyncGrpcClient.get_raw_method('ListTerms', dictionary_pb2.ListTermsRequest)(
+            terms_request, timeout=Config.GRPC_TIMEOUT
+        )
+    except (ValueError, grpc.RpcError) as e:
+        error, status = api_error(e, 'ListTerms')
+        return jsonify(error), status
+    return Response(body, mimetype=PROTOBUF_MIMETYPE), 200
+
+@app.route('/api/facets')
+async def list_facets() -> tuple[Response, int]:
+    """API endpoint со значениями для фильтров таблицы терминов"""
+    return await call_api(FACETS_CALL)
+
+@app.route('/api/terms', methods=['POST'])
+@handle_grpc_error
+async def add_term() -> tuple[Response, int]:
+    """API endpoint для добавления термина"""
+    term = term_from_json(await request.get_json())
+    response = await AsyncGrpcClient.get_instance().AddTerm(
+        dictionary_pb2.AddTermRequest(term=term), timeout=Config.GRPC_TIMEOUT
+    )
+    return jsonify(write_json(response)), write_status(response)
+
+@app.route('/api/terms/<int:term_id>', methods=['PUT'])
+@handle_grpc_error
+async def update_term(term_id: int) -> tuple[Response, int]:
+    """
+    API endpoint для обновления термина
+
+    Args:
+        term_id: ID термина для обновления
+    Returns:
+        tuple[Response, int]: JSON ответ и HTTP статус
+    """
+    term = term_from_json(await request.get_json())
+    response = await AsyncGrpcClient.get_instance().UpdateTerm(
+        dictionary_pb2.UpdateTermRequest(id=term_id, term=term), timeout=Config.GRPC_TIMEOUT
+    )
+    return jsonify(update_json(response)), write_status(response)
+
+@app.route('/api/terms/<int:term_id>', methods=['DELETE'])
+@handle_grpc_error
+async def delete_term(term_id: int) -> tuple[Response, int]:
+    """
+    API endpoint для удаления термина
+
+    Args:
+        term_id: ID термина для удаления
+    Returns:
+        tuple[Response, int]: JSON ответ и HTTP статус
+    """
+    response = await AsyncGrpcClient.get_instance().DeleteTerm(
+        dictionary_pb2.DeleteTermRequest(id=term_id), timeout=Config.GRPC_TIMEOUT
+    )
+    return jsonify(write_json(response)), write_status(response)
+
+@app.route('/api/terms/<name>', methods=['GET'])
+async def get_term_json(name: str) -> tuple[Response, int]:
+    """
+    API endpoint для получения одного термина по имени
+
+    Args:
+        name: Имя термина
+    Returns:
+        tuple[Response, int]: JSON термина и HTTP статус
+    """
+    return await call_api(TERM_CALL, name=name)
+
+@app.route('/api/search')
+async def search_terms() -> tuple[Response, int]:
+    """API endpoint полнотекстового поиска терминов (см. web_service.search_terms)"""
+    return await call_api(SEARCH_CALL)
+
+@app.route('/api/suggest')
+async def suggest_terms() -> tuple[Response, int]:
+    """API endpoint подсказок имен терминов по префиксу"""
+    return await call_api(SUGGEST_CALL)
+
+@app.route('/api/graph')
+async def get_graph() -> Response:
+    """API endpoint с графом связей для майндмапа (см. web_service.get_graph)"""
+    try:
+        graph = await AsyncGrpcClient.get_instance().GetGraph(
+            dictionary_pb2.GetGraphRequest(if_version=requested_version(request.if_none_match)),
+            timeout=Config.GRPC_TIMEOUT
+        )
+    except grpc.RpcError as e:
+        error, status = api_error(e, 'GetGraph')
+        return jsonify(error), status
+    # Сервис сам сравнивает версии, поэтому 304 формируется без make_conditional
+    response = Response('', status=304) if graph.not_modified else jsonify(graph_json(graph))
+    set_version_headers(response, graph.version)
+    return response
+
+@app.route('/api/neighborhood')
+async def get_neighborhood() -> tuple[Response, int]:
+    """API endpoint с окрестностью термина для майндмапа"""
+    return await call_api(NEIGHBORHOOD_CALL)
+
+@app.route('/mindmap')
+@conditional_response
+async def mindmap() -> str:
+    """Страница с визуализацией связей между терминами"""
+    return await render_template('mindmap.html', options=mindmap_options(request.args))
+
+if __name__ == '__main__':
+    app.run(
+        host=Config.HOST,
+        port=Config.PORT,
+        debug=Config.DEBUG
+    )
@@ -0,0 +1,70 @@
+"""Модуль со сжатием HTTP ответов по заголовку Accept-Encoding"""
+
+import gzip
+import logging
+from typing import Iterable, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Типы содержимого, которые сжимаются (изображения и шрифты уже сжаты)
+COMPRESSIBLE_TYPES = frozenset((
+    'text/html', 'text/css', 'text/plain', 'application/json',
+    'application/javascript', 'application/x-protobuf'
+))
+
+GZIP_LEVEL = 6
+# Ответы сжимаются на каждый запрос, поэтому качество brotli ниже
+# максимального 11: на уровне 5 скорость сравнима с gzip -6 при лучшем сжатии
+BROTLI_QUALITY = 5
+
+def available_encodings(preferred: Iterable[str]) -> List[str]:
+    """
+    Кодировки, которые может использовать сервер
+
+    Args:
+        preferred: Кодировки в порядке предпочтения (br, gzip)
+    Returns:
+        List[str]: Поддерживаемые из них; br - только при установленном
+            пакете brotli (входит в requirements.txt)
+    """
+    encodings = []
+    for encoding in preferred:
+        encoding = encoding.strip().lower()
+        if encoding == 'br' and brotli is None:
+            logger.warning("Сжатие br отключено: пакет brotli не установлен")
+        elif encoding in ('gzip', 'br'):
+            encodings.append(encoding)
+    return encodings
+
+def choose_encoding(accept_encodings, encodings: List[str]) -> Optional[str]:
+    """
+    Выбор кодировки ответа
+
+    Args:
+        accept_encodings: Разобранный заголовок Accept-Encoding
+            (request.accept_encodings)
+        encodings: Кодировки сервера в порядке предпочтения
+    Returns:
+        Optional[str]: Кодировка с наибольшим весом у клиента (при равных -
+            первая у сервера) или None, если сжатие клиент не принимает
+    """
+    return accept_encodings.best_match(encodings) if encodings else None
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Сжатие тела ответа
+
+    Args:
+        data: Тело ответа
+        encoding: Кодировка из choose_encoding
+    Returns:
+        bytes: Сжатое тело
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
@@ -0,0 +1,256 @@
+"""Модуль с кешем готовых HTTP ответов веб-сервиса"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Закешированный ответ: (тело, HTTP статус, Content-Type)
+CachedResponse = Tuple[bytes, int, str]
+
+class MemoryBackend:
+    """Хранилище в памяти процесса с ограничением по количеству и времени жизни"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 1000):
+        """
+        Инициализация хранилища
+
+        Args:
+            max_entries: Максимальное количество ответов (вытесняются давно
+                не запрошенные)
+        """
+        self.max_entries = max(1, max_entries)
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, Tuple[float, CachedResponse]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Ответ по ключу или None, если его нет или время жизни истекло"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        """Сохранение ответа на ttl секунд"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Удаление всех ответов"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class RedisBackend:
+    """
+    Хранилище в Redis или совместимом сервере, общее для процессов веб-сервиса
+
+    Время жизни задается EXPIRE, вытеснение при нехватке памяти - политикой
+    сервера (maxmemory-policy allkeys-lru). clear и __len__ работают со
+    всеми ключами с префиксом хранилища, как MemoryBackend со своими ответами.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str, prefix: str = 'web-cache:'):
+        """
+        Инициализация хранилища
+
+        Args:
+            url: Адрес сервера (redis://host:port/db); fakeredis:// - хранилище
+                в памяти процесса из пакета fakeredis для локального запуска
+            prefix: Префикс ключей
+        Raises:
+            RuntimeError: Если пакет redis (или fakeredis) не установлен
+        """
+        try:
+            if url.startswith('fakeredis://'):
+                import fakeredis
+                self._client = fakeredis.FakeStrictRedis()
+            else:
+                import redis
+                self._client = redis.Redis.from_url(url)
+        except ImportError as e:
+            raise RuntimeError(f"Для кеша в Redis нужен пакет {e.name}")
+        self.prefix = prefix
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Ответ по ключу или None"""
+        fields = self._client.hmget(self.prefix + key, 'body', 'status', 'content_type')
+        if fields[0] is None:
+            return None
+        return fields[0], int(fields[1]), fields[2].decode()
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        """Сохранение ответа на ttl секунд"""
+        body, status, content_type = value
+        pipeline = self._client.pipeline()
+        pipeline.hset(self.prefix + key, mapping={
+            'body': body, 'status': status, 'content_type': content_type
+        })
+        pipeline.pexpire(self.prefix + key, max(1, int(ttl * 1000)))
+        pipeline.execute()
+
+    # Количество ключей в одной команде SCAN и UNLINK
+    SCAN_COUNT = 1000
+
+    def clear(self) -> None:
+        """Удаление всех ответов с префиксом хранилища"""
+        keys = []
+        for key in self._client.scan_iter(match=self.prefix + '*', count=self.SCAN_COUNT):
+            keys.append(key)
+            if len(keys) >= self.SCAN_COUNT:
+                self._client.unlink(*keys)
+                keys = []
+        if keys:
+            self._client.unlink(*keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=self.prefix + '*',
+                                                     count=self.SCAN_COUNT))
+
+class ResponseCache:
+    """
+    Кеш отрендеренных страниц и JSON ответов
+
+    Ключ состоит из версии набора данных, пути и параметров запроса,
+    поэтому после любого изменения данных ответы строятся заново. Версию
+    сообщает подписка на изменения (см. set_version); пока она неизвестна
+    или только что изменена этим процессом, кеш не используется.
+    """
+
+    def __init__(self, backend, ttl: float = 30.0):
+        """
+        Инициализация кеша
+
+        Args:
+            backend: Хранилище (MemoryBackend или RedisBackend)
+            ttl: Время жизни ответа в секундах
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.version: Optional[int] = None
+        # Версия, ответы которой устарели из-за записи этим процессом
+        self._stale_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Можно ли сейчас читать и сохранять ответы"""
+        return self.version is not None and self.version != self._stale_version
+
+    def key(self, path: str, args: Iterable[Tuple[str, str]]) -> str:
+        """
+        Ключ ответа для текущей версии
+
+        Args:
+            path: Путь запроса
+            args: Пары параметров строки запроса (порядок не важен)
+        Returns:
+            str: Ключ для get и put
+        """
+        query = '&'.join(f'{name}={value}' for name, value in sorted(args))
+        return f"v{self.version}:{path}?{query}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Получение ответа
+
+        Args:
+            key: Ключ из key()
+        Returns:
+            Optional[CachedResponse]: Ответ или None при промахе
+        """
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Ошибка чтения кеша ответов: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key: str, value: CachedResponse) -> None:
+        """Сохранение ответа"""
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            logger.error(f"Ошибка записи в кеш ответов: {e}")
+
+    def _clear(self) -> None:
+        """Удаление ответов; ошибка хранилища не прерывает смену версии"""
+        try:
+            self.backend.clear()
+        except Exception as e:
+            logger.error(f"Ошибка очистки кеша ответов: {e}")
+
+    def set_version(self, version: Optional[int]) -> None:
+        """
+        Текущая версия набора данных
+
+        Args:
+            version: Версия или None, если подписка на изменения прервана
+        """
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self._clear()
+
+    def invalidate(self, version: Optional[int]) -> None:
+        """
+        Инвалидация после успешной записи через этот процесс
+
+        Событие об изменении может прийти позже ответа сервиса, поэтому кеш
+        отключается, пока версия остается той, что была до записи.
+
+        Args:
+            version: Версия, прочитанная до записи
+        """
+        with self._lock:
+            if version is not None and version == self.version:
+                self._stale_version = version
+                self._clear()
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Счетчики кеша
+
+        Returns:
+            Dict[str, object]: Хранилище, попадания, промахи, доля попаданий,
+                вытеснения, размер и текущая версия
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'backend': self.backend.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / requests, 4) if requests else 0.0,
+                'evictions': self.backend.evictions,
+                'size': len(self.backend),
+                'version': self.version
+            }
@@ -7,7 +7,7 @@ function addRelatedTerm(relatedTerm = '', relationType = '') {
         <div class="row">
             <div class="col-5">
                 <input type="text" class="form-control form-control-sm related-term" 
-                       placeholder="Связанный термин" value="${relatedTerm}">
+                       list="termSuggestions" autocomplete="off" placeholder="Связанный термин" value="${relatedTerm}">
             </div>
             <div class="col-5">
                 <input type="text" class="form-control form-control-sm relation-type" 
@@ -49,9 +49,9 @@ function getRelatedTermsData() {
 }
 
 function editTerm(termId) {
-    const term = Array.from(document.querySelectorAll('tr')).find(
-        row => row.querySelector('td')?.textContent === termId
-    );
+    // Форма заполняется из полных данных загруженной страницы, а не из
+    // ячеек таблицы, где определение сокращено
+    const term = tableState.terms.get(Number(termId));
     if (!term) return;
 
     // Очищаем контейнер связанных терминов
@@ -59,24 +59,13 @@ function editTerm(termId) {
     
     // Заполняем форму данными
     document.getElementById('editTermId').value = termId;
-    document.getElementById('editName').value = term.children[1].textContent.trim();
-    document.getElementById('editDefinition').value = term.children[2].textContent.trim();
-    document.getElementById('editSource').value = term.children[4].textContent.trim();
+    document.getElementById('editName').value = term.name;
+    document.getElementById('editDefinition').value = term.definition;
+    document.getElementById('editSource').value = term.source;
 
     // Добавляем поля для связанных терминов
-    const relatedTerms = Array.from(term.children[3].querySelectorAll('.badge'))
-        .map(badge => badge.textContent.trim());
-    
-    // Получаем данные о связях из атрибутов
-    const relations = {};
-    term.children[3].querySelectorAll('.badge').forEach(badge => {
-        const relatedTerm = badge.textContent.trim();
-        const relationType = badge.getAttribute('data-relation-type') || '';
-        relations[relatedTerm] = relationType;
-    });
-    
-    relatedTerms.forEach(relatedTerm => {
-        addRelatedTerm(relatedTerm, relations[relatedTerm] || '');
+    term.related_terms.forEach(relatedTerm => {
+        addRelatedTerm(relatedTerm, term.relations[relatedTerm] || '');
     });
 
     new bootstrap.Modal(document.getElementById('editModal')).show();
@@ -104,7 +93,8 @@ function saveEdit() {
     .then(response => response.json())
     .then(data => {
         if (data.success) {
-            location.reload();
+            bootstrap.Modal.getInstance(document.getElementById('editModal'))?.hide();
+            reloadTable();
         } else {
             alert(data.message);
         }
@@ -123,7 +113,7 @@ function deleteTerm(termId) {
         .then(response => response.json())
         .then(data => {
             if (data.success) {
-                location.reload();
+                reloadTable();
             } else {
                 alert(data.message);
             }
@@ -153,7 +143,7 @@ function addRelatedTermToNew() {
         <div class="row">
             <div class="col-5">
                 <input type="text" class="form-control form-control-sm related-term" 
-                       placeholder="Связанный термин">
+                       list="termSuggestions" autocomplete="off" placeholder="Связанный термин">
             </div>
             <div class="col-5">
                 <input type="text" class="form-control form-control-sm relation-type" 
@@ -206,7 +196,8 @@ function saveNewTerm() {
     .then(response => response.json())
     .then(data => {
         if (data.success) {
-            location.reload();
+            bootstrap.Modal.getInstance(document.getElementById('addModal'))?.hide();
+            reloadTable();
         } else {
             alert(data.message);
         }
@@ -215,4 +206,241 @@ function saveNewTerm() {
         console.error('Error:', error);
         alert('Произошла ошибка при создании термина');
     });
-} 
\ No newline at end of file
+} 
+function renderSearchResults(container, data) {
+    if (!data.hits.length) {
+        container.innerHTML = '<div class="list-group-item text-muted">Ничего не найдено</div>';
+        return;
+    }
+    // name_html и snippet_html уже экранированы сервером, совпадения в <mark>
+    container.innerHTML = data.hits.map(hit => `
+        <a class="list-group-item list-group-item-action" href="/term/${encodeURIComponent(hit.name)}">
+            <div class="fw-bold">${hit.name_html}</div>
+            <small class="text-muted">${hit.snippet_html}</small>
+        </a>
+    `).join('');
+}
+
+function initSearch() {
+    const input = document.getElementById('searchInput');
+    const container = document.getElementById('searchResults');
+    if (!input || !container) return;
+    
+    let timer = null;
+    let controller = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const query = input.value.trim();
+        if (!query) {
+            container.classList.add('d-none');
+            container.innerHTML = '';
+            return;
+        }
+        // Запрос отправляется после паузы в наборе, предыдущий отменяется
+        timer = setTimeout(() => {
+            if (controller) controller.abort();
+            controller = new AbortController();
+            fetch(`/api/search?q=${encodeURIComponent(query)}&limit=10`, { signal: controller.signal })
+                .then(response => response.json())
+                .then(data => {
+                    container.classList.remove('d-none');
+                    renderSearchResults(container, data);
+                })
+                .catch(error => {
+                    if (error.name !== 'AbortError') {
+                        console.error('Error:', error);
+                    }
+                });
+        }, 200);
+    });
+}
+
+function initSuggestions() {
+    const datalist = document.getElementById('termSuggestions');
+    if (!datalist) return;
+    
+    // Поля связанных терминов создаются динамически, поэтому подписка
+    // выполняется на документ
+    let timer = null;
+    let controller = null;
+    document.addEventListener('input', event => {
+        if (!event.target.classList.contains('related-term')) return;
+        clearTimeout(timer);
+        const prefix = event.target.value.trim();
+        if (!prefix) {
+            datalist.innerHTML = '';
+            return;
+        }
+        timer = setTimeout(() => {
+            if (controller) controller.abort();
+            controller = new AbortController();
+            fetch(`/api/suggest?prefix=${encodeURIComponent(prefix)}&limit=10`, { signal: controller.signal })
+                .then(response => response.json())
+                .then(data => {
+                    datalist.innerHTML = '';
+                    (data.suggestions || []).forEach(suggestion => {
+                        const option = document.createElement('option');
+                        option.value = suggestion.name;
+                        datalist.appendChild(option);
+                    });
+                })
+                .catch(error => {
+                    if (error.name !== 'AbortError') {
+                        console.error('Error:', error);
+                    }
+                });
+        }, 100);
+    });
+}
+
+// Состояние таблицы: токены уже пройденных страниц позволяют вернуться назад
+const tableState = {
+    pageSize: 50,
+    // json - /api/terms, protobuf - /api/terms.pb (разбор в terms_pb.js)
+    transport: 'json',
+    tokens: [''],
+    page: 0,
+    total: null,
+    terms: new Map()
+};
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text == null ? '' : String(text);
+    return div.innerHTML;
+}
+
+function tableQuery(pageToken) {
+    const params = new URLSearchParams({ page_size: tableState.pageSize });
+    const sort = document.getElementById('sortSelect').value;
+    const source = document.getElementById('sourceFilter').value;
+    const relationType = document.getElementById('relationFilter').value;
+    if (sort) params.set('sort', sort);
+    params.set('order', document.getElementById('orderSelect').value);
+    if (source) params.set('source', source);
+    if (relationType) params.set('relation_type', relationType);
+    if (pageToken) {
+        params.set('page_token', pageToken);
+    } else {
+        // Общее количество считается только для первой страницы
+        params.set('total', '1');
+    }
+    return params;
+}
+
+function renderTermRow(term) {
+    const definition = term.definition.length > 100
+        ? `${escapeHtml(term.definition.slice(0, 100))}...`
+        : escapeHtml(term.definition);
+    const related = term.related_terms.map(name => {
+        const relation = term.relations[name];
+        return `
+            <span class="badge bg-secondary" data-relation-type="${escapeHtml(relation || '')}">
+                ${escapeHtml(name)}
+                ${relation ? `<small>(${escapeHtml(relation)})</small>` : ''}
+            </span>`;
+    }).join('');
+    return `
+        <tr>
+            <td>${term.id}</td>
+            <td><a href="/term/${encodeURIComponent(term.name)}">${escapeHtml(term.name)}</a></td>
+            <td>${definition}</td>
+            <td><small>${related}</small></td>
+            <td><small>${escapeHtml(term.source)}</small></td>
+            <td><small>${escapeHtml(term.created_at)}</small></td>
+            <td><small>${escapeHtml(term.updated_at)}</small></td>
+            <td>
+                <div class="btn-group btn-group-sm">
+                    <button class="btn btn-outline-primary" onclick="editTerm('${term.id}')">
+                        <i class="bi bi-pencil"></i>
+                    </button>
+                    <button class="btn btn-outline-danger" onclick="deleteTerm('${term.id}')">
+                        <i class="bi bi-trash"></i>
+                    </button>
+                </div>
+            </td>
+        </tr>`;
+}
+
+function fetchTermsPage(query) {
+    if (tableState.transport !== 'protobuf') {
+        return fetch(`/api/terms?${query}`).then(response => response.json());
+    }
+    return fetch(`/api/terms.pb?${query}`).then(response => {
+        // Ошибки endpoint возвращает в JSON
+        if (!response.ok) return response.json();
+        return response.arrayBuffer().then(decodeTermsPage);
+    });
+}
+
+function loadPage(page) {
+    fetchTermsPage(tableQuery(tableState.tokens[page]))
+        .then(data => {
+            if (data.error) {
+                throw new Error(data.error);
+            }
+            tableState.page = page;
+            tableState.tokens = tableState.tokens.slice(0, page + 1);
+            if (data.next_page_token) {
+                tableState.tokens.push(data.next_page_token);
+            }
+            if (data.total !== undefined) {
+                tableState.total = data.total;
+            }
+            tableState.terms = new Map(data.terms.map(term => [term.id, term]));
+            
+            document.getElementById('termsBody').innerHTML = data.terms.map(renderTermRow).join('');
+            document.getElementById('prevPage').disabled = page === 0;
+            document.getElementById('nextPage').disabled = !data.next_page_token;
+            const first = page * tableState.pageSize + 1;
+            const last = page * tableState.pageSize + data.terms.length;
+            document.getElementById('pageInfo').textContent = data.terms.length
+                ? `${first}–${last} из ${tableState.total ?? '?'}`
+                : 'Нет терминов';
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            document.getElementById('pageInfo').textContent = 'Не удалось загрузить термины';
+        });
+}
+
+function reloadTable() {
+    // После изменения данных или фильтров таблица начинается с первой страницы
+    tableState.tokens = [''];
+    loadPage(0);
+}
+
+function fillSelect(select, values) {
+    values.forEach(value => {
+        const option = document.createElement('option');
+        option.value = value;
+        option.textContent = value;
+        select.appendChild(option);
+    });
+}
+
+function initTable() {
+    const body = document.getElementById('termsBody');
+    if (!body) return;
+    tableState.pageSize = Number(body.dataset.pageSize) || tableState.pageSize;
+    tableState.transport = body.dataset.transport || tableState.transport;
+    
+    ['sortSelect', 'orderSelect', 'sourceFilter', 'relationFilter'].forEach(id => {
+        document.getElementById(id).addEventListener('change', reloadTable);
+    });
+    document.getElementById('prevPage').addEventListener('click', () => loadPage(tableState.page - 1));
+    document.getElementById('nextPage').addEventListener('click', () => loadPage(tableState.page + 1));
+    
+    fetch('/api/facets')
+        .then(response => response.json())
+        .then(data => {
+            fillSelect(document.getElementById('sourceFilter'), data.sources || []);
+            fillSelect(document.getElementById('relationFilter'), data.relation_types || []);
+        })
+        .catch(error => console.error('Error:', error));
+    loadPage(0);
+}
+
+document.addEventListener('DOMContentLoaded', initTable);
+document.addEventListener('DOMContentLoaded', initSearch);
+document.addEventListener('DOMContentLoaded', initSuggestions);
@@ -1,192 +1,343 @@
-function initMindmap(terms) {
-    console.log('Terms data:', terms);  // Для отладки
+const MINDMAP_STYLE = [
+    {
+        selector: 'node',
+        style: {
+            'label': 'data(label)',
+            'text-wrap': 'wrap',
+            'text-max-width': '100px',
+            'font-size': '12px',
+            'text-valign': 'center',
+            'text-halign': 'center',
+            'background-color': '#4CAF50',
+            'width': '120px',
+            'height': '40px',
+            'shape': 'roundrectangle'
+        }
+    },
+    {
+        selector: 'node[type="related"]',
+        style: {
+            'background-color': '#2196F3'
+        }
+    },
+    {
+        selector: 'node[hidden > 0]',
+        style: {
+            'border-width': 3,
+            'border-color': '#FF9800'
+        }
+    },
+    {
+        selector: 'node[type="cluster"]',
+        style: {
+            'background-color': '#FFC107',
+            'shape': 'ellipse',
+            'width': '60px',
+            'height': '60px'
+        }
+    },
+    {
+        selector: 'edge',
+        style: {
+            'width': 2,
+            'line-color': '#666',
+            'target-arrow-color': '#666',
+            'target-arrow-shape': 'triangle',
+            'curve-style': 'bezier',
+            'label': 'data(label)',
+            'font-size': '10px',
+            'text-rotation': 'autorotate',
+            'text-margin-y': -10
+        }
+    },
+    {
+        selector: 'edge[type="cluster"]',
+        style: {
+            'line-style': 'dashed',
+            'target-arrow-shape': 'none'
+        }
+    }
+];
+
+function initMindmap(options) {
+    const container = document.getElementById('mindmap');
+    const info = document.getElementById('term-info');
     
-    // Подготовка данных для графа
-    const elements = {
-        nodes: [],
-        edges: []
+    const failed = error => {
+        console.error('Failed to load graph:', error);
+        container.innerHTML = '<div class="alert alert-danger">Не удалось загрузить граф</div>';
     };
     
-    // Создаем узлы
-    const nodeMap = new Map();
+    if (options.focus) {
+        // Только окрестность термина, остальное догружается по клику
+        const params = new URLSearchParams({
+            focus: options.focus,
+            depth: options.depth,
+            max_nodes: options.maxNodes,
+            cluster_size: options.clusterSize
+        });
+        fetchJson(`${options.neighborhoodUrl}?${params}`)
+            .then(graph => renderNeighborhood(container, info, graph, options))
+            .catch(failed);
+        return;
+    }
     
-    // Сначала добавляем все основные термины
-    terms.forEach(term => {
-        if (!term || !term.id || !term.name) {
-            console.error('Invalid term data:', term);
-            return;
+    // Граф приходит параллельными массивами с уже рассчитанными координатами
+    fetchJson(options.graphUrl)
+        .then(graph => renderMindmap(container, info, graph))
+        .catch(failed);
+}
+
+function fetchJson(url) {
+    return fetch(url).then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
         }
-        const normalizedName = term.name.toLowerCase();
-        elements.nodes.push({
+        return response.json();
+    });
+}
+
+function buildElements(graph) {
+    // Узлы и ребра строятся за один проход по массивам без поиска по именам
+    const nodes = graph.nodes;
+    const edges = graph.edges;
+    const elements = new Array(nodes.name.length + edges.source.length);
+    let index = 0;
+    
+    for (let i = 0; i < nodes.name.length; i++) {
+        elements[index++] = {
+            group: 'nodes',
+            data: {
+                id: `n${i}`,
+                label: nodes.name[i],
+                termId: nodes.id[i],
+                type: nodes.id[i] ? 'main' : 'related'
+            },
+            position: { x: nodes.x[i], y: nodes.y[i] }
+        };
+    }
+    for (let j = 0; j < edges.source.length; j++) {
+        elements[index++] = {
+            group: 'edges',
             data: {
-                id: term.id.toString(),
-                label: term.name,
-                normalizedName: normalizedName,
-                definition: term.definition || '',
-                source: term.source || '',
-                type: 'main',
-                created: term.created_at || '',
-                updated: term.updated_at || ''
+                id: `e${j}`,
+                source: `n${edges.source[j]}`,
+                target: `n${edges.target[j]}`,
+                label: graph.relations[edges.relation[j]] || 'связан с'
             }
+        };
+    }
+    return elements;
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+function renderTermInfo(info, term) {
+    let html = `<h6>${escapeHtml(term.name)}</h6>`;
+    if (term.definition) {
+        html += `<p>${escapeHtml(term.definition)}</p>`;
+    }
+    if (term.source) {
+        html += `<p><small class="text-muted">Источник: ${escapeHtml(term.source)}</small></p>`;
+    }
+    if (term.created_at) {
+        html += `
+            <p class="text-muted mb-0"><small>
+                Создан: ${escapeHtml(term.created_at)}<br>
+                Обновлен: ${escapeHtml(term.updated_at)}
+            </small></p>
+        `;
+    }
+    info.innerHTML = html;
+}
+
+function showTermDetails(info, details, label) {
+    // Определение загружается по требованию при выборе узла
+    if (details.has(label)) {
+        renderTermInfo(info, details.get(label));
+        return;
+    }
+    info.innerHTML = `<h6>${escapeHtml(label)}</h6><p class="text-muted">Загрузка...</p>`;
+    fetchJson(`/api/terms/${encodeURIComponent(label)}`)
+        .then(term => {
+            details.set(label, term);
+            renderTermInfo(info, term);
+        })
+        .catch(error => {
+            console.error('Failed to load term:', error);
+            info.innerHTML = `<h6>${escapeHtml(label)}</h6>
+                <p class="text-danger">Не удалось загрузить определение</p>`;
         });
-        nodeMap.set(normalizedName, {
-            id: term.id.toString(),
-            originalName: term.name,
-            type: 'main'
-        });
+}
+
+function showMissingTerm(info, label) {
+    info.innerHTML = `<h6>${escapeHtml(label)}</h6>
+        <p class="text-muted">Термина нет в словаре</p>`;
+}
+
+function renderMindmap(container, info, graph) {
+    const cy = cytoscape({
+        container: container,
+        elements: buildElements(graph),
+        style: MINDMAP_STYLE,
+        // Координаты рассчитаны сервером, раскладка в браузере не выполняется
+        layout: {
+            name: 'preset',
+            fit: true,
+            padding: 50
+        },
+        // На больших графах подписи ребер скрываются при перемещении
+        hideEdgesOnViewport: graph.edges.source.length > 2000,
+        textureOnViewport: graph.nodes.name.length > 2000
     });
-    
-    // Затем добавляем связанные термины, только если они еще не существуют
-    terms.forEach(term => {
-        if (Array.isArray(term.related_terms)) {
-            term.related_terms.forEach(related => {
-                if (!related) return;
-                const relatedLower = related.toLowerCase();
-                
-                // Проверяем, существует ли уже термин с таким именем (независимо от регистра)
-                if (!nodeMap.has(relatedLower)) {
-                    const relatedId = `related_${relatedLower}`; // Используем нормализованное имя для ID
-                    elements.nodes.push({
-                        data: {
-                            id: relatedId,
-                            label: related,
-                            normalizedName: relatedLower,
-                            type: 'related'
-                        }
-                    });
-                    nodeMap.set(relatedLower, {
-                        id: relatedId,
-                        originalName: related,
-                        type: 'related'
-                    });
-                }
-            });
+
+    const details = new Map();
+    cy.on('tap', 'node', function(evt) {
+        const data = evt.target.data();
+        if (data.termId) {
+            showTermDetails(info, details, data.label);
+        } else {
+            showMissingTerm(info, data.label);
         }
     });
+}
+
+function neighborhoodNodeId(name) {
+    return `t:${name}`;
+}
+
+function clusterNodeId(parent) {
+    return `c:${parent}`;
+}
+
+function mergeNeighborhood(cy, graph, anchor) {
+    // Добавление узлов и ребер, которых еще нет на схеме; новые узлы
+    // размещаются по кругу вокруг раскрываемого узла
+    const center = anchor ? anchor.position() : { x: 0, y: 0 };
+    const fresh = graph.nodes.filter(node => cy.getElementById(neighborhoodNodeId(node.name)).empty());
+    const radius = 120 + fresh.length * 12;
+    const elements = [];
     
-    // Создаем связи, используя нормализованные имена
-    terms.forEach(term => {
-        if (Array.isArray(term.related_terms)) {
-            term.related_terms.forEach(related => {
-                if (!related) return;
-                const normalizedRelated = related.toLowerCase();
-                const targetNode = nodeMap.get(normalizedRelated);
-                
-                if (!targetNode) {
-                    console.warn(`Missing related term: ${related} for ${term.name}`);
-                    return;
+    fresh.forEach((node, i) => {
+        const angle = 2 * Math.PI * i / Math.max(fresh.length, 1);
+        elements.push({
+            group: 'nodes',
+            data: {
+                id: neighborhoodNodeId(node.name),
+                label: node.name,
+                termId: node.id,
+                type: node.id ? 'main' : 'related',
+                hidden: node.hidden
+            },
+            position: anchor ? {
+                x: center.x + radius * Math.cos(angle),
+                y: center.y + radius * Math.sin(angle)
+            } : { x: 0, y: 0 }
+        });
+    });
+    graph.nodes.forEach(node => {
+        // Скрытых соседей не может стать больше, чем было видно раньше
+        const existing = cy.getElementById(neighborhoodNodeId(node.name));
+        if (existing.nonempty()) {
+            existing.data('hidden', Math.min(existing.data('hidden'), node.hidden));
+        }
+    });
+    graph.edges.forEach(edge => {
+        const id = `e:${edge.source}\u0000${edge.target}`;
+        if (cy.getElementById(id).empty()) {
+            elements.push({
+                group: 'edges',
+                data: {
+                    id: id,
+                    source: neighborhoodNodeId(edge.source),
+                    target: neighborhoodNodeId(edge.target),
+                    label: edge.relation || 'связан с'
                 }
-                
-                // Используем оригинальное имя для метки связи
-                const relationLabel = term.relations[related] || term.relations[targetNode.originalName] || 'связан с';
-                
-                elements.edges.push({
-                    data: {
-                        source: term.id.toString(),
-                        target: targetNode.id,
-                        label: relationLabel
-                    }
-                });
             });
         }
     });
-
-    // Инициализация Cytoscape
-    const cy = cytoscape({
-        container: document.getElementById('mindmap'),
-        elements: elements,
-        style: [
-            {
-                selector: 'node',
-                style: {
-                    'label': 'data(label)',
-                    'text-wrap': 'wrap',
-                    'text-max-width': '100px',
-                    'font-size': '12px',
-                    'text-valign': 'center',
-                    'text-halign': 'center',
-                    'background-color': '#4CAF50',
-                    'width': '120px',
-                    'height': '40px',
-                    'shape': 'roundrectangle'
-                }
-            },
-            {
-                selector: 'node[type="related"]',
-                style: {
-                    'background-color': '#2196F3'
-                }
-            },
-            {
-                selector: 'edge',
-                style: {
-                    'width': 2,
-                    'line-color': '#666',
-                    'target-arrow-color': '#666',
-                    'target-arrow-shape': 'triangle',
-                    'curve-style': 'bezier',
-                    'label': 'data(label)',
-                    'font-size': '10px',
-                    'text-rotation': 'autorotate',
-                    'text-margin-y': -10
-                }
-            }
-        ],
-        layout: {
-            name: 'cola',
-            nodeSpacing: 100,
-            edgeLengthVal: 200,
-            animate: true,
-            randomize: false,
-            maxSimulationTime: 1500
+    graph.clusters.forEach(cluster => {
+        const id = clusterNodeId(cluster.parent);
+        if (cy.getElementById(id).nonempty()) {
+            return;
         }
+        elements.push({
+            group: 'nodes',
+            data: { id: id, label: `+${cluster.size}`, type: 'cluster', parentName: cluster.parent }
+        });
+        elements.push({
+            group: 'edges',
+            data: {
+                id: `ce:${cluster.parent}`,
+                source: neighborhoodNodeId(cluster.parent),
+                target: id,
+                label: '',
+                type: 'cluster'
+            }
+        });
     });
+    return cy.add(elements);
+}
 
-    // Применяем layout после инициализации
-    const layout = cy.layout({
-        name: 'preset',  // Сначала используем preset layout
+function renderNeighborhood(container, info, graph, options) {
+    const cy = cytoscape({
+        container: container,
+        style: MINDMAP_STYLE
+    });
+    
+    const added = mergeNeighborhood(cy, graph, null);
+    // Окрестность ограничена max_nodes, поэтому раскладка в браузере дешевая
+    added.layout({
+        name: 'breadthfirst',
+        roots: cy.getElementById(neighborhoodNodeId(graph.nodes[0].name)),
+        circle: true,
+        spacingFactor: 1.2,
         fit: true,
         padding: 50
-    });
-    layout.run();
-
-    // Затем применяем cola layout
-    setTimeout(() => {
-        const colaLayout = cy.layout({
-            name: 'cola',
-            fit: true,
-            padding: 50,
-            nodeSpacing: function(node){ return 40; },
-            edgeLength: function(edge){ return 80; },
-            infinite: true
+    }).run();
+    
+    const loading = new Set();
+    const expand = (name, clusterSize) => {
+        if (loading.has(name)) {
+            return;
+        }
+        loading.add(name);
+        const params = new URLSearchParams({
+            focus: name,
+            depth: 1,
+            max_nodes: options.maxNodes,
+            cluster_size: clusterSize
         });
-        colaLayout.run();
-    }, 100);
+        fetchJson(`${options.neighborhoodUrl}?${params}`)
+            .then(part => {
+                const anchor = cy.getElementById(neighborhoodNodeId(name));
+                cy.getElementById(clusterNodeId(name)).remove();
+                mergeNeighborhood(cy, part, anchor);
+                anchor.data('hidden', part.nodes.length ? part.nodes[0].hidden : 0);
+            })
+            .catch(error => console.error('Failed to expand node:', error))
+            .finally(() => loading.delete(name));
+    };
 
-    // Обработчик клика по узлу
+    const details = new Map();
     cy.on('tap', 'node', function(evt) {
-        const node = evt.target;
-        const data = node.data();
-        
-        let html = `<h6>${data.label}</h6>`;
-        if (data.definition) {
-            html += `<p>${data.definition}</p>`;
+        const data = evt.target.data();
+        if (data.type === 'cluster') {
+            // Кластер раскрывается целиком, без повторной свертки
+            expand(data.parentName, 0);
+            return;
         }
-        if (data.source) {
-            html += `<p><small class="text-muted">Источник: ${data.source}</small></p>`;
+        if (data.hidden > 0 && cy.getElementById(clusterNodeId(data.label)).empty()) {
+            expand(data.label, options.clusterSize);
         }
-        if (data.created) {
-            html += `
-                <p class="text-muted mb-0"><small>
-                    Создан: ${data.created}<br>
-                    Обновлен: ${data.updated}
-                </small></p>
-            `;
+        if (data.termId) {
+            showTermDetails(info, details, data.label);
+        } else {
+            showMissingTerm(info, data.label);
         }
-        
-        document.getElementById('term-info').innerHTML = html;
     });
-
-    // Масштабирование графа при загрузке
-    cy.fit(50);
-} 
\ No newline at end of file
+}
@@ -0,0 +1,108 @@
+// Разбор ответа /api/terms.pb - сообщения ListTermsResponse из dictionary.proto.
+// Поддерживаются только типы полей, которые есть в ListTermsResponse и Term.
+
+const utf8Decoder = new TextDecoder();
+
+class ProtoReader {
+    constructor(bytes, start = 0, end = bytes.length) {
+        this.bytes = bytes;
+        this.pos = start;
+        this.end = end;
+    }
+
+    done() {
+        return this.pos >= this.end;
+    }
+
+    varint() {
+        // Числа больше 2^53 в этих сообщениях не встречаются
+        let result = 0;
+        let multiplier = 1;
+        let byte;
+        do {
+            byte = this.bytes[this.pos++];
+            result += (byte & 0x7f) * multiplier;
+            multiplier *= 128;
+        } while (byte & 0x80);
+        return result;
+    }
+
+    // Вложенное сообщение или строка: новый reader по границам поля
+    sub() {
+        const length = this.varint();
+        const reader = new ProtoReader(this.bytes, this.pos, this.pos + length);
+        this.pos += length;
+        return reader;
+    }
+
+    string() {
+        const field = this.sub();
+        return utf8Decoder.decode(this.bytes.subarray(field.pos, field.end));
+    }
+
+    skip(wireType) {
+        if (wireType === 0) this.varint();
+        else if (wireType === 1) this.pos += 8;
+        else if (wireType === 2) this.sub();
+        else if (wireType === 5) this.pos += 4;
+        else throw new Error(`Unsupported wire type ${wireType}`);
+    }
+
+    // Обход полей: callback(номер поля, тип) читает значение или возвращает false
+    fields(callback) {
+        while (!this.done()) {
+            const tag = this.varint();
+            const wireType = tag & 7;
+            if (callback(tag >>> 3, wireType) === false) {
+                this.skip(wireType);
+            }
+        }
+    }
+}
+
+function decodeTerm(reader) {
+    const term = {
+        id: 0, name: '', definition: '', related_terms: [], source: '',
+        created_at: '', updated_at: '', relations: {}
+    };
+    reader.fields((field, wireType) => {
+        switch (field) {
+            case 1: term.id = reader.varint(); break;
+            case 2: term.name = reader.string(); break;
+            case 3: term.definition = reader.string(); break;
+            case 4: term.related_terms.push(reader.string()); break;
+            case 5: term.source = reader.string(); break;
+            case 6: term.created_at = reader.string(); break;
+            case 7: term.updated_at = reader.string(); break;
+            case 8: {
+                const entry = reader.sub();
+                let key = '';
+                let value = '';
+                entry.fields(entryField => {
+                    if (entryField === 1) key = entry.string();
+                    else if (entryField === 2) value = entry.string();
+                    else return false;
+                });
+                term.relations[key] = value;
+                break;
+            }
+            default: return false;
+        }
+    });
+    return term;
+}
+
+// Страница терминов в том же виде, что JSON ответ /api/terms
+function decodeTermsPage(buffer) {
+    const reader = new ProtoReader(new Uint8Array(buffer));
+    const page = { terms: [], next_page_token: '' };
+    reader.fields(field => {
+        switch (field) {
+            case 1: page.terms.push(decodeTerm(reader.sub())); break;
+            case 2: page.next_page_token = reader.string(); break;
+            case 6: page.total = reader.varint(); break;
+            default: return false;
+        }
+    });
+    return page;
+}
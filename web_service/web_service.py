@@ -1,13 +1,23 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_from_directory, Response
+from flask import Flask, render_template, request, jsonify, redirect, url_for, send_from_directory, Response, g
 import grpc
 import dictionary_pb2
 import dictionary_pb2_grpc
 import os
+import json
+import threading
+import time
 from flask_cors import CORS
 import logging
-from typing import Dict, List, Union
+from datetime import datetime, timezone
+from markupsafe import escape
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 from functools import wraps
 
+from google.protobuf.message import Message
+
+from compression import COMPRESSIBLE_TYPES, available_encodings, choose_encoding, compress
+from response_cache import MemoryBackend, RedisBackend, ResponseCache
+
 # Настройка логирования
 logging.basicConfig(
     level=logging.INFO,
@@ -23,27 +33,158 @@ class Config:
     DEBUG = os.getenv("FLASK_DEBUG", "0") == "1"
     HOST = os.getenv("FLASK_HOST", "0.0.0.0")
     PORT = int(os.getenv("FLASK_PORT", "5000"))
+    # Полный список терминов может превышать стандартные 4 МБ gRPC
+    GRPC_MAX_MESSAGE_LENGTH = int(os.getenv("GRPC_MAX_MESSAGE_LENGTH", str(256 * 1024 * 1024)))
+    # Предельное время ответа сервиса словаря на один вызов в секундах
+    GRPC_TIMEOUT = float(os.getenv("GRPC_TIMEOUT", "5"))
+    # Количество каналов к сервису словаря (запросы распределяются по кругу)
+    GRPC_CHANNELS = int(os.getenv("GRPC_CHANNELS", "2"))
+    # Попытки читающего вызова при недоступности сервиса, включая первую
+    GRPC_RETRY_ATTEMPTS = int(os.getenv("GRPC_RETRY_ATTEMPTS", "3"))
+    GRPC_KEEPALIVE_TIME_MS = int(os.getenv("GRPC_KEEPALIVE_TIME_MS", "60000"))
+    GRPC_KEEPALIVE_TIMEOUT_MS = int(os.getenv("GRPC_KEEPALIVE_TIMEOUT_MS", "20000"))
+    # Сжатие запросов к сервису словаря: none, gzip или deflate
+    GRPC_COMPRESSION = os.getenv("GRPC_COMPRESSION", "gzip")
+    # Кодировки сжатия ответов в порядке предпочтения (пусто - без сжатия);
+    # br используется, если установлен пакет brotli
+    WEB_COMPRESSION = os.getenv("WEB_COMPRESSION", "br,gzip")
+    # Ответы меньше этого размера в байтах не сжимаются
+    WEB_COMPRESSION_MIN_SIZE = int(os.getenv("WEB_COMPRESSION_MIN_SIZE", "1024"))
+    # Размер страницы таблицы терминов
+    TERMS_PAGE_SIZE = int(os.getenv("TERMS_PAGE_SIZE", "50"))
+    # Формат страниц таблицы терминов: json (/api/terms) или protobuf (/api/terms.pb)
+    TERMS_TRANSPORT = os.getenv("TERMS_TRANSPORT", "json")
+    # Параметры окрестности термина на майндмапе
+    MINDMAP_DEPTH = int(os.getenv("MINDMAP_DEPTH", "2"))
+    MINDMAP_MAX_NODES = int(os.getenv("MINDMAP_MAX_NODES", "150"))
+    MINDMAP_CLUSTER_SIZE = int(os.getenv("MINDMAP_CLUSTER_SIZE", "12"))
+    # Кеш готовых страниц и JSON ответов: memory, redis или none
+    WEB_CACHE_BACKEND = os.getenv("WEB_CACHE_BACKEND", "memory")
+    # Время жизни ответа в кеше в секундах
+    WEB_CACHE_TTL = float(os.getenv("WEB_CACHE_TTL", "30"))
+    # Максимальное количество ответов в кеше memory
+    WEB_CACHE_SIZE = int(os.getenv("WEB_CACHE_SIZE", "1000"))
+    # Адрес Redis для кеша redis (fakeredis:// - хранилище в памяти для разработки)
+    WEB_CACHE_REDIS_URL = os.getenv("WEB_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    # Период опроса версии набора данных для кеша в секундах (0 - подписка WatchTerms)
+    WEB_CACHE_VERSION_POLL = float(os.getenv("WEB_CACHE_VERSION_POLL", "0.5"))
 
 app = Flask(__name__)
 CORS(app)
 
+# Вызовы без изменения данных, которые безопасно повторять
+RETRYABLE_METHODS = (
+    'GetDefinition', 'GetTermsByNames', 'ListTerms', 'GetFacets', 'SearchTerms',
+    'SuggestTerms', 'GetNeighborhood', 'GetBacklinks', 'ShortestPath', 'GetGraph', 'GetVersion'
+)
+
+COMPRESSION = {
+    'none': grpc.Compression.NoCompression,
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+}
+
+# Кодировки сжатия HTTP ответов, доступные в этом окружении
+RESPONSE_ENCODINGS = available_encodings(
+    encoding for encoding in Config.WEB_COMPRESSION.split(',') if encoding.strip()
+)
+
+PROTOBUF_MIMETYPE = 'application/x-protobuf'
+
+def grpc_target() -> str:
+    """Адрес сервиса словаря"""
+    return f"{Config.DICTIONARY_HOST}:{Config.DICTIONARY_PORT}"
+
+def grpc_channel_options() -> List[Tuple[str, Union[int, str]]]:
+    """
+    Параметры канала к сервису словаря (общие для grpc и grpc.aio)
+    
+    Читающие вызовы повторяются при UNAVAILABLE с экспоненциальной
+    задержкой; изменяющие данные не повторяются, так как сервис мог успеть
+    их выполнить. Каждый канал открывает собственное соединение, поэтому
+    пул каналов распределяет запросы между процессами сервиса (--workers).
+    
+    Returns:
+        List[Tuple[str, Union[int, str]]]: Параметры канала
+    """
+    service_config = {
+        'methodConfig': [{
+            'name': [
+                {'service': 'dictionary.DictionaryService', 'method': method}
+                for method in RETRYABLE_METHODS
+            ],
+            'retryPolicy': {
+                'maxAttempts': Config.GRPC_RETRY_ATTEMPTS,
+                'initialBackoff': '0.1s',
+                'maxBackoff': '1s',
+                'backoffMultiplier': 2,
+                'retryableStatusCodes': ['UNAVAILABLE']
+            }
+        }]
+    }
+    return [
+        ('grpc.max_receive_message_length', Config.GRPC_MAX_MESSAGE_LENGTH),
+        ('grpc.keepalive_time_ms', Config.GRPC_KEEPALIVE_TIME_MS),
+        ('grpc.keepalive_timeout_ms', Config.GRPC_KEEPALIVE_TIMEOUT_MS),
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.enable_retries', int(Config.GRPC_RETRY_ATTEMPTS > 1)),
+        ('grpc.service_config', json.dumps(service_config)),
+        ('grpc.use_local_subchannel_pool', 1),
+    ]
+
 # Создание gRPC канала и клиента
 class GrpcClient:
-    """Класс для работы с gRPC клиентом"""
-    _instance = None
-    _channel = None
-    _stub = None
+    """
+    Класс для работы с gRPC клиентом
+    
+    Держит Config.GRPC_CHANNELS каналов и выдает их заглушки по кругу.
+    """
+    _channels: List[grpc.Channel] = []
+    _stubs: List[dictionary_pb2_grpc.DictionaryServiceStub] = []
+    _next = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def _next_index(cls) -> int:
+        """Номер следующего канала пула (каналы создаются при первом вызове)"""
+        with cls._lock:
+            if not cls._channels:
+                cls._channels = [
+                    grpc.insecure_channel(
+                        grpc_target(),
+                        options=grpc_channel_options(),
+                        compression=COMPRESSION[Config.GRPC_COMPRESSION]
+                    )
+                    for _ in range(max(1, Config.GRPC_CHANNELS))
+                ]
+                cls._stubs = [dictionary_pb2_grpc.DictionaryServiceStub(channel)
+                              for channel in cls._channels]
+            cls._next = (cls._next + 1) % len(cls._channels)
+            return cls._next
 
     @classmethod
     def get_instance(cls) -> dictionary_pb2_grpc.DictionaryServiceStub:
         """Получение экземпляра gRPC клиента"""
-        if cls._instance is None:
-            cls._channel = grpc.insecure_channel(
-                f"{Config.DICTIONARY_HOST}:{Config.DICTIONARY_PORT}"
-            )
-            cls._stub = dictionary_pb2_grpc.DictionaryServiceStub(cls._channel)
-            cls._instance = cls._stub
-        return cls._instance
+        index = cls._next_index()
+        return cls._stubs[index]
+
+    @classmethod
+    def get_raw_method(cls, method: str, request_type) -> grpc.UnaryUnaryMultiCallable:
+        """
+        Вызов метода сервиса словаря без разбора ответа
+        
+        Args:
+            method: Имя метода DictionaryService
+            request_type: Класс сообщения запроса
+        Returns:
+            grpc.UnaryUnaryMultiCallable: Вызов, возвращающий ответ в виде
+                сериализованного сообщения protobuf (bytes)
+        """
+        index = cls._next_index()
+        return cls._channels[index].unary_unary(
+            f'/dictionary.DictionaryService/{method}',
+            request_serializer=request_type.SerializeToString
+        )
 
 def handle_grpc_error(f):
     """Декоратор для обработки gRPC ошибок"""
@@ -51,31 +192,687 @@ def handle_grpc_error(f):
     def wrapper(*args, **kwargs):
         try:
             return f(*args, **kwargs)
-        except grpc.RpcError as e:
-            logger.error(f"gRPC Error in {f.__name__}: {str(e)}")
-            if e.code() == grpc.StatusCode.NOT_FOUND:
-                return render_template('term_not_found.html', term_name=kwargs.get('name', 'Unknown'))
-            return render_template('error.html', 
-                error=f"Произошла ошибка при обращении к сервису: {e.details()}")
         except Exception as e:
-            logger.error(f"Unexpected error in {f.__name__}: {str(e)}")
-            return render_template('error.html', 
-                error="Произошла неожиданная ошибка")
+            # Страница ошибки отдается со статусом 200, но не кешируется
+            g.grpc_error = True
+            template, context = error_page(e, f.__name__, kwargs.get('name', 'Unknown'))
+            return render_template(template, **context)
+    return wrapper
+
+# Пауза перед повторным получением версии после ошибки в секундах
+CACHE_WATCH_RETRY_DELAY = 1.0
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+def watch_dataset_version(cache: ResponseCache) -> None:
+    """
+    Передача кешу ответов текущей версии набора данных
+    
+    Выполняется в отдельном потоке. По умолчанию версия опрашивается через
+    GetVersion раз в WEB_CACHE_VERSION_POLL секунд: об изменениях через
+    другие экземпляры веб-сервиса кеш узнает с этой задержкой. При
+    WEB_CACHE_VERSION_POLL=0 кеш подписывается на WatchTerms и узнает о
+    любом изменении из события, но открытая подписка занимает один
+    рабочий поток сервера словаря в режиме sync, поэтому подписку стоит
+    включать для режима async. Пока версия неизвестна, кеш не используется.
+    
+    Args:
+        cache: Кеш ответов
+    """
+    stub = dictionary_pb2_grpc.DictionaryServiceStub(
+        grpc.insecure_channel(grpc_target(), options=grpc_channel_options())
+    )
+    while True:
+        try:
+            version = stub.GetVersion(
+                dictionary_pb2.VersionRequest(), timeout=Config.GRPC_TIMEOUT, wait_for_ready=True
+            ).version
+            if Config.WEB_CACHE_VERSION_POLL > 0:
+                cache.set_version(version)
+                while True:
+                    time.sleep(Config.WEB_CACHE_VERSION_POLL)
+                    cache.set_version(stub.GetVersion(
+                        dictionary_pb2.VersionRequest(), timeout=Config.GRPC_TIMEOUT
+                    ).version)
+            else:
+                events = stub.WatchTerms(dictionary_pb2.WatchTermsRequest(from_version=version))
+                cache.set_version(version)
+                for event in events:
+                    # Снимок приходит, если история изменений уже очищена
+                    if event.type != dictionary_pb2.TermEvent.SNAPSHOT:
+                        cache.set_version(event.version)
+        except grpc.RpcError as e:
+            logger.warning(f"Отслеживание версии для кеша ответов прервано: {e.code()}")
+        cache.set_version(None)
+        time.sleep(CACHE_WATCH_RETRY_DELAY)
+
+def cache_backend() -> Union[MemoryBackend, RedisBackend]:
+    """
+    Хранилище кеша ответов по настройке WEB_CACHE_BACKEND
+    
+    Если хранилище redis создать нельзя (нет пакета redis), используется
+    хранилище в памяти процесса: ошибка настройки не должна приводить к
+    ошибкам всех кешируемых страниц.
+    
+    Returns:
+        Union[MemoryBackend, RedisBackend]: Хранилище
+    """
+    if Config.WEB_CACHE_BACKEND == 'redis':
+        try:
+            return RedisBackend(Config.WEB_CACHE_REDIS_URL)
+        except (RuntimeError, ValueError) as e:
+            # ValueError - неверный адрес WEB_CACHE_REDIS_URL
+            logger.warning(f"{e}; кеш ответов хранится в памяти процесса")
+    return MemoryBackend(Config.WEB_CACHE_SIZE)
+
+def response_cache() -> Optional[ResponseCache]:
+    """
+    Кеш ответов веб-сервиса
+    
+    Создается один раз (при запуске или первом обращении) вместе с потоком
+    watch_dataset_version.
+    
+    Returns:
+        Optional[ResponseCache]: Кеш или None, если он отключен
+    """
+    global _response_cache
+    if Config.WEB_CACHE_BACKEND == 'none':
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(cache_backend(), Config.WEB_CACHE_TTL)
+            threading.Thread(
+                target=watch_dataset_version, args=(_response_cache,),
+                name='response-cache-watcher', daemon=True
+            ).start()
+        return _response_cache
+
+def cached_response(f):
+    """
+    Декоратор читающих обработчиков: ответ берется из кеша по пути,
+    параметрам запроса и версии набора данных
+    
+    Кешируются только успешные ответы (200 без gRPC ошибки). Заголовок
+    X-Cache сообщает, был ли ответ взят из кеша.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        cache = response_cache()
+        if cache is None or not cache.active:
+            return f(*args, **kwargs)
+        key = cache.key(request.path, request.args.items(multi=True))
+        cached = cache.get(key)
+        if cached is not None:
+            body, status, content_type = cached
+            response = Response(body, status=status, content_type=content_type)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        response = app.make_response(f(*args, **kwargs))
+        if response.status_code == 200 and not g.get('grpc_error'):
+            cache.put(key, (response.get_data(), response.status_code, response.content_type))
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
+
+def invalidates_cache(f):
+    """
+    Декоратор изменяющих данные обработчиков: после успешной записи кеш ответов сбрасывается
+    
+    Обработчик устанавливает g.data_unchanged, если сервис словаря сообщил,
+    что данные не изменились: версия набора данных осталась прежней, и
+    сброс пометил бы устаревшей текущую версию, отключив кеш до следующей записи.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        cache = response_cache()
+        version = cache.version if cache is not None else None
+        response = app.make_response(f(*args, **kwargs))
+        if (cache is not None and response.status_code == 200
+                and not g.get('grpc_error') and not g.get('data_unchanged')):
+            cache.invalidate(version)
+        return response
     return wrapper
 
+def requested_version(if_none_match) -> int:
+    """
+    Версия набора данных из заголовка If-None-Match
+    
+    Args:
+        if_none_match: Разобранный заголовок (request.if_none_match)
+    Returns:
+        int: Версия из ETag клиента или 0, если ее нет
+    """
+    for etag in if_none_match.as_set(include_weak=True):
+        if etag.startswith('v') and etag[1:].isdigit():
+            return int(etag[1:])
+    return 0
+
+def versioned(response: Response, version: int, modified_at: str = '') -> Response:
+    """
+    Добавление заголовков ETag и Last-Modified по версии набора данных
+    
+    Args:
+        response: HTTP ответ
+        version: Версия данных, из которых построен ответ
+        modified_at: Время изменения данных, если известно
+    Returns:
+        Response: Ответ с заголовками; 304, если данные у клиента актуальны
+    """
+    set_version_headers(response, version, modified_at)
+    return response.make_conditional(request)
+
+def current_version() -> Optional[int]:
+    """
+    Версия набора данных для заголовка ETag
+    
+    Берется из кеша ответов, если он активен, иначе через GetVersion.
+    Версия читается до построения ответа, поэтому данные ответа не старше
+    нее, и ETag с ней не выдаст устаревшие данные за актуальные.
+    
+    Returns:
+        Optional[int]: Версия или None, если сервис словаря недоступен
+    """
+    cache = response_cache()
+    if cache is not None and cache.active:
+        return cache.version
+    try:
+        return GrpcClient.get_instance().GetVersion(
+            dictionary_pb2.VersionRequest(), timeout=Config.GRPC_TIMEOUT
+        ).version
+    except grpc.RpcError as e:
+        logger.warning(f"Не удалось получить версию данных для ETag: {e.code()}")
+        return None
+
+def conditional_response(f):
+    """
+    Декоратор читающих обработчиков: ETag по версии набора данных и 304
+    
+    Если версия из If-None-Match совпадает с текущей, обработчик не
+    вызывается. Успешный ответ (в том числе из кеша ответов, поэтому
+    декоратор указывается перед cached_response) получает ETag и
+    Cache-Control: no-cache, так что браузер перепроверяет его при каждом
+    запросе. Если версия неизвестна, ответ отдается без заголовков.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        version = current_version()
+        if version and requested_version(request.if_none_match) == version:
+            return versioned(Response(status=304), version)
+        response = app.make_response(f(*args, **kwargs))
+        if version and response.status_code == 200 and not g.get('grpc_error'):
+            return versioned(response, version)
+        return response
+    return wrapper
+
+# Маркеры совпадений в ответе SearchTerms; заменяются на <mark> после
+# экранирования текста, чтобы HTML из определений не попадал на страницу
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+def highlighted_html(text: str) -> str:
+    """
+    Экранирование текста с выделенными совпадениями для вставки в HTML
+    
+    Args:
+        text: Текст с маркерами HIGHLIGHT_START и HIGHLIGHT_END
+    Returns:
+        str: Безопасный HTML с совпадениями в тегах <mark>
+    """
+    return str(escape(text)).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+
+def term_json(term: dictionary_pb2.Term) -> Dict:
+    """
+    Представление термина для JSON API
+    
+    Args:
+        term: Термин из ответа сервиса словаря
+    Returns:
+        Dict: Поля термина
+    """
+    return {
+        'id': term.id,
+        'name': term.name,
+        'definition': term.definition,
+        'source': term.source,
+        'related_terms': list(term.related_terms),
+        'relations': dict(term.relations),
+        'created_at': term.created_at,
+        'updated_at': term.updated_at
+    }
+
+def term_from_json(data: Dict) -> dictionary_pb2.Term:
+    """
+    Термин из тела запроса на добавление или обновление
+    
+    Args:
+        data: JSON с полями name, definition, related_terms, source, relations
+    Returns:
+        dictionary_pb2.Term: Термин для запроса к сервису словаря
+    """
+    term = dictionary_pb2.Term(
+        name=data['name'],
+        definition=data['definition'],
+        related_terms=data.get('related_terms', []),
+        source=data.get('source', '')
+    )
+    
+    # Добавляем связи между терминами
+    for related, relation_type in data.get('relations', {}).items():
+        term.relations[related] = relation_type
+    return term
+
+# Функции ниже разбирают параметры запросов и формируют JSON ответов; их
+# используют и приложение Flask, и асинхронное приложение async_web_service
+
+def list_terms_request(args) -> dictionary_pb2.ListTermsRequest:
+    """
+    Запрос страницы терминов по параметрам /api/terms
+    
+    page_size=0 - полный список одним ответом (см. full_list_requested).
+    
+    Args:
+        args: Параметры строки запроса
+    Returns:
+        dictionary_pb2.ListTermsRequest: Запрос к сервису словаря
+    Raises:
+        ValueError: Если параметры страницы некорректны
+    """
+    page_size = args.get('page_size', Config.TERMS_PAGE_SIZE, type=int)
+    order = args.get('order', 'asc')
+    if page_size < 0 or order not in ('asc', 'desc'):
+        raise ValueError("Некорректные параметры страницы")
+    return dictionary_pb2.ListTermsRequest(
+        page_size=page_size,
+        page_token=args.get('page_token', ''),
+        sort_by=args.get('sort', ''),
+        descending=order == 'desc',
+        source=args.get('source', ''),
+        relation_type=args.get('relation_type', ''),
+        include_total=args.get('total') == '1'
+    )
+
+def full_list_requested(args) -> bool:
+    """
+    Запрошен ли полный список терминов (page_size=0)
+    
+    Полный список без сортировки и фильтров сервис словаря отдает с версией
+    набора данных, поэтому /api/terms отвечает на него с ETag и 304, как
+    /api/graph, а не через кеш ответов.
+    """
+    return args.get('page_size') == '0'
+
+def terms_page_json(response: dictionary_pb2.ListTermsResponse, include_total: bool) -> Dict:
+    """JSON страницы терминов"""
+    result = {
+        'terms': [term_json(term) for term in response.terms],
+        'next_page_token': response.next_page_token
+    }
+    if include_total:
+        result['total'] = response.total_size
+    return result
+
+def facets_json(response: dictionary_pb2.FacetsResponse) -> Dict:
+    """JSON значений фильтров таблицы терминов"""
+    return {
+        'sources': list(response.sources),
+        'relation_types': list(response.relation_types)
+    }
+
+def update_json(response: dictionary_pb2.UpdateTermResponse) -> Dict:
+    """JSON результата обновления термина"""
+    return {
+        **write_json(response),
+        'changed': response.changed,
+        'term': {
+            'id': response.term.id,
+            'name': response.term.name,
+            'definition': response.term.definition,
+            'source': response.term.source,
+            'related_terms': list(response.term.related_terms)
+        } if response.term else None
+    }
+
+def search_request(args) -> dictionary_pb2.SearchTermsRequest:
+    """
+    Запрос полнотекстового поиска по параметрам /api/search
+    
+    Args:
+        args: Параметры строки запроса
+    Returns:
+        dictionary_pb2.SearchTermsRequest: Запрос к сервису словаря
+    Raises:
+        ValueError: Если запрос пуст или параметры страницы некорректны
+    """
+    query = args.get('q', '').strip()
+    limit = args.get('limit', 20, type=int)
+    offset = args.get('offset', 0, type=int)
+    if not query:
+        raise ValueError("Параметр q обязателен")
+    if limit < 1 or offset < 0:
+        raise ValueError("Некорректные параметры limit и offset")
+    return dictionary_pb2.SearchTermsRequest(
+        query=query, limit=limit, offset=offset,
+        highlight_start=HIGHLIGHT_START, highlight_end=HIGHLIGHT_END
+    )
+
+def search_json(query: str, response: dictionary_pb2.SearchTermsResponse) -> Dict:
+    """JSON результатов поиска с выделенными совпадениями"""
+    return {
+        'query': query,
+        'hits': [{
+            'id': hit.id,
+            'name': hit.name.replace(HIGHLIGHT_START, '').replace(HIGHLIGHT_END, ''),
+            'name_html': highlighted_html(hit.name),
+            'snippet_html': highlighted_html(hit.snippet),
+            'score': hit.score
+        } for hit in response.hits]
+    }
+
+def suggest_request(args) -> Optional[dictionary_pb2.SuggestTermsRequest]:
+    """
+    Запрос подсказок по параметрам /api/suggest
+    
+    Args:
+        args: Параметры строки запроса
+    Returns:
+        Optional[dictionary_pb2.SuggestTermsRequest]: Запрос или None,
+            если префикс пуст
+    Raises:
+        ValueError: Если limit некорректен
+    """
+    prefix = args.get('prefix', '').strip()
+    limit = args.get('limit', 10, type=int)
+    if not prefix:
+        return None
+    if limit < 1:
+        raise ValueError("Некорректный параметр limit")
+    return dictionary_pb2.SuggestTermsRequest(prefix=prefix, limit=limit)
+
+def suggestions_json(response: Optional[dictionary_pb2.SuggestTermsResponse]) -> Dict:
+    """JSON списка подсказок"""
+    return {
+        'suggestions': [
+            {'id': suggestion.id, 'name': suggestion.name}
+            for suggestion in (response.suggestions if response else [])
+        ]
+    }
+
+def graph_json(graph: dictionary_pb2.FullGraphResponse) -> Dict:
+    """JSON графа связей параллельными массивами (см. /api/graph)"""
+    return {
+        'version': graph.version,
+        'nodes': {
+            'name': list(graph.names),
+            'id': list(graph.ids),
+            'x': [round(x, 1) for x in graph.xs],
+            'y': [round(y, 1) for y in graph.ys]
+        },
+        'edges': {
+            'source': list(graph.sources),
+            'target': list(graph.targets),
+            'relation': list(graph.relation_indexes)
+        },
+        'relations': list(graph.relations)
+    }
+
+def neighborhood_request(args) -> dictionary_pb2.NeighborhoodRequest:
+    """
+    Запрос окрестности по параметрам /api/neighborhood
+    
+    Args:
+        args: Параметры строки запроса
+    Returns:
+        dictionary_pb2.NeighborhoodRequest: Запрос к сервису словаря
+    Raises:
+        ValueError: Если focus не указан или параметры некорректны
+    """
+    focus = args.get('focus', '')
+    depth = args.get('depth', Config.MINDMAP_DEPTH, type=int)
+    max_nodes = args.get('max_nodes', Config.MINDMAP_MAX_NODES, type=int)
+    cluster_size = args.get('cluster_size', Config.MINDMAP_CLUSTER_SIZE, type=int)
+    if not focus:
+        raise ValueError("Параметр focus обязателен")
+    if depth < 1 or max_nodes < 1 or cluster_size < 0:
+        raise ValueError("Некорректные параметры окрестности")
+    return dictionary_pb2.NeighborhoodRequest(
+        name=focus, depth=depth, limit=max_nodes, cluster_size=cluster_size
+    )
+
+def neighborhood_json(graph: dictionary_pb2.GraphResponse) -> Dict:
+    """JSON окрестности термина"""
+    return {
+        'nodes': [{
+            'name': node.name,
+            'id': node.id,
+            'depth': node.depth,
+            'degree': node.degree,
+            'hidden': node.hidden
+        } for node in graph.nodes],
+        'edges': [{
+            'source': edge.source,
+            'target': edge.target,
+            'relation': edge.relation
+        } for edge in graph.edges],
+        'clusters': [{
+            'parent': cluster.parent,
+            'size': cluster.size
+        } for cluster in graph.clusters],
+        'truncated': graph.truncated
+    }
+
+def mindmap_options(args) -> Dict:
+    """Параметры страницы майндмапа для initMindmap"""
+    return {
+        'graphUrl': '/api/graph',
+        'neighborhoodUrl': '/api/neighborhood',
+        'focus': args.get('focus', ''),
+        'depth': args.get('depth', Config.MINDMAP_DEPTH, type=int),
+        'maxNodes': args.get('max_nodes', Config.MINDMAP_MAX_NODES, type=int),
+        'clusterSize': Config.MINDMAP_CLUSTER_SIZE
+    }
+
+def write_json(response) -> Dict:
+    """JSON результата добавления или удаления термина"""
+    return {
+        'success': response.success,
+        'message': response.message
+    }
+
+def write_status(response) -> int:
+    """HTTP статус результата изменения термина"""
+    return 200 if response.success else 400
+
+class ApiCall(NamedTuple):
+    """
+    Читающий JSON endpoint: запрос к сервису словаря по параметрам, метод
+    сервиса и JSON ответа
+    
+    Приложения Flask и Quart выполняют его одинаково (см. call_api), разница
+    только в синхронном или асинхронном вызове сервиса.
+    """
+    # Метод DictionaryService
+    method: str
+    # Запрос по параметрам строки запроса и пути; None - ответ без вызова
+    # сервиса. ValueError - некорректные параметры (HTTP 400)
+    request: Callable[..., Optional[Message]]
+    # JSON ответа по запросу и ответу сервиса (None, если вызова не было)
+    json: Callable[[Optional[Message], Optional[Message]], Dict]
+    # Текст ошибки HTTP 404 при NOT_FOUND ({request} - запрос); без него - 502
+    not_found: Optional[str] = None
+
+LIST_TERMS_CALL = ApiCall(
+    'ListTerms', list_terms_request,
+    lambda terms_request, response: terms_page_json(response, terms_request.include_total)
+)
+FACETS_CALL = ApiCall(
+    'GetFacets', lambda args: dictionary_pb2.FacetsRequest(),
+    lambda _, response: facets_json(response)
+)
+TERM_CALL = ApiCall(
+    'GetDefinition', lambda args, name: dictionary_pb2.TermRequest(name=name),
+    lambda _, response: term_json(response.term),
+    not_found="Термин '{request.name}' не найден"
+)
+SEARCH_CALL = ApiCall(
+    'SearchTerms', search_request,
+    lambda query, response: search_json(query.query, response)
+)
+SUGGEST_CALL = ApiCall(
+    'SuggestTerms', suggest_request,
+    lambda _, response: suggestions_json(response)
+)
+NEIGHBORHOOD_CALL = ApiCall(
+    'GetNeighborhood', neighborhood_request,
+    lambda _, graph: neighborhood_json(graph),
+    not_found="Термин '{request.name}' не найден"
+)
+
+def api_error(error: Exception, method: str, call_request: Optional[Message] = None,
+              not_found: Optional[str] = None) -> Tuple[Dict, int]:
+    """
+    JSON ошибки и HTTP статус для некорректных параметров или ошибки вызова
+    
+    Args:
+        error: ValueError разбора параметров или grpc.RpcError вызова
+        method: Метод сервиса словаря (для журнала)
+        call_request: Запрос к сервису, если он был построен
+        not_found: Текст ошибки для NOT_FOUND ({request} - запрос)
+    Returns:
+        Tuple[Dict, int]: JSON ошибки и HTTP статус
+    """
+    if isinstance(error, ValueError):
+        return {'error': str(error)}, 400
+    if error.code() == grpc.StatusCode.INVALID_ARGUMENT:
+        return {'error': error.details()}, 400
+    if error.code() == grpc.StatusCode.NOT_FOUND and not_found:
+        return {'error': not_found.format(request=call_request)}, 404
+    logger.error(f"gRPC Error in {method}: {str(error)}")
+    return {'error': error.details()}, 502
+
+def error_page(error: Exception, handler: str, term_name: str) -> Tuple[str, Dict]:
+    """
+    Шаблон и параметры страницы ошибки для handle_grpc_error
+    
+    Args:
+        error: Исключение обработчика
+        handler: Имя обработчика (для журнала)
+        term_name: Имя запрошенного термина (для страницы "не найден")
+    Returns:
+        Tuple[str, Dict]: Имя шаблона и его параметры
+    """
+    if isinstance(error, grpc.RpcError):
+        logger.error(f"gRPC Error in {handler}: {str(error)}")
+        if error.code() == grpc.StatusCode.NOT_FOUND:
+            return 'term_not_found.html', {'term_name': term_name}
+        return 'error.html', {
+            'error': f"Произошла ошибка при обращении к сервису: {error.details()}"
+        }
+    logger.error(f"Unexpected error in {handler}: {str(error)}")
+    return 'error.html', {'error': "Произошла неожиданная ошибка"}
+
+def response_encoding(response, accept_encodings) -> Optional[str]:
+    """
+    Кодировка сжатия ответа, выбранная по заголовку Accept-Encoding
+    
+    Args:
+        response: HTTP ответ Flask или Quart
+        accept_encodings: Разобранный заголовок (request.accept_encodings)
+    Returns:
+        Optional[str]: Кодировка или None, если ответ не сжимается
+    """
+    if (getattr(response, 'direct_passthrough', False) or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return None
+    response.vary.add('Accept-Encoding')
+    return choose_encoding(accept_encodings, RESPONSE_ENCODINGS)
+
+def set_compressed(response, data: bytes, encoding: str) -> None:
+    """
+    Замена тела ответа сжатым, если оно не меньше WEB_COMPRESSION_MIN_SIZE
+    
+    Args:
+        response: HTTP ответ Flask или Quart
+        data: Несжатое тело ответа
+        encoding: Кодировка из response_encoding
+    """
+    if len(data) < Config.WEB_COMPRESSION_MIN_SIZE:
+        return
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+
+def set_version_headers(response, version: int, modified_at: str = '') -> None:
+    """
+    Заголовки ETag, Last-Modified и Cache-Control по версии набора данных
+    
+    Args:
+        response: HTTP ответ Flask или Quart
+        version: Версия данных, из которых построен ответ
+        modified_at: Время изменения данных, если известно
+    """
+    response.set_etag(f"v{version}", weak=True)
+    if modified_at:
+        response.last_modified = datetime.fromisoformat(
+            modified_at
+        ).replace(tzinfo=timezone.utc)
+    response.cache_control.no_cache = True
+
+def call_api(call: ApiCall, **view_args) -> Tuple[Response, int]:
+    """
+    Выполнение читающего JSON endpoint
+    
+    Args:
+        call: Описание endpoint
+        view_args: Параметры пути
+    Returns:
+        Tuple[Response, int]: JSON ответа или ошибки и HTTP статус
+    """
+    call_request = None
+    try:
+        call_request = call.request(request.args, **view_args)
+        response = getattr(GrpcClient.get_instance(), call.method)(
+            call_request, timeout=Config.GRPC_TIMEOUT
+        ) if call_request is not None else None
+    except (ValueError, grpc.RpcError) as e:
+        body, status = api_error(e, call.method, call_request, call.not_found)
+        return jsonify(body), status
+    return jsonify(call.json(call_request, response)), 200
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """
+    Сжатие HTML, JSON и protobuf ответов в кодировке, выбранной по
+    заголовку Accept-Encoding (br или gzip)
+    
+    Кеш ответов хранит несжатые тела, поэтому один ответ из кеша отдается
+    клиентам с любыми Accept-Encoding.
+    """
+    encoding = response_encoding(response, request.accept_encodings)
+    if encoding is not None:
+        set_compressed(response, response.get_data(), encoding)
+    return response
+
 @app.route('/static/<path:path>')
 def send_static(path: str) -> Response:
     """Отправка статических файлов"""
     return send_from_directory('static', path)
 
 @app.route('/')
-@handle_grpc_error
+@conditional_response
+@cached_response
 def index() -> str:
-    """Главная страница со списком терминов"""
-    response = GrpcClient.get_instance().ListTerms(dictionary_pb2.ListTermsRequest())
-    return render_template('database.html', terms=response.terms)
+    """
+    Главная страница со списком терминов
+    
+    Таблица заполняется страницами через /api/terms, поэтому время
+    отрисовки страницы не зависит от размера словаря.
+    """
+    return render_template('database.html', page_size=Config.TERMS_PAGE_SIZE,
+                           transport=Config.TERMS_TRANSPORT)
 
 @app.route('/term/<name>')
+@cached_response
 @handle_grpc_error
 def get_term(name: str) -> str:
     """
@@ -86,44 +883,106 @@ def get_term(name: str) -> str:
     Returns:
         str: HTML страница с определением термина
     """
-    # Получаем все термины для поиска правильного регистра
-    terms_response = GrpcClient.get_instance().ListTerms(dictionary_pb2.ListTermsRequest())
-    term_names = {term.name.lower(): term.name for term in terms_response.terms}
+    # Сервис словаря сам выполняет регистронезависимый поиск
+    stub = GrpcClient.get_instance()
+    response = stub.GetDefinition(dictionary_pb2.TermRequest(name=name), timeout=Config.GRPC_TIMEOUT)
     
-    # Ищем точное имя термина по нормализованному ключу
-    actual_name = term_names.get(name.lower())
-    if not actual_name:
-        return render_template('term_not_found.html', term_name=name)
+    # Проверяем существование всех связанных терминов одним вызовом
+    missing = set()
+    if response.term.related_terms:
+        related = stub.GetTermsByNames(
+            dictionary_pb2.TermsByNamesRequest(names=response.term.related_terms),
+            timeout=Config.GRPC_TIMEOUT
+        )
+        missing = set(related.missing)
+    return render_template('term.html', term=response.term, missing_related=missing)
+
+@app.route('/api/terms', methods=['GET'])
+def list_terms() -> Union[Response, tuple[Response, int]]:
+    """
+    API endpoint для постраничного получения терминов
     
-    # Используем точное имя термина для поиска
-    response = GrpcClient.get_instance().GetDefinition(
-        dictionary_pb2.TermRequest(name=actual_name)
-    )
-    return render_template('term.html', term=response.term)
+    Параметры запроса: page_size, page_token (из next_page_token предыдущего
+    ответа), sort (name, created_at, updated_at; по умолчанию ID), order
+    (asc или desc), source и relation_type для отбора, total=1 для
+    подсчета количества терминов с учетом фильтров. Страницы отдаются с
+    ETag по версии набора данных (см. conditional_response). page_size=0
+    без сортировки и фильтров - полный список с ETag и Last-Modified из
+    ответа сервиса словаря; если версия у клиента актуальна, ответ 304 без тела.
+    
+    Returns:
+        Union[Response, tuple[Response, int]]: JSON со страницей терминов и HTTP статус
+    """
+    if not full_list_requested(request.args):
+        return list_terms_page()
+    try:
+        terms_request = list_terms_request(request.args)
+        terms_request.if_version = requested_version(request.if_none_match)
+        terms = GrpcClient.get_instance().ListTerms(terms_request, timeout=Config.GRPC_TIMEOUT)
+    except (ValueError, grpc.RpcError) as e:
+        error, status = api_error(e, 'ListTerms')
+        return jsonify(error), status
+    if terms.not_modified:
+        return versioned(Response(status=304), terms.version, terms.modified_at)
+    response = jsonify(terms_page_json(terms, terms_request.include_total))
+    # Версию сервис сообщает только для списка без сортировки и фильтров
+    return versioned(response, terms.version, terms.modified_at) if terms.version else response
+
+@conditional_response
+@cached_response
+def list_terms_page() -> tuple[Response, int]:
+    """Страница терминов /api/terms через кеш ответов"""
+    return call_api(LIST_TERMS_CALL)
+
+@app.route('/api/terms.pb', methods=['GET'])
+@conditional_response
+@cached_response
+def list_terms_protobuf() -> tuple[Response, int]:
+    """
+    API endpoint со страницей терминов в формате protobuf
+    
+    Параметры те же, что у /api/terms. Тело ответа - сообщение
+    ListTermsResponse из dictionary.proto в том виде, в каком его вернул
+    сервис словаря: без разбора и преобразования в JSON. Ошибки
+    возвращаются в JSON, как у /api/terms.
+    
+    Returns:
+        tuple[Response, int]: Сериализованный ListTermsResponse и HTTP статус
+    """
+    try:
+        terms_request = list_terms_request(request.args)
+        body = GrpcClient.get_raw_method('ListTerms', dictionary_pb2.ListTermsRequest)(
+            terms_request, timeout=Config.GRPC_TIMEOUT
+        )
+    except (ValueError, grpc.RpcError) as e:
+        error, status = api_error(e, 'ListTerms')
+        return jsonify(error), status
+    return Response(body, mimetype=PROTOBUF_MIMETYPE), 200
+
+@app.route('/api/facets')
+@cached_response
+def list_facets() -> tuple[Response, int]:
+    """
+    API endpoint со значениями для фильтров таблицы терминов
+    
+    Returns:
+        tuple[Response, int]: JSON с источниками и типами связей и HTTP статус
+    """
+    return call_api(FACETS_CALL)
 
 @app.route('/api/terms', methods=['POST'])
+@invalidates_cache
 @handle_grpc_error
 def add_term() -> tuple[Response, int]:
     """API endpoint для добавления термина"""
-    data = request.json
-    term = dictionary_pb2.Term(
-        name=data['name'],
-        definition=data['definition'],
-        related_terms=data.get('related_terms', []),
-        source=data.get('source', '')
+    response = GrpcClient.get_instance().AddTerm(
+        dictionary_pb2.AddTermRequest(term=term_from_json(request.json)),
+        timeout=Config.GRPC_TIMEOUT
     )
-    
-    # Добавляем связи между терминами
-    for related, relation_type in data.get('relations', {}).items():
-        term.relations[related] = relation_type
-
-    response = GrpcClient.get_instance().AddTerm(dictionary_pb2.AddTermRequest(term=term))
-    return jsonify({
-        'success': response.success,
-        'message': response.message
-    }), 200 if response.success else 400
+    return jsonify(write_json(response)), write_status(response)
 
 @app.route('/api/terms/<int:term_id>', methods=['PUT'])
+@invalidates_cache
 @handle_grpc_error
 def update_term(term_id: int) -> tuple[Response, int]:
     """
@@ -134,35 +993,15 @@ def update_term(term_id: int) -> tuple[Response, int]:
     Returns:
         tuple[Response, int]: JSON ответ и HTTP статус
     """
-    data = request.json
-    term = dictionary_pb2.Term(
-        name=data['name'],
-        definition=data['definition'],
-        related_terms=data.get('related_terms', []),
-        source=data.get('source', '')
-    )
-    
-    # Добавляем связи между терминами
-    for related, relation_type in data.get('relations', {}).items():
-        term.relations[related] = relation_type
-
     response = GrpcClient.get_instance().UpdateTerm(
-        dictionary_pb2.UpdateTermRequest(id=term_id, term=term)
+        dictionary_pb2.UpdateTermRequest(id=term_id, term=term_from_json(request.json)),
+        timeout=Config.GRPC_TIMEOUT
     )
-    
-    return jsonify({
-        'success': response.success,
-        'message': response.message,
-        'term': {
-            'id': response.term.id,
-            'name': response.term.name,
-            'definition': response.term.definition,
-            'source': response.term.source,
-            'related_terms': list(response.term.related_terms)
-        } if response.term else None
-    }), 200 if response.success else 400
+    g.data_unchanged = response.success and not response.changed
+    return jsonify(update_json(response)), write_status(response)
 
 @app.route('/api/terms/<int:term_id>', methods=['DELETE'])
+@invalidates_cache
 @handle_grpc_error
 def delete_term(term_id: int) -> tuple[Response, int]:
     """
@@ -174,54 +1013,120 @@ def delete_term(term_id: int) -> tuple[Response, int]:
         tuple[Response, int]: JSON ответ и HTTP статус
     """
     response = GrpcClient.get_instance().DeleteTerm(
-        dictionary_pb2.DeleteTermRequest(id=term_id)
+        dictionary_pb2.DeleteTermRequest(id=term_id), timeout=Config.GRPC_TIMEOUT
     )
-    return jsonify({
-        'success': response.success,
-        'message': response.message
-    }), 200 if response.success else 400
+    return jsonify(write_json(response)), write_status(response)
+
+@app.route('/api/terms/<name>', methods=['GET'])
+@cached_response
+def get_term_json(name: str) -> tuple[Response, int]:
+    """
+    API endpoint для получения одного термина по имени
+    
+    Args:
+        name: Имя термина
+    Returns:
+        tuple[Response, int]: JSON термина и HTTP статус
+    """
+    return call_api(TERM_CALL, name=name)
+
+@app.route('/api/search')
+@cached_response
+def search_terms() -> tuple[Response, int]:
+    """
+    API endpoint полнотекстового поиска терминов
+    
+    Параметры запроса: q - текст запроса, limit и offset - страница
+    результатов. Совпадения в name_html и snippet_html выделены тегом <mark>.
+    
+    Returns:
+        tuple[Response, int]: JSON с результатами и HTTP статус
+    """
+    return call_api(SEARCH_CALL)
+
+@app.route('/api/suggest')
+@cached_response
+def suggest_terms() -> tuple[Response, int]:
+    """
+    API endpoint подсказок имен терминов по префиксу
+    
+    Параметры запроса: prefix - начало имени, limit - количество подсказок.
+    
+    Returns:
+        tuple[Response, int]: JSON со списком подсказок и HTTP статус
+    """
+    return call_api(SUGGEST_CALL)
+
+@app.route('/api/graph')
+def get_graph() -> Response:
+    """
+    API endpoint с графом связей для майндмапа
+    
+    Граф отдается параллельными массивами с координатами, рассчитанными
+    сервисом словаря: nodes.name[i], nodes.id[i], nodes.x[i], nodes.y[i];
+    edges.source[j], edges.target[j] (индексы узлов) и
+    relations[edges.relation[j]]. Определения терминов не передаются.
+    
+    Returns:
+        Response: JSON графа; 304, если версия у клиента актуальна
+    """
+    try:
+        graph = GrpcClient.get_instance().GetGraph(
+            dictionary_pb2.GetGraphRequest(if_version=requested_version(request.if_none_match)),
+            timeout=Config.GRPC_TIMEOUT
+        )
+    except grpc.RpcError as e:
+        error, status = api_error(e, 'GetGraph')
+        return jsonify(error), status
+    if graph.not_modified:
+        return versioned(Response(status=304), graph.version)
+    return versioned(jsonify(graph_json(graph)), graph.version)
+
+@app.route('/api/neighborhood')
+@cached_response
+def get_neighborhood() -> tuple[Response, int]:
+    """
+    API endpoint с окрестностью термина для майндмапа
+    
+    Параметры запроса: focus - имя термина, depth - глубина, max_nodes -
+    максимальное количество узлов, cluster_size - максимальное количество
+    новых соседей одного узла (0 - без свертки в кластеры).
+    
+    Returns:
+        tuple[Response, int]: JSON с узлами, ребрами и кластерами и HTTP статус
+    """
+    return call_api(NEIGHBORHOOD_CALL)
+
+@app.route('/api/cache/stats')
+def cache_stats() -> tuple[Response, int]:
+    """
+    API endpoint со счетчиками кеша ответов
+    
+    Returns:
+        tuple[Response, int]: JSON с попаданиями, промахами, долей попаданий,
+            размером и версией набора данных и HTTP статус
+    """
+    cache = response_cache()
+    return jsonify(cache.stats() if cache else {'backend': 'none'}), 200
 
 @app.route('/mindmap')
-@handle_grpc_error
+@conditional_response
+@cached_response
 def mindmap() -> str:
     """
     Страница с визуализацией связей между терминами
     
+    Без параметров страница загружает весь граф через /api/graph. С
+    параметром focus показывается только окрестность термина
+    (/api/neighborhood), которая раскрывается по клику на узлы.
+    
     Returns:
         str: HTML страница с визуализацией
     """
-    response = GrpcClient.get_instance().ListTerms(dictionary_pb2.ListTermsRequest())
-    term_names = {term.name.lower(): term.name for term in response.terms}
-    
-    terms_data = [{
-        'id': term.id,
-        'name': term.name,
-        'definition': term.definition,
-        'related_terms': [
-            name.split('(')[0].strip()
-            for name in term.related_terms
-        ],
-        'source': term.source,
-        'created_at': term.created_at,
-        'updated_at': term.updated_at,
-        'relations': {
-            k.split('(')[0].strip(): v
-            for k, v in term.relations.items()
-        }
-    } for term in response.terms]
-
-    # Проверяем существование связанных терминов
-    for term_data in terms_data:
-        for related in term_data['related_terms']:
-            if related.lower() not in term_names:
-                logger.warning(
-                    f"Term '{term_data['name']}' references non-existent term '{related}'"
-                )
-
-    logger.debug(f"Terms data: {terms_data}")
-    return render_template('mindmap.html', terms=terms_data)
+    return render_template('mindmap.html', options=mindmap_options(request.args))
 
 if __name__ == '__main__':
+    response_cache()
     app.run(
         host=Config.HOST,
         port=Config.PORT,